@@ -0,0 +1,8 @@
+from flask import Blueprint
+
+alert_bp = Blueprint('alert', __name__)
+
+from alert.routes import *
+
+def get_blueprint():
+    return alert_bp
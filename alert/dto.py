@@ -0,0 +1,37 @@
+from dataclasses import dataclass
+from typing import Optional, List
+
+
+# Request DTOs
+@dataclass
+class AlertThresholdsRequest:
+    thresholds: Optional[List[int]] = None  # None restores the default thresholds
+
+
+# Response DTOs
+@dataclass
+class AlertResponse:
+    alert_id: int
+    budget_id: int
+    category_id: int
+    category_name: str
+    month: int
+    year: int
+    threshold: int
+    spent_amount: float
+    budget_amount: float
+    created_at: Optional[str] = None
+
+
+@dataclass
+class AlertListResponse:
+    status: str
+    alerts: List[AlertResponse]
+    last_alert_id: int
+
+
+@dataclass
+class AlertThresholdsResponse:
+    status: str
+    budget_id: int
+    thresholds: List[int]
@@ -0,0 +1,87 @@
+from utils.db import query_db, update_db, executemany_db
+
+class AlertRepository:
+    def record_crossed_thresholds(self, user_id, keys, default_thresholds):
+        # keys: (year, month, category_id) whose spend just grew. Each touched
+        # budget is compared with its category's running total from the
+        # rollup; thresholds reached for the first time become alerts.
+        return executemany_db('''
+            INSERT INTO budget_alerts (user_id, budget_id, threshold, spent_amount, budget_amount)
+            SELECT b.user_id, b.budget_id, th.value, t.total, b.amount
+            FROM budget_allocations b
+            JOIN monthly_category_totals t
+                ON t.user_id = b.user_id AND t.year = b.year AND t.month = b.month AND t.category_id = b.category_id
+            JOIN json_each(COALESCE(b.alert_thresholds, :default_thresholds)) th
+            WHERE b.user_id = :user_id AND b.year = :year AND b.month = :month AND b.category_id = :category_id
+                AND b.amount > 0 AND t.total * 100 >= b.amount * th.value
+            ON CONFLICT (budget_id, threshold) DO NOTHING
+        ''', [
+            {
+                'user_id': user_id,
+                'year': year,
+                'month': month,
+                'category_id': category_id,
+                'default_thresholds': default_thresholds
+            }
+            for year, month, category_id in keys
+        ])
+    
+    def clear_unreached_thresholds(self, user_id, keys):
+        # keys: (year, month, category_id) whose spend just shrank. Alerts of
+        # the touched budgets whose threshold the spend is now below are
+        # dropped, so they fire again once it is reached again.
+        return executemany_db('''
+            DELETE FROM budget_alerts
+            WHERE alert_id IN (
+                SELECT a.alert_id
+                FROM budget_allocations b
+                JOIN budget_alerts a ON a.budget_id = b.budget_id
+                LEFT JOIN monthly_category_totals t
+                    ON t.user_id = b.user_id AND t.year = b.year AND t.month = b.month AND t.category_id = b.category_id
+                WHERE b.user_id = :user_id AND b.year = :year AND b.month = :month AND b.category_id = :category_id
+                    AND COALESCE(t.total, 0) * 100 < b.amount * a.threshold
+            )
+        ''', [
+            {'user_id': user_id, 'year': year, 'month': month, 'category_id': category_id}
+            for year, month, category_id in keys
+        ])
+    
+    def get_alerts(self, user_id, after=0, limit=50):
+        alerts = query_db('''
+            SELECT
+                a.alert_id,
+                a.budget_id,
+                b.category_id,
+                c.name AS category_name,
+                b.month,
+                b.year,
+                a.threshold,
+                a.spent_amount,
+                a.budget_amount,
+                a.created_at
+            FROM budget_alerts a
+            JOIN budget_allocations b ON a.budget_id = b.budget_id
+            JOIN categories c ON b.category_id = c.category_id
+            WHERE a.user_id = ? AND a.alert_id > ?
+            ORDER BY a.alert_id
+            LIMIT ?
+        ''', (user_id, after, limit))
+        
+        return [dict(alert) for alert in alerts]
+    
+    def get_budget_thresholds(self, user_id, budget_id):
+        budget = query_db('''
+            SELECT budget_id, alert_thresholds FROM budget_allocations
+            WHERE budget_id = ? AND user_id = ?
+        ''', (budget_id, user_id), one=True)
+        
+        return dict(budget) if budget else None
+    
+    def set_budget_thresholds(self, user_id, budget_id, thresholds):
+        rows_affected = update_db('''
+            UPDATE budget_allocations
+            SET alert_thresholds = ?, updated_at = CURRENT_TIMESTAMP
+            WHERE budget_id = ? AND user_id = ?
+        ''', (thresholds, budget_id, user_id))
+        
+        return rows_affected > 0
@@ -0,0 +1,102 @@
+from flask import request, jsonify, g
+from utils.auth import login_required
+from utils.etag import conditional_get
+from alert.service import AlertService
+from alert.dto import AlertThresholdsRequest, AlertListResponse, AlertThresholdsResponse
+from alert import alert_bp
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+
+alert_service = AlertService()
+
+@alert_bp.route('', methods=['GET'])
+@login_required
+@conditional_get
+def get_alerts():
+    # Alerts are only written with expenses, which bump data_version, so an
+    # unchanged poll is answered 304 by conditional_get without a query
+    user_id = g.user['user_id']
+    
+    after = request.args.get('after', type=int, default=0)
+    limit = request.args.get('limit', type=int, default=DEFAULT_PAGE_SIZE)
+    
+    if not 1 <= limit <= MAX_PAGE_SIZE:
+        return jsonify({
+            'status': 'error',
+            'message': f'limit must be between 1 and {MAX_PAGE_SIZE}'
+        }), 400
+    
+    alerts, last_alert_id = alert_service.get_alerts(user_id, after, limit)
+    
+    response = AlertListResponse(
+        status="success",
+        alerts=alerts,
+        last_alert_id=last_alert_id
+    )
+    
+    return jsonify(response.__dict__)
+
+@alert_bp.route('/budgets/<int:budget_id>', methods=['GET'])
+@login_required
+def get_thresholds(budget_id):
+    user_id = g.user['user_id']
+    
+    thresholds = alert_service.get_thresholds(user_id, budget_id)
+    
+    if thresholds is None:
+        return jsonify({
+            'status': 'error',
+            'message': 'Budget not found'
+        }), 404
+    
+    response = AlertThresholdsResponse(
+        status="success",
+        budget_id=budget_id,
+        thresholds=thresholds
+    )
+    
+    return jsonify(response.__dict__)
+
+@alert_bp.route('/budgets/<int:budget_id>', methods=['PUT'])
+@login_required
+def set_thresholds(budget_id):
+    user_id = g.user['user_id']
+    
+    data = request.get_json()
+    
+    if not isinstance(data, dict) or 'thresholds' not in data:
+        return jsonify({
+            'status': 'error',
+            'message': 'Invalid request data: thresholds is required'
+        }), 400
+    
+    thresholds_request = AlertThresholdsRequest(thresholds=data['thresholds'])
+    
+    try:
+        thresholds = alert_service.set_thresholds(user_id, budget_id, thresholds_request)
+        
+        if thresholds is None:
+            return jsonify({
+                'status': 'error',
+                'message': 'Budget not found or does not belong to user'
+            }), 404
+        
+        response = AlertThresholdsResponse(
+            status="success",
+            budget_id=budget_id,
+            thresholds=thresholds
+        )
+        
+        return jsonify(response.__dict__)
+        
+    except ValueError as e:
+        return jsonify({
+            'status': 'error',
+            'message': str(e)
+        }), 400
+    except Exception as e:
+        return jsonify({
+            'status': 'error',
+            'message': str(e)
+        }), 500
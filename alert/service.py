@@ -0,0 +1,79 @@
+import json
+from flask import current_app
+from alert.repository import AlertRepository
+from utils.money import from_cents
+
+# Percent of a budget's amount at which it alerts, unless overridden per
+# budget or by BUDGET_ALERT_THRESHOLDS
+DEFAULT_ALERT_THRESHOLDS = (80, 100)
+MAX_ALERT_THRESHOLDS = 10
+
+class AlertService:
+    def __init__(self):
+        self.repository = AlertRepository()
+    
+    def default_thresholds(self):
+        return sorted(current_app.config.get('BUDGET_ALERT_THRESHOLDS', DEFAULT_ALERT_THRESHOLDS))
+    
+    def evaluate(self, user_id, keys):
+        # Called in the expense write's transaction, after the rollup moved.
+        # keys: (year, month, category_id) whose spend grew; only those
+        # budgets are checked, in one statement.
+        if not keys:
+            return 0
+        
+        return self.repository.record_crossed_thresholds(user_id, keys, json.dumps(self.default_thresholds()))
+    
+    def rearm(self, user_id, keys):
+        # Called in the expense write's transaction, after the rollup moved.
+        # keys: (year, month, category_id) whose spend shrank; thresholds
+        # it fell back under can alert again.
+        if not keys:
+            return 0
+        
+        return self.repository.clear_unreached_thresholds(user_id, keys)
+    
+    def get_alerts(self, user_id, after=0, limit=50):
+        # Alerts newer than alert_id `after`, oldest first; the returned
+        # last_alert_id is the `after` for the next poll
+        alerts = self.repository.get_alerts(user_id, after, limit)
+        
+        for alert in alerts:
+            alert['spent_amount'] = from_cents(alert['spent_amount'])
+            alert['budget_amount'] = from_cents(alert['budget_amount'])
+        
+        return alerts, alerts[-1]['alert_id'] if alerts else after
+    
+    def get_thresholds(self, user_id, budget_id):
+        budget = self.repository.get_budget_thresholds(user_id, budget_id)
+        
+        if not budget:
+            return None
+        
+        if budget['alert_thresholds'] is None:
+            return self.default_thresholds()
+        
+        return json.loads(budget['alert_thresholds'])
+    
+    def set_thresholds(self, user_id, budget_id, thresholds_request):
+        # Override a budget's thresholds; None goes back to the default
+        thresholds = thresholds_request.thresholds
+        
+        if thresholds is not None:
+            if (
+                not isinstance(thresholds, list) or not 0 < len(thresholds) <= MAX_ALERT_THRESHOLDS
+                or not all(isinstance(t, int) and not isinstance(t, bool) and 0 < t <= 1000 for t in thresholds)
+            ):
+                raise ValueError(
+                    f"thresholds must be a list of 1 to {MAX_ALERT_THRESHOLDS} whole percentages between 1 and 1000"
+                )
+            thresholds = sorted(set(thresholds))
+        
+        success = self.repository.set_budget_thresholds(
+            user_id, budget_id, json.dumps(thresholds) if thresholds is not None else None
+        )
+        
+        if not success:
+            return None
+        
+        return thresholds if thresholds is not None else self.default_thresholds()
@@ -0,0 +1,18 @@
+import unittest
+from flask import Flask
+from alert.routes import alert_bp
+from http import HTTPStatus
+
+class TestAlertRoutes(unittest.TestCase):
+    def setUp(self):
+        self.app = Flask(__name__)
+        self.app.register_blueprint(alert_bp, url_prefix='/api/alerts')
+        self.client = self.app.test_client()
+    
+    def test_unauthorized_access(self):
+        """Test that alert endpoints require authentication"""
+        response = self.client.get('/api/alerts')
+        self.assertEqual(response.status_code, HTTPStatus.UNAUTHORIZED)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,118 @@
+import io
+import unittest
+from types import SimpleNamespace
+from utils.db import insert_db, update_db
+from utils.testing import DatabaseTestCase
+from expense.service import ExpenseService
+from alert.service import AlertService
+from alert.dto import AlertThresholdsRequest
+from budget.service import BudgetService
+from budget.dto import CreateBudgetRequest
+
+class TestBudgetAlerts(DatabaseTestCase):
+    def setUp(self):
+        super().setUp()
+        self.service = AlertService()
+        self.expenses = ExpenseService()
+
+    def seed(self):
+        self.food, self.rent = [
+            insert_db('INSERT INTO categories (user_id, name) VALUES (?, ?)', (self.user_id, name))
+            for name in ('Food', 'Rent')
+        ]
+        self.food_budget, self.rent_budget = [
+            insert_db(
+                'INSERT INTO budget_allocations (user_id, category_id, amount, month, year) VALUES (?, ?, ?, ?, ?)',
+                (self.user_id, category_id, 10000, 3, 2025)
+            )
+            for category_id in (self.food, self.rent)
+        ]
+
+    def create_expense(self, category_id, amount, date='2025-03-10'):
+        return self.expenses.create_expense(
+            self.user_id, SimpleNamespace(category_id=category_id, amount=amount, date=date, description=None)
+        )
+
+    def crossed(self, after=0):
+        alerts, _ = self.service.get_alerts(self.user_id, after)
+        return [(alert['budget_id'], alert['threshold']) for alert in alerts]
+
+    def test_expense_writes_record_each_threshold_once(self):
+        """Test that creates and updates record a threshold when first reached, for the touched budget only"""
+        with self.app.app_context():
+            expense = self.create_expense(self.food, 70)
+            self.create_expense(self.rent, 85)
+            self.assertEqual(self.crossed(), [(self.rent_budget, 80)])
+
+            self.expenses.update_expense(
+                self.user_id, expense['expense_id'],
+                SimpleNamespace(category_id=None, amount=110, date=None, description=None)
+            )
+            self.create_expense(self.food, 5)
+            alerts, last_alert_id = self.service.get_alerts(self.user_id)
+            newer = self.crossed(after=alerts[0]['alert_id'])
+
+        self.assertEqual(newer, [(self.food_budget, 80), (self.food_budget, 100)])
+        self.assertEqual(last_alert_id, alerts[-1]['alert_id'])
+        self.assertEqual((alerts[-1]['spent_amount'], alerts[-1]['budget_amount']), (110.0, 100.0))
+
+    def test_budget_thresholds_override_default(self):
+        """Test that a budget's own thresholds replace the default ones, including for imports"""
+        with self.app.app_context():
+            thresholds = self.service.set_thresholds(self.user_id, self.food_budget, AlertThresholdsRequest([90, 50, 50]))
+            self.expenses.import_expenses(
+                self.user_id, io.StringIO('category,amount,date\nFood,30,2025-03-01\nFood,25,2025-03-02\n'), 'csv'
+            )
+            crossed = self.crossed()
+
+            with self.assertRaises(ValueError):
+                self.service.set_thresholds(self.user_id, self.food_budget, AlertThresholdsRequest([0]))
+            reset = self.service.set_thresholds(self.user_id, self.food_budget, AlertThresholdsRequest(None))
+
+        self.assertEqual(thresholds, [50, 90])
+        self.assertEqual(crossed, [(self.food_budget, 50)])
+        self.assertEqual(reset, [80, 100])
+
+    def test_thresholds_fire_again_after_rearming(self):
+        """Test that spend falling back under a threshold, or a new budget amount, lets it alert again"""
+        with self.app.app_context():
+            first = self.create_expense(self.food, 85)
+            self.expenses.update_expense(
+                self.user_id, first['expense_id'],
+                SimpleNamespace(category_id=None, amount=50, date=None, description=None)
+            )
+            after_drop = self.crossed()
+            self.create_expense(self.food, 40)
+            after_climb = self.crossed()
+
+            second = self.create_expense(self.rent, 90)
+            update_db('UPDATE budget_allocations SET amount = ? WHERE budget_id = ?', (20000, self.rent_budget))
+            after_raise = self.crossed()
+            self.create_expense(self.rent, 70)
+            after_raised_climb = self.crossed()
+
+            self.expenses.delete_expense(self.user_id, second['expense_id'])
+            after_delete = self.crossed()
+
+        self.assertEqual(after_drop, [])
+        self.assertEqual(after_climb, [(self.food_budget, 80)])
+        self.assertEqual(after_raise, [(self.food_budget, 80)])
+        self.assertEqual(after_raised_climb, [(self.food_budget, 80), (self.rent_budget, 80)])
+        self.assertEqual(after_delete, [(self.food_budget, 80)])
+
+    def test_deleted_budget_takes_its_alerts(self):
+        """Test that a budget recreated under a deleted budget's id starts without its alerts"""
+        with self.app.app_context():
+            self.create_expense(self.rent, 100)
+            BudgetService().delete_budget(self.user_id, self.rent_budget)
+            budget = BudgetService().create_budget(self.user_id, CreateBudgetRequest(self.food, 50, 7, 2025))
+            after_recreate = self.crossed()
+            self.create_expense(self.food, 45, date='2025-07-01')
+            alerts, _ = self.service.get_alerts(self.user_id)
+
+        self.assertEqual(budget.budget_id, self.rent_budget)
+        self.assertEqual(after_recreate, [])
+        self.assertEqual([(a['budget_id'], a['threshold'], a['month']) for a in alerts], [(self.rent_budget, 80, 7)])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -3,7 +3,9 @@ load_dotenv('.flaskenv')
 from flask import Flask, jsonify
 from flask_cors import CORS
 import os
-from utils.db import init_app
+from utils.db import init_app, get_pool_stats
+from utils.cache import get_cache
+from savings.queue import get_savings_queue
 
 def create_app():
     app = Flask(__name__, instance_relative_config=True)
@@ -11,6 +13,19 @@ def create_app():
     import config
     app.config['SECRET_KEY'] = config.SECRET_KEY
     app.config['DATABASE'] = config.DATABASE
+    app.config['DATABASE_POOL_SIZE'] = config.DATABASE_POOL_SIZE
+    app.config['DATABASE_POOL_TIMEOUT'] = config.DATABASE_POOL_TIMEOUT
+    app.config['DATABASE_WRITER_POOL_SIZE'] = config.DATABASE_WRITER_POOL_SIZE
+    app.config['DATABASE_READ_REPLICA'] = config.DATABASE_READ_REPLICA
+    app.config['DATABASE_READ_ROUTING'] = config.DATABASE_READ_ROUTING
+    app.config['DB_QUERY_STATS'] = config.DB_QUERY_STATS
+    app.config['DB_N_PLUS_ONE_THRESHOLD'] = config.DB_N_PLUS_ONE_THRESHOLD
+    app.config['CACHE_BACKEND'] = config.CACHE_BACKEND
+    app.config['CACHE_MAX_ENTRIES'] = config.CACHE_MAX_ENTRIES
+    app.config['SAVINGS_MODE'] = config.SAVINGS_MODE
+    app.config['BUDGET_ALERT_THRESHOLDS'] = config.BUDGET_ALERT_THRESHOLDS
+    app.config['SQLITE_PROFILE'] = config.SQLITE_PROFILE
+    app.config['SQLITE_PROFILES'] = config.SQLITE_PROFILES
     app.config['JWT_SECRET_KEY'] = config.JWT_SECRET_KEY
     app.config['JWT_ACCESS_TOKEN_EXPIRES'] = config.JWT_ACCESS_TOKEN_EXPIRES
     
@@ -21,7 +36,8 @@ def create_app():
     
     init_app(app)
     
-    CORS(app, resources={r"/api/*": {"origins": ["*", "http://localhost:3000"]}})
+    # ETag is exposed so browser clients can send it back as If-None-Match
+    CORS(app, resources={r"/api/*": {"origins": ["*", "http://localhost:3000"]}}, expose_headers=['ETag'])
     
     from auth import get_blueprint as get_auth_blueprint
     app.register_blueprint(get_auth_blueprint(), url_prefix='/api/auth')
@@ -41,12 +57,24 @@ def create_app():
     from dashboard import get_blueprint as get_dashboard_blueprint
     app.register_blueprint(get_dashboard_blueprint(), url_prefix='/api/dashboard')
     
+    from transaction import get_blueprint as get_transaction_blueprint
+    app.register_blueprint(get_transaction_blueprint(), url_prefix='/api/transactions')
+    
+    from alert import get_blueprint as get_alert_blueprint
+    app.register_blueprint(get_alert_blueprint(), url_prefix='/api/alerts')
+    
+    from savings import get_blueprint as get_savings_blueprint
+    app.register_blueprint(get_savings_blueprint())
+    
     print("RUN")
     
     @app.route('/api/health', methods=['GET'])
     def healthcheck():
         app.logger.info("Health check endpoint accessed")
-        return jsonify({'status': 'ok'}), 200
+        health = {'status': 'ok', 'db_pools': get_pool_stats(), 'cache': get_cache().stats()}
+        if app.config['SAVINGS_MODE'] == 'queue':
+            health['savings_queue'] = get_savings_queue().stats()
+        return jsonify(health), 200
     
     return app
 
@@ -1,4 +1,4 @@
-from utils.db import query_db, insert_db
+from utils.db import query_db, insert_db, executemany_db
 
 class AuthRepository:
     def find_user_by_username_or_email(self, username, email):
@@ -29,8 +29,7 @@ class AuthRepository:
         )
     
     def create_default_categories(self, user_id, category_names):
-        for category in category_names:
-            insert_db(
-                'INSERT INTO categories (user_id, name) VALUES (?, ?)',
-                (user_id, category)
-            )
\ No newline at end of file
+        executemany_db(
+            'INSERT INTO categories (user_id, name) VALUES (?, ?)',
+            [(user_id, category) for category in category_names]
+        )
\ No newline at end of file
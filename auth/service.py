@@ -1,6 +1,7 @@
 from auth.repository import AuthRepository
 from utils.auth import hash_password, verify_password, generate_token
 from auth.dto import UserResponse
+from utils.db import transaction
 import re
 
 class AuthService:
@@ -31,12 +32,13 @@ class AuthService:
         if not is_valid:
             raise ValueError(error_message)
         
-        # Hash password and create user
+        # Hash password outside the transaction, bcrypt is slow
         password_hash = hash_password(password)
-        user_id = self.repository.create_user(username, email, password_hash)
         
-        # Create default categories
-        self.repository.create_default_categories(user_id, self.default_categories)
+        # Create user and default categories in one commit
+        with transaction():
+            user_id = self.repository.create_user(username, email, password_hash)
+            self.repository.create_default_categories(user_id, self.default_categories)
         
         # Return user response
         return UserResponse(
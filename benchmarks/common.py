@@ -0,0 +1,88 @@
+import os
+import statistics
+import tempfile
+import time
+from types import SimpleNamespace
+
+
+def make_app(profile='balanced'):
+    # Fresh app on a throwaway database file
+    from app import create_app
+    from utils.db import init_db
+    
+    fd, path = tempfile.mkstemp(suffix='.db', prefix='budgeta-bench-')
+    os.close(fd)
+    os.unlink(path)
+    
+    app = create_app()
+    app.config['DATABASE'] = path
+    app.config['SQLITE_PROFILE'] = profile
+    
+    with app.app_context():
+        init_db()
+    
+    return app, path
+
+
+def drop_app(app, path):
+    from utils.db import get_pool
+    
+    get_pool(app).close_all()
+    for suffix in ('', '-wal', '-shm'):
+        if os.path.exists(path + suffix):
+            os.unlink(path + suffix)
+
+
+def seed_user(app, username='bench'):
+    from utils.db import query_db
+    from auth.service import AuthService
+    
+    with app.app_context():
+        user = AuthService().register_user(username, f'{username}@example.com', 'benchmark')
+        categories = query_db(
+            'SELECT category_id FROM categories WHERE user_id = ? ORDER BY category_id',
+            (user.user_id,)
+        )
+    
+    return user.user_id, [category['category_id'] for category in categories]
+
+
+def expense_request(category_id, amount, expense_date, description=None):
+    return SimpleNamespace(
+        category_id=category_id,
+        amount=amount,
+        date=expense_date,
+        description=description
+    )
+
+
+def time_calls(app, fn, iterations):
+    # Each call runs in its own app context, like a request would
+    durations = []
+    for i in range(iterations):
+        with app.app_context():
+            start = time.perf_counter()
+            fn(i)
+            durations.append(time.perf_counter() - start)
+    return durations
+
+
+def summarize(durations):
+    ordered = sorted(durations)
+    return {
+        'n': len(ordered),
+        'mean_ms': statistics.mean(ordered) * 1000,
+        'p50_ms': ordered[len(ordered) // 2] * 1000,
+        'p95_ms': ordered[int(len(ordered) * 0.95) - 1] * 1000,
+        'ops_per_sec': len(ordered) / sum(ordered) if sum(ordered) else 0.0
+    }
+
+
+def print_table(title, rows):
+    print(f'\n{title}')
+    print(f"{'case':<28}{'n':>8}{'mean ms':>12}{'p50 ms':>12}{'p95 ms':>12}{'ops/s':>12}")
+    for name, stats in rows:
+        print(
+            f"{name:<28}{stats['n']:>8}{stats['mean_ms']:>12.3f}{stats['p50_ms']:>12.3f}"
+            f"{stats['p95_ms']:>12.3f}{stats['ops_per_sec']:>12.1f}"
+        )
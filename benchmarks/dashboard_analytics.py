@@ -0,0 +1,77 @@
+"""Time the vectorized analytics endpoint against a row-by-row Python loop.
+
+Seeds one user with --expenses expenses spread over a year, then times
+DashboardService.get_analytics (per-day SQL aggregate + NumPy) against
+fetching every expense row and accumulating the same year-to-date and
+rolling 30/90-day figures in Python.
+
+    python -m benchmarks.dashboard_analytics [--expenses N] [--iterations N]
+"""
+import argparse
+from datetime import date, timedelta
+
+from benchmarks.common import make_app, drop_app, seed_user, time_calls, summarize, print_table
+from benchmarks.dashboard_overview import seed_ledger
+
+
+def row_loop_analytics(user_id, as_of):
+    # The per-row approach: one Python iteration per expense
+    from utils.db import query_db
+    
+    load_start = date(as_of.year, 1, 1) - timedelta(days=89)
+    rows = query_db('''
+        SELECT date, category_id, amount FROM expenses
+        WHERE user_id = ? AND date >= ? AND date < ?
+    ''', (user_id, load_start.isoformat(), (as_of + timedelta(days=1)).isoformat()))
+    
+    daily = {}
+    by_category = {}
+    for row in rows:
+        daily[row['date']] = daily.get(row['date'], 0) + row['amount']
+        by_category[row['category_id']] = by_category.get(row['category_id'], 0) + row['amount']
+    
+    rolling = []
+    day = date(as_of.year, 1, 1)
+    while day <= as_of:
+        rolling.append((
+            sum(daily.get(day - timedelta(days=n), 0) for n in range(30)),
+            sum(daily.get(day - timedelta(days=n), 0) for n in range(90))
+        ))
+        day += timedelta(days=1)
+    
+    return rolling, by_category
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--expenses', type=int, default=300000)
+    parser.add_argument('--iterations', type=int, default=20)
+    parser.add_argument('--year', type=int, default=2025)
+    args = parser.parse_args()
+    
+    from dashboard.service import DashboardService
+    
+    app, path = make_app()
+    try:
+        user_id, category_ids = seed_user(app)
+        seed_ledger(app, user_id, category_ids, args.expenses, args.year)
+        
+        service = DashboardService()
+        as_of = date(args.year, 12, 31)
+        
+        rows = [
+            ('row-by-row Python', summarize(time_calls(
+                app, lambda i: row_loop_analytics(user_id, as_of), args.iterations
+            ))),
+            ('get_analytics (NumPy)', summarize(time_calls(
+                app, lambda i: service.get_analytics(user_id, as_of), args.iterations
+            )))
+        ]
+        
+        print_table(f'Year-to-date analytics, {args.expenses} expenses', rows)
+    finally:
+        drop_app(app, path)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,264 @@
+"""Compare the fused dashboard query path against the original per-section path.
+
+Seeds one user with --expenses expenses spread over a year, then times
+DashboardService.get_dashboard_overview (one aggregate statement plus one
+recent-transactions statement) against the original seven repository calls.
+
+    python -m benchmarks.dashboard_overview [--expenses N] [--iterations N]
+"""
+import argparse
+import calendar
+import random
+from datetime import date, timedelta
+
+from benchmarks.common import make_app, drop_app, seed_user, time_calls, summarize, print_table
+from utils.db import query_db
+
+
+def seed_ledger(app, user_id, category_ids, expenses, year):
+    from utils.db import executemany_db, transaction
+    from expense.repository import ExpenseRepository
+    
+    rng = random.Random(42)
+    start = date(year, 1, 1)
+    
+    with app.app_context():
+        with transaction():
+            executemany_db('''
+                INSERT INTO expenses (user_id, category_id, amount, date, description)
+                VALUES (?, ?, ?, ?, ?)
+            ''', [
+                (
+                    user_id,
+                    rng.choice(category_ids),
+                    rng.randint(100, 50000),
+                    (start + timedelta(days=rng.randrange(365))).isoformat(),
+                    'bench'
+                )
+                for _ in range(expenses)
+            ])
+            # Bulk-seeded rows bypass ExpenseService, so rebuild the rollup
+            ExpenseRepository().rebuild_category_totals(user_id)
+            executemany_db('''
+                INSERT INTO income_sources (user_id, source_name, expected_amount, actual_amount, is_received, receive_date, month, year)
+                VALUES (?, ?, ?, ?, 1, ?, ?, ?)
+            ''', [
+                (user_id, 'Salary', 500000, 500000, f'{year}-{month:02d}-01', month, year)
+                for month in range(1, 13)
+            ])
+            executemany_db('''
+                INSERT INTO budget_allocations (user_id, category_id, amount, month, year)
+                VALUES (?, ?, ?, ?, ?)
+            ''', [
+                (user_id, category_id, 100000, month, year)
+                for category_id in category_ids
+                for month in range(1, 13)
+            ])
+
+
+class LegacyDashboardRepository:
+    # The per-section reads the dashboard made before DashboardRepository.get_overview
+    def get_income_summary(self, user_id, month, year):
+        income_query = '''
+            SELECT 
+                SUM(expected_amount) as expected_income,
+                SUM(CASE WHEN is_received = 1 THEN actual_amount ELSE 0 END) as actual_income
+            FROM income_sources
+            WHERE user_id = ? AND month = ? AND year = ?
+        '''
+        
+        income = query_db(income_query, (user_id, month, year), one=True)
+        
+        return {
+            'expected_income': income['expected_income'] or 0,
+            'actual_income': income['actual_income'] or 0
+        }
+    
+    def get_expenses_total(self, user_id, month, year):
+        # Get the first and last day of the month
+        _, last_day = calendar.monthrange(year, month)
+        start_date = f"{year}-{month:02d}-01"
+        end_date = f"{year}-{month:02d}-{last_day:02d}"
+        
+        expense_query = '''
+            SELECT SUM(amount) as total_expenses
+            FROM expenses
+            WHERE user_id = ? AND date BETWEEN ? AND ?
+        '''
+        
+        expenses = query_db(expense_query, (user_id, start_date, end_date), one=True)
+        
+        return expenses['total_expenses'] or 0
+    
+    def get_budget_summary(self, user_id, month, year):
+        budget_query = '''
+            SELECT 
+                b.category_id,
+                c.name as category_name,
+                b.amount as budget_amount
+            FROM budget_allocations b
+            JOIN categories c ON b.category_id = c.category_id
+            WHERE b.user_id = ? AND b.month = ? AND b.year = ?
+            ORDER BY c.name
+        '''
+        
+        budgets = query_db(budget_query, (user_id, month, year))
+        return [dict(budget) for budget in budgets]
+    
+    def get_expenses_by_category(self, user_id, month, year):
+        # Get the first and last day of the month
+        _, last_day = calendar.monthrange(year, month)
+        start_date = f"{year}-{month:02d}-01"
+        end_date = f"{year}-{month:02d}-{last_day:02d}"
+        
+        category_expense_query = '''
+            SELECT 
+                e.category_id,
+                SUM(e.amount) as spent_amount
+            FROM expenses e
+            WHERE e.user_id = ? AND e.date BETWEEN ? AND ?
+            GROUP BY e.category_id
+        '''
+        
+        category_expenses = query_db(category_expense_query, (user_id, start_date, end_date))
+        
+        return {
+            expense['category_id']: expense['spent_amount'] or 0
+            for expense in category_expenses
+        }
+    
+    def get_recent_expenses(self, user_id, month, year, limit=5):
+        # Get the first and last day of the month
+        _, last_day = calendar.monthrange(year, month)
+        start_date = f"{year}-{month:02d}-01"
+        end_date = f"{year}-{month:02d}-{last_day:02d}"
+        
+        recent_expenses_query = '''
+            SELECT 
+                'expense' as type,
+                e.expense_id as id,
+                e.amount,
+                e.date as transaction_date,
+                e.description,
+                c.name as category_name,
+                c.category_id
+            FROM expenses e
+            JOIN categories c ON e.category_id = c.category_id
+            WHERE e.user_id = ? AND e.date BETWEEN ? AND ?
+            ORDER BY e.date DESC, e.created_at DESC
+            LIMIT ?
+        '''
+        
+        recent_expenses = query_db(recent_expenses_query, (user_id, start_date, end_date, limit))
+        return [dict(expense) for expense in recent_expenses]
+    
+    def get_recent_income(self, user_id, month, year, limit=5):
+        recent_income_query = '''
+            SELECT 
+                'income' as type,
+                i.income_id as id,
+                CASE WHEN i.is_received = 1 THEN i.actual_amount ELSE i.expected_amount END as amount,
+                CASE WHEN i.is_received = 1 THEN i.receive_date ELSE i.due_date END as transaction_date,
+                i.description,
+                i.source_name
+            FROM income_sources i
+            WHERE i.user_id = ? AND i.month = ? AND i.year = ?
+            ORDER BY transaction_date DESC
+            LIMIT ?
+        '''
+        
+        recent_income = query_db(recent_income_query, (user_id, month, year, limit))
+        return [dict(income) for income in recent_income]
+    
+    def get_savings(self, user_id, month, year):
+        savings_query = '''
+            SELECT amount
+            FROM savings
+            WHERE user_id = ? AND month = ? AND year = ?
+        '''
+        
+        savings = query_db(savings_query, (user_id, month, year), one=True)
+        
+        return savings['amount'] if savings and savings['amount'] else 0
+
+
+def legacy_overview(legacy, user_id, month, year):
+    # The seven reads the dashboard used to make per page load, assembled
+    # into the shape get_overview returns
+    income = legacy.get_income_summary(user_id, month, year)
+    total_expenses = legacy.get_expenses_total(user_id, month, year)
+    budgets = legacy.get_budget_summary(user_id, month, year)
+    spent = legacy.get_expenses_by_category(user_id, month, year)
+    legacy.get_recent_expenses(user_id, month, year, 5)
+    legacy.get_recent_income(user_id, month, year, 5)
+    savings = legacy.get_savings(user_id, month, year)
+    
+    return {
+        **income,
+        'total_expenses': total_expenses,
+        'savings': savings,
+        'budgets': [
+            {**budget, 'spent_amount': spent.get(budget['category_id'], 0)}
+            for budget in budgets
+        ]
+    }
+
+
+def fused_overview(repository, user_id, month, year):
+    from transaction.repository import TransactionRepository
+    
+    repository.get_overview(user_id, month, year)
+    TransactionRepository().get_transactions(user_id, 10, month=month, year=year)
+
+
+def count_statements(app, fn):
+    from utils.instrumentation import get_query_stats
+    
+    with app.app_context():
+        fn()
+        return get_query_stats()['count']
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--expenses', type=int, default=50000)
+    parser.add_argument('--iterations', type=int, default=200)
+    parser.add_argument('--year', type=int, default=2025)
+    args = parser.parse_args()
+    
+    from dashboard.repository import DashboardRepository
+    from dashboard.service import DashboardService
+    
+    app, path = make_app()
+    try:
+        user_id, category_ids = seed_user(app)
+        seed_ledger(app, user_id, category_ids, args.expenses, args.year)
+        
+        repository = DashboardRepository()
+        legacy = LegacyDashboardRepository()
+        service = DashboardService()
+        months = lambda i: (i % 12 + 1, args.year)
+        
+        rows = [
+            ('original (7 statements)', summarize(time_calls(
+                app, lambda i: legacy_overview(legacy, user_id, *months(i)), args.iterations
+            ))),
+            ('fused (2 statements)', summarize(time_calls(
+                app, lambda i: fused_overview(repository, user_id, *months(i)), args.iterations
+            ))),
+            ('DashboardService overview', summarize(time_calls(
+                app, lambda i: service.get_dashboard_overview(user_id, *months(i)), args.iterations
+            )))
+        ]
+        
+        print_table(f'Dashboard overview, {args.expenses} expenses', rows)
+        print(
+            f'\nStatements per load: original {count_statements(app, lambda: legacy_overview(legacy, user_id, 6, args.year))}, '
+            f'fused {count_statements(app, lambda: fused_overview(repository, user_id, 6, args.year))}'
+        )
+    finally:
+        drop_app(app, path)
+
+
+if __name__ == '__main__':
+    main()
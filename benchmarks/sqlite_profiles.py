@@ -0,0 +1,101 @@
+"""Compare the SQLite tuning profiles from config.SQLITE_PROFILES.
+
+Measures the expense write path (ExpenseService.create_expense, including the
+savings update), the dashboard read path (DashboardService.get_dashboard_overview)
+and concurrent writers, which used to fail with "database is locked".
+
+    python -m benchmarks.sqlite_profiles [--writes N] [--reads N] [--threads N]
+"""
+import argparse
+import sqlite3
+import threading
+import time
+
+import config
+from benchmarks.common import (
+    make_app, drop_app, seed_user, expense_request, time_calls, summarize, print_table
+)
+
+
+def run_concurrent_writers(app, user_id, category_ids, threads, per_thread):
+    from expense.service import ExpenseService
+    
+    service = ExpenseService()
+    lock_errors = []
+    other_errors = []
+    
+    def writer(worker):
+        for i in range(per_thread):
+            try:
+                with app.app_context():
+                    service.create_expense(user_id, expense_request(
+                        category_ids[i % len(category_ids)], 12.5, f'2025-03-{i % 28 + 1:02d}', f'w{worker}'
+                    ))
+            except sqlite3.OperationalError as e:
+                (lock_errors if 'locked' in str(e) else other_errors).append(str(e))
+            except sqlite3.DatabaseError as e:
+                other_errors.append(str(e))
+    
+    workers = [threading.Thread(target=writer, args=(n,)) for n in range(threads)]
+    start = time.perf_counter()
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    elapsed = time.perf_counter() - start
+    
+    return threads * per_thread / elapsed, len(lock_errors), len(other_errors)
+
+
+def bench_profile(profile, writes, reads, threads):
+    from expense.service import ExpenseService
+    from dashboard.service import DashboardService
+    
+    app, path = make_app(profile)
+    try:
+        user_id, category_ids = seed_user(app)
+        expenses = ExpenseService()
+        dashboard = DashboardService()
+        
+        write = summarize(time_calls(app, lambda i: expenses.create_expense(user_id, expense_request(
+            category_ids[i % len(category_ids)], 10 + i % 90, f'2025-04-{i % 28 + 1:02d}'
+        )), writes))
+        
+        read = summarize(time_calls(app, lambda i: dashboard.get_dashboard_overview(user_id, 4, 2025), reads))
+        
+        concurrent = run_concurrent_writers(
+            app, user_id, category_ids, threads, max(writes // threads, 1)
+        )
+        
+        return write, read, concurrent
+    finally:
+        drop_app(app, path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--writes', type=int, default=500)
+    parser.add_argument('--reads', type=int, default=500)
+    parser.add_argument('--threads', type=int, default=4)
+    args = parser.parse_args()
+    
+    write_rows, read_rows, concurrent_rows = [], [], []
+    # None runs with SQLite's built-in defaults as the baseline
+    for profile in [None, *config.SQLITE_PROFILES]:
+        name = profile or 'sqlite defaults'
+        write, read, concurrent = bench_profile(profile, args.writes, args.reads, args.threads)
+        write_rows.append((name, write))
+        read_rows.append((name, read))
+        concurrent_rows.append((name, *concurrent))
+    
+    print_table('Expense write path (create_expense + savings)', write_rows)
+    print_table('Dashboard read path (get_dashboard_overview)', read_rows)
+    
+    print(f'\nConcurrent expense writers ({args.threads} threads)')
+    print(f"{'profile':<28}{'writes/s':>12}{'lock errors':>14}{'other errors':>14}")
+    for name, rate, lock_errors, other_errors in concurrent_rows:
+        print(f'{name:<28}{rate:>12.1f}{lock_errors:>14}{other_errors:>14}')
+
+
+if __name__ == '__main__':
+    main()
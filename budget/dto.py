@@ -13,6 +13,19 @@ class CreateBudgetRequest:
 class UpdateBudgetRequest:
     amount: float
 
+@dataclass
+class BudgetPeriod:
+    month: int
+    year: int
+
+@dataclass
+class RolloverBudgetRequest:
+    source_month: int
+    source_year: int
+    targets: List[BudgetPeriod]
+    scale: float = 1.0
+    overwrite: bool = False
+
 # Response DTOs
 @dataclass
 class BudgetResponse:
@@ -37,4 +50,11 @@ class BudgetListResponse:
 @dataclass
 class BudgetSingleResponse:
     status: str
-    budget: BudgetResponse
\ No newline at end of file
+    budget: BudgetResponse
+
+@dataclass
+class BudgetRolloverResponse:
+    status: str
+    copied: int
+    skipped: int
+    targets: List[BudgetPeriod]
@@ -1,6 +1,5 @@
-from utils.db import query_db, insert_db, update_db
+from utils.db import query_db, insert_db, update_db, executemany_db
 from datetime import datetime
-import calendar
 
 class BudgetRepository:
     def get_budgets(self, user_id, month=None, year=None):
@@ -50,20 +49,72 @@ class BudgetRepository:
         
         return dict(budget) if budget else None
     
-    def get_expenses_for_budget(self, user_id, category_id, month, year):
-        _, last_day = calendar.monthrange(year, month)
-        start_date = f"{year}-{month:02d}-01"
-        end_date = f"{year}-{month:02d}-{last_day:02d}"
-        
-        expense_query = '''
-            SELECT SUM(amount) as total_spent
-            FROM expenses
-            WHERE user_id = ? AND category_id = ? AND date BETWEEN ? AND ?
+    def get_budgets_with_spent(self, user_id, month=None, year=None, budget_id=None):
+        # Budgets joined to their month's spend from the rollup, so a list of
+        # any size is one statement instead of one SUM per allocation
+        query = '''
+            SELECT 
+                b.budget_id, 
+                b.category_id, 
+                c.name AS category_name, 
+                b.amount, 
+                b.month, 
+                b.year,
+                COALESCE(t.total, 0) AS spent_amount
+            FROM budget_allocations b
+            JOIN categories c ON b.category_id = c.category_id
+            LEFT JOIN monthly_category_totals t
+                ON t.user_id = b.user_id AND t.year = b.year AND t.month = b.month AND t.category_id = b.category_id
+            WHERE b.user_id = ?
         '''
         
-        spent = query_db(expense_query, (user_id, category_id, start_date, end_date), one=True)
+        args = [user_id]
+        
+        if budget_id is not None:
+            query += ' AND b.budget_id = ?'
+            args.append(budget_id)
+        
+        if month and year:
+            query += ' AND b.month = ? AND b.year = ?'
+            args.extend([month, year])
+        elif month:
+            query += ' AND b.month = ?'
+            args.append(month)
+        elif year:
+            query += ' AND b.year = ?'
+            args.append(year)
+        
+        query += ' ORDER BY c.name ASC'
         
-        return float(spent['total_spent']) if spent['total_spent'] else 0.0
+        budgets = query_db(query, tuple(args))
+        return [dict(budget) for budget in budgets]
+    
+    def get_budgets_with_spent_for(self, user_id, keys):
+        # Budgets and spend for a set of (category_id, month, year) keys in
+        # one grouped read
+        key_values = ', '.join(['(?, ?, ?)'] * len(keys))
+        args = [value for key in keys for value in key] + [user_id]
+        
+        budgets = query_db(f'''
+            WITH keys (category_id, month, year) AS (VALUES {key_values})
+            SELECT 
+                b.budget_id, 
+                b.category_id, 
+                c.name AS category_name, 
+                b.amount, 
+                b.month, 
+                b.year,
+                COALESCE(t.total, 0) AS spent_amount
+            FROM keys k
+            JOIN budget_allocations b
+                ON b.category_id = k.category_id AND b.month = k.month AND b.year = k.year
+            JOIN categories c ON b.category_id = c.category_id
+            LEFT JOIN monthly_category_totals t
+                ON t.user_id = b.user_id AND t.year = b.year AND t.month = b.month AND t.category_id = b.category_id
+            WHERE b.user_id = ?
+            ORDER BY b.year, b.month, c.name ASC
+        ''', args)
+        return [dict(budget) for budget in budgets]
     
     def get_category(self, user_id, category_id):
         return query_db('''
@@ -71,6 +122,16 @@ class BudgetRepository:
             WHERE category_id = ? AND user_id = ?
         ''', (category_id, user_id), one=True)
     
+    def get_category_ids(self, user_id, category_ids):
+        # The subset of category_ids that exist and belong to the user
+        placeholders = ', '.join(['?'] * len(category_ids))
+        categories = query_db(f'''
+            SELECT category_id FROM categories
+            WHERE user_id = ? AND category_id IN ({placeholders})
+        ''', (user_id, *category_ids))
+        
+        return {category['category_id'] for category in categories}
+    
     def check_budget_exists(self, user_id, category_id, month, year):
         return query_db('''
             SELECT * FROM budget_allocations
@@ -83,6 +144,18 @@ class BudgetRepository:
             VALUES (?, ?, ?, ?, ?)
         ''', (user_id, category_id, amount, month, year))
     
+    def upsert_budgets(self, user_id, budgets):
+        # budgets: (category_id, amount, month, year) tuples. Allocations
+        # whose amount doesn't change are left untouched.
+        return executemany_db('''
+            INSERT INTO budget_allocations (user_id, category_id, amount, month, year)
+            VALUES (?, ?, ?, ?, ?)
+            ON CONFLICT (user_id, category_id, month, year) DO UPDATE SET
+                amount = excluded.amount,
+                updated_at = CURRENT_TIMESTAMP
+            WHERE amount IS NOT excluded.amount
+        ''', [(user_id, *budget) for budget in budgets])
+    
     def update_budget(self, user_id, budget_id, amount):
         rows_affected = update_db('''
             UPDATE budget_allocations
@@ -108,50 +181,32 @@ class BudgetRepository:
         
         return (budget['month'], budget['year']) if budget else (None, None)
     
-    def get_income_summary(self, user_id, month, year):
-        income = query_db('''
-            SELECT 
-                SUM(expected_amount) as expected_income,
-                SUM(CASE WHEN is_received = 1 THEN actual_amount ELSE 0 END) as actual_income
-            FROM income_sources
-            WHERE user_id = ? AND month = ? AND year = ?
-        ''', (user_id, month, year), one=True)
-        
-        expected_income = float(income['expected_income'] or 0)
-        actual_income = float(income['actual_income'] or 0)
-        
-        return expected_income, actual_income
-    
-    def get_expenses_summary(self, user_id, month, year):
-        _, last_day = calendar.monthrange(year, month)
-        start_date = f"{year}-{month:02d}-01"
-        end_date = f"{year}-{month:02d}-{last_day:02d}"
-        
-        expenses = query_db('''
-            SELECT SUM(amount) as total_expenses
-            FROM expenses
-            WHERE user_id = ? AND date BETWEEN ? AND ?
-        ''', (user_id, start_date, end_date), one=True)
-        
-        return float(expenses['total_expenses'] or 0)
-    
-    def get_existing_savings(self, user_id, month, year):
-        savings = query_db('''
-            SELECT * FROM savings
+    def count_budgets(self, user_id, month, year):
+        return query_db('''
+            SELECT COUNT(*) AS budgets FROM budget_allocations
             WHERE user_id = ? AND month = ? AND year = ?
-        ''', (user_id, month, year), one=True)
-        
-        return dict(savings) if savings else None
-    
-    def create_savings(self, user_id, amount, month, year):
-        return insert_db('''
-            INSERT INTO savings (user_id, amount, month, year)
-            VALUES (?, ?, ?, ?)
-        ''', (user_id, amount, month, year))
+        ''', (user_id, month, year), one=True)['budgets']
     
-    def update_savings(self, savings_id, amount):
-        return update_db('''
-            UPDATE savings
-            SET amount = ?, updated_at = CURRENT_TIMESTAMP
-            WHERE savings_id = ?
-        ''', (amount, savings_id))
\ No newline at end of file
+    def rollover_budgets(self, user_id, source_month, source_year, targets, scale=1, overwrite=False):
+        # Copy the source month's allocations, with their alert thresholds,
+        # into every target month in one statement. Existing target
+        # allocations are kept, or overwritten when asked; either way the
+        # UNIQUE constraint decides, not a lookup.
+        # The CTE goes after INSERT so the cursor still reports rowcount.
+        target_values = ', '.join(['(?, ?)'] * len(targets))
+        conflict = (
+            'DO UPDATE SET amount = excluded.amount, alert_thresholds = excluded.alert_thresholds, updated_at = CURRENT_TIMESTAMP'
+            if overwrite else 'DO NOTHING'
+        )
+        args = [value for target in targets for value in (target.month, target.year)]
+        args += [scale, user_id, source_month, source_year]
+        
+        return update_db(f'''
+            INSERT INTO budget_allocations (user_id, category_id, amount, month, year, alert_thresholds)
+            WITH targets (month, year) AS (VALUES {target_values})
+            SELECT b.user_id, b.category_id, CAST(ROUND(b.amount * ?) AS INTEGER), t.month, t.year, b.alert_thresholds
+            FROM budget_allocations b
+            CROSS JOIN targets t
+            WHERE b.user_id = ? AND b.month = ? AND b.year = ?
+            ON CONFLICT (user_id, category_id, month, year) {conflict}
+        ''', args)
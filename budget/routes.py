@@ -1,13 +1,24 @@
 from flask import request, jsonify, g
 from utils.auth import login_required
+from utils.etag import conditional_get
 from budget.service import BudgetService
-from budget.dto import CreateBudgetRequest, UpdateBudgetRequest, BudgetSingleResponse, BudgetListResponse
+from budget.dto import (
+    CreateBudgetRequest, UpdateBudgetRequest, RolloverBudgetRequest, BudgetPeriod,
+    BudgetSingleResponse, BudgetListResponse, BudgetRolloverResponse
+)
 from budget import budget_bp
+from utils.money import from_cents
 
 budget_service = BudgetService()
 
+# Most months a single rollover request may copy into
+MAX_ROLLOVER_TARGETS = 24
+# Most allocations a single bulk request may create or update
+MAX_BULK_BUDGETS = 500
+
 @budget_bp.route('', methods=['GET'])
 @login_required
+@conditional_get
 def get_budgets():
     user_id = g.user['user_id']
     
@@ -19,9 +30,9 @@ def get_budgets():
     response = BudgetListResponse(
         status="success",
         budgets=budgets,
-        total_budget=total_budget,
-        total_spent=total_spent,
-        total_remaining=total_budget - total_spent
+        total_budget=from_cents(total_budget),
+        total_spent=from_cents(total_spent),
+        total_remaining=from_cents(total_budget - total_spent)
     )
     
     return jsonify(response.__dict__)
@@ -95,6 +106,134 @@ def create_budget():
             'message': str(e)
         }), 500
 
+@budget_bp.route('/bulk', methods=['PUT'])
+@login_required
+def upsert_budgets():
+    user_id = g.user['user_id']
+    
+    data = request.get_json()
+    
+    if not isinstance(data, list) or not 0 < len(data) <= MAX_BULK_BUDGETS:
+        return jsonify({
+            'status': 'error',
+            'message': f'Request body must be a list of 1 to {MAX_BULK_BUDGETS} budget allocations'
+        }), 400
+    
+    required_fields = ['category_id', 'amount', 'month', 'year']
+    for index, item in enumerate(data):
+        if not isinstance(item, dict):
+            return jsonify({
+                'status': 'error',
+                'message': f'Invalid budget allocation at index {index}'
+            }), 400
+        for field in required_fields:
+            if field not in item:
+                return jsonify({
+                    'status': 'error',
+                    'message': f'Missing required field: {field} at index {index}'
+                }), 400
+        if not isinstance(item['category_id'], int) or isinstance(item['category_id'], bool):
+            return jsonify({
+                'status': 'error',
+                'message': f'Invalid category_id at index {index}'
+            }), 400
+    
+    budget_requests = [
+        CreateBudgetRequest(
+            category_id=item['category_id'],
+            amount=item['amount'],
+            month=item['month'],
+            year=item['year']
+        )
+        for item in data
+    ]
+    
+    try:
+        budgets, total_budget, total_spent = budget_service.upsert_budgets(user_id, budget_requests)
+        
+        response = BudgetListResponse(
+            status="success",
+            budgets=budgets,
+            total_budget=from_cents(total_budget),
+            total_spent=from_cents(total_spent),
+            total_remaining=from_cents(total_budget - total_spent)
+        )
+        
+        return jsonify(response.__dict__)
+        
+    except ValueError as e:
+        return jsonify({
+            'status': 'error',
+            'message': str(e)
+        }), 400
+    except Exception as e:
+        return jsonify({
+            'status': 'error',
+            'message': str(e)
+        }), 500
+
+@budget_bp.route('/rollover', methods=['POST'])
+@login_required
+def rollover_budgets():
+    user_id = g.user['user_id']
+    
+    data = request.get_json()
+    
+    if not data:
+        return jsonify({
+            'status': 'error',
+            'message': 'Invalid request data'
+        }), 400
+    
+    required_fields = ['source_month', 'source_year', 'targets']
+    for field in required_fields:
+        if field not in data:
+            return jsonify({
+                'status': 'error',
+                'message': f'Missing required field: {field}'
+            }), 400
+    
+    targets = data['targets']
+    if (
+        not isinstance(targets, list) or not 0 < len(targets) <= MAX_ROLLOVER_TARGETS
+        or not all(isinstance(target, dict) and 'month' in target and 'year' in target for target in targets)
+    ):
+        return jsonify({
+            'status': 'error',
+            'message': f'targets must be a list of 1 to {MAX_ROLLOVER_TARGETS} objects with month and year'
+        }), 400
+    
+    rollover_request = RolloverBudgetRequest(
+        source_month=data['source_month'],
+        source_year=data['source_year'],
+        targets=[BudgetPeriod(month=target['month'], year=target['year']) for target in targets],
+        scale=data.get('scale', 1.0),
+        overwrite=bool(data.get('overwrite', False))
+    )
+    
+    try:
+        copied, skipped = budget_service.rollover_budgets(user_id, rollover_request)
+        
+        response = BudgetRolloverResponse(
+            status="success",
+            copied=copied,
+            skipped=skipped,
+            targets=rollover_request.targets
+        )
+        
+        return jsonify(response.__dict__), 201
+        
+    except ValueError as e:
+        return jsonify({
+            'status': 'error',
+            'message': str(e)
+        }), 400
+    except Exception as e:
+        return jsonify({
+            'status': 'error',
+            'message': str(e)
+        }), 500
+
 @budget_bp.route('/<int:budget_id>', methods=['PUT'])
 @login_required
 def update_budget(budget_id):
@@ -156,6 +295,3 @@ def delete_budget(budget_id):
             'status': 'error',
             'message': str(e)
         }), 500
-
-def update_savings(user_id, month, year):
-    return budget_service.update_savings(user_id, month, year)
\ No newline at end of file
@@ -1,53 +1,38 @@
 from budget.repository import BudgetRepository
-from budget.dto import CreateBudgetRequest, UpdateBudgetRequest, BudgetResponse
+from budget.dto import CreateBudgetRequest, UpdateBudgetRequest, RolloverBudgetRequest, BudgetResponse
+from utils.db import transaction
+from utils.money import to_cents, from_cents
 
 class BudgetService:
     def __init__(self):
         self.repository = BudgetRepository()
     
     def get_budgets(self, user_id, month=None, year=None):
-        budget_allocations = self.repository.get_budgets(user_id, month, year)
+        budget_allocations = self.repository.get_budgets_with_spent(user_id, month, year)
         
         budget_responses = []
-        total_budget = 0.0
-        total_spent = 0.0
+        total_budget = 0
+        total_spent = 0
         
         for budget in budget_allocations:
-            spent_amount = self.repository.get_expenses_for_budget(
-                user_id, budget["category_id"], budget["month"], budget["year"]
-            )
-            
-            remaining = budget["amount"] - spent_amount
-            percentage_used = (spent_amount / budget["amount"] * 100) if budget["amount"] > 0 else 0
-            
-            budget_response = BudgetResponse(
-                budget_id=budget["budget_id"],
-                category_id=budget["category_id"],
-                category_name=budget["category_name"],
-                amount=budget["amount"],
-                month=budget["month"],
-                year=budget["year"],
-                spent_amount=spent_amount,
-                remaining=remaining,
-                percentage_used=percentage_used
-            )
+            spent_amount = budget["spent_amount"]
             
-            budget_responses.append(budget_response)
+            budget_responses.append(self.build_budget_response(budget, spent_amount))
             total_budget += budget["amount"]
             total_spent += spent_amount
         
         return budget_responses, total_budget, total_spent
     
     def get_budget_by_id(self, user_id, budget_id):
-        budget = self.repository.get_budget_by_id(user_id, budget_id)
+        budgets = self.repository.get_budgets_with_spent(user_id, budget_id=budget_id)
         
-        if not budget:
+        if not budgets:
             return None
         
-        spent_amount = self.repository.get_expenses_for_budget(
-            user_id, budget["category_id"], budget["month"], budget["year"]
-        )
-        
+        return self.build_budget_response(budgets[0], budgets[0]["spent_amount"])
+    
+    def build_budget_response(self, budget, spent_amount):
+        # Amounts are integer cents until here, the JSON boundary
         remaining = budget["amount"] - spent_amount
         percentage_used = (spent_amount / budget["amount"] * 100) if budget["amount"] > 0 else 0
         
@@ -55,11 +40,11 @@ class BudgetService:
             budget_id=budget["budget_id"],
             category_id=budget["category_id"],
             category_name=budget["category_name"],
-            amount=budget["amount"],
+            amount=from_cents(budget["amount"]),
             month=budget["month"],
             year=budget["year"],
-            spent_amount=spent_amount,
-            remaining=remaining,
+            spent_amount=from_cents(spent_amount),
+            remaining=from_cents(remaining),
             percentage_used=percentage_used
         )
     
@@ -82,7 +67,7 @@ class BudgetService:
         budget_id = self.repository.create_budget(
             user_id, 
             budget_request.category_id, 
-            budget_request.amount, 
+            to_cents(budget_request.amount), 
             budget_request.month, 
             budget_request.year
         )
@@ -90,6 +75,47 @@ class BudgetService:
         # Get the newly created budget
         return self.get_budget_by_id(user_id, budget_id)
     
+    def upsert_budgets(self, user_id, budget_requests):
+        # Create or update many allocations at once: one category check, one
+        # batched upsert and one read of the results
+        budgets = []
+        keys = set()
+        
+        for budget_request in budget_requests:
+            month, year = budget_request.month, budget_request.year
+            self.validate_period(month, year)
+            
+            key = (budget_request.category_id, month, year)
+            if key in keys:
+                raise ValueError(f"Duplicate budget allocation for category {key[0]} in {month}/{year}")
+            keys.add(key)
+            
+            budgets.append((budget_request.category_id, to_cents(budget_request.amount), month, year))
+        
+        with transaction():
+            category_ids = {key[0] for key in keys}
+            missing = category_ids - self.repository.get_category_ids(user_id, list(category_ids))
+            
+            if missing:
+                raise ValueError(
+                    f"Category not found or does not belong to user: {', '.join(map(str, sorted(missing)))}"
+                )
+            
+            self.repository.upsert_budgets(user_id, budgets)
+        
+        budget_allocations = self.repository.get_budgets_with_spent_for(user_id, sorted(keys))
+        
+        budget_responses = []
+        total_budget = 0
+        total_spent = 0
+        
+        for budget in budget_allocations:
+            budget_responses.append(self.build_budget_response(budget, budget["spent_amount"]))
+            total_budget += budget["amount"]
+            total_spent += budget["spent_amount"]
+        
+        return budget_responses, total_budget, total_spent
+    
     def update_budget(self, user_id, budget_id, update_request: UpdateBudgetRequest):
         # Check if budget exists
         budget = self.repository.get_budget_by_id(user_id, budget_id)
@@ -98,7 +124,7 @@ class BudgetService:
             return None
         
         # Update budget amount
-        success = self.repository.update_budget(user_id, budget_id, update_request.amount)
+        success = self.repository.update_budget(user_id, budget_id, to_cents(update_request.amount))
         
         if not success:
             return None
@@ -116,25 +142,41 @@ class BudgetService:
         # Delete budget
         return self.repository.delete_budget(user_id, budget_id)
     
-    def update_savings(self, user_id, month, year):
-        # Get income summary
-        expected_income, actual_income = self.repository.get_income_summary(user_id, month, year)
+    def rollover_budgets(self, user_id, rollover_request: RolloverBudgetRequest):
+        # Copy a month's allocations forward; returns (copied, skipped)
+        source = (rollover_request.source_month, rollover_request.source_year)
+        periods = [source] + [(target.month, target.year) for target in rollover_request.targets]
         
-        # Get total expenses
-        total_expenses = self.repository.get_expenses_summary(user_id, month, year)
+        for month, year in periods:
+            self.validate_period(month, year)
         
-        # Calculate savings
-        total_income = actual_income if actual_income > 0 else expected_income
-        savings_amount = total_income - total_expenses
+        if source in periods[1:]:
+            raise ValueError("Target months must differ from the source month")
+        if len(set(periods[1:])) != len(rollover_request.targets):
+            raise ValueError("Target months must be unique")
         
-        # Check if savings record already exists
-        existing_savings = self.repository.get_existing_savings(user_id, month, year)
+        scale = rollover_request.scale
+        if isinstance(scale, bool) or not isinstance(scale, (int, float)) or not 0 <= scale <= 100:
+            raise ValueError(f"Invalid scale: {scale}")
         
-        if existing_savings:
-            # Update existing savings record
-            self.repository.update_savings(existing_savings['savings_id'], savings_amount)
-        else:
-            # Insert new savings record
-            self.repository.create_savings(user_id, savings_amount, month, year)
+        with transaction():
+            source_budgets = self.repository.count_budgets(user_id, *source)
+            
+            if not source_budgets:
+                raise ValueError("No budget allocations found for the source month")
+            
+            copied = self.repository.rollover_budgets(
+                user_id,
+                rollover_request.source_month,
+                rollover_request.source_year,
+                rollover_request.targets,
+                scale,
+                rollover_request.overwrite
+            )
         
-        return savings_amount
\ No newline at end of file
+        return copied, source_budgets * len(rollover_request.targets) - copied
+    
+    def validate_period(self, month, year):
+        valid = all(isinstance(value, int) and not isinstance(value, bool) for value in (month, year))
+        if not valid or not 1 <= month <= 12:
+            raise ValueError(f"Invalid month or year: {month}, {year}")
@@ -2,6 +2,8 @@ import unittest
 from flask import Flask
 from budget.routes import budget_bp
 from http import HTTPStatus
+from utils.db import query_db, insert_db
+from utils.testing import DatabaseTestCase
 
 class TestBudgetRoutes(unittest.TestCase):
     def setUp(self):
@@ -14,5 +16,26 @@ class TestBudgetRoutes(unittest.TestCase):
         response = self.client.get('/api/budgets')
         self.assertEqual(response.status_code, HTTPStatus.UNAUTHORIZED)
 
+class TestBulkBudgets(DatabaseTestCase):
+    def setUp(self):
+        super().setUp()
+        self.app.register_blueprint(budget_bp, url_prefix='/api/budgets')
+        self.client = self.app.test_client()
+        self.headers = self.auth_headers()
+
+    def seed(self):
+        self.category_id = insert_db('INSERT INTO categories (user_id, name) VALUES (?, ?)', (self.user_id, 'Food'))
+
+    def test_boolean_category_id_rejected(self):
+        """Test that true is not taken as category_id 1"""
+        response = self.client.put('/api/budgets/bulk', headers=self.headers, json=[
+            {'category_id': True, 'amount': 100, 'month': 4, 'year': 2025}
+        ])
+
+        self.assertEqual(response.status_code, HTTPStatus.BAD_REQUEST)
+        self.assertIn('Invalid category_id at index 0', response.get_json()['message'])
+        with self.app.app_context():
+            self.assertEqual(query_db('SELECT * FROM budget_allocations'), [])
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
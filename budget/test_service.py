@@ -0,0 +1,114 @@
+import unittest
+from utils.db import query_db, insert_db, update_db, executemany_db
+from utils.testing import DatabaseTestCase
+from expense.repository import ExpenseRepository
+from budget.service import BudgetService
+from budget.dto import CreateBudgetRequest, RolloverBudgetRequest, BudgetPeriod
+
+class TestBudgetService(DatabaseTestCase):
+    def setUp(self):
+        super().setUp()
+        self.service = BudgetService()
+
+    def seed(self):
+        category_ids = [
+            insert_db('INSERT INTO categories (user_id, name) VALUES (?, ?)', (self.user_id, name))
+            for name in ('Food', 'Rent', 'Travel')
+        ]
+        executemany_db(
+            'INSERT INTO budget_allocations (user_id, category_id, amount, month, year) VALUES (?, ?, ?, ?, ?)',
+            [(self.user_id, category_id, 10000, month, 2025) for category_id in category_ids for month in range(1, 13)]
+        )
+        executemany_db(
+            'INSERT INTO expenses (user_id, category_id, amount, date) VALUES (?, ?, ?, ?)',
+            [(self.user_id, category_ids[0], 1250, f'2025-{month:02d}-15') for month in range(1, 13)]
+        )
+        ExpenseRepository().rebuild_category_totals(self.user_id)
+
+    def test_budget_list_is_one_statement(self):
+        """Test that a year of budgets and their spend load in a single query"""
+        with self.app.app_context():
+            (budgets, total_budget, total_spent), statements = self.count_statements(
+                lambda: self.service.get_budgets(self.user_id, year=2025)
+            )
+
+        self.assertEqual(statements, 1)
+        self.assertEqual(len(budgets), 36)
+        self.assertEqual(total_budget, 360000)
+        self.assertEqual(total_spent, 15000)
+        self.assertEqual({b.spent_amount for b in budgets if b.category_name == 'Food'}, {12.5})
+
+    def test_single_budget_is_one_statement(self):
+        """Test that get_budget_by_id goes through the same single query"""
+        with self.app.app_context():
+            budget, statements = self.count_statements(lambda: self.service.get_budget_by_id(self.user_id, 1))
+            missing = self.service.get_budget_by_id(self.user_id, 999)
+
+        self.assertEqual(statements, 1)
+        self.assertEqual((budget.category_name, budget.month, budget.spent_amount), ('Food', 1, 12.5))
+        self.assertIsNone(missing)
+
+    def test_rollover_copies_in_one_statement(self):
+        """Test that a rollover scales allocations into new months and keeps existing ones"""
+        with self.app.app_context():
+            insert_db(
+                'INSERT INTO budget_allocations (user_id, category_id, amount, month, year) VALUES (?, ?, ?, ?, ?)',
+                (self.user_id, 1, 777, 2, 2026)
+            )
+            rollover = RolloverBudgetRequest(
+                source_month=12, source_year=2025,
+                targets=[BudgetPeriod(1, 2026), BudgetPeriod(2, 2026)],
+                scale=1.005
+            )
+            (copied, skipped), statements = self.count_statements(
+                lambda: self.service.rollover_budgets(self.user_id, rollover)
+            )
+            budgets, total_budget, _ = self.service.get_budgets(self.user_id, year=2026)
+
+            with self.assertRaises(ValueError):
+                self.service.rollover_budgets(self.user_id, RolloverBudgetRequest(1, 2025, [BudgetPeriod(1, 2025)]))
+
+        self.assertEqual((copied, skipped), (5, 1))
+        self.assertEqual(statements, 2)
+        self.assertEqual(len(budgets), 6)
+        self.assertEqual(total_budget, 5 * 10050 + 777)
+
+    def test_rollover_copies_alert_thresholds(self):
+        """Test that rolled over budgets, new or overwritten, keep the source budget's alert thresholds"""
+        with self.app.app_context():
+            update_db(
+                'UPDATE budget_allocations SET alert_thresholds = ? WHERE category_id = ? AND month = 12 AND year = 2025',
+                ('[50, 90]', 1)
+            )
+            self.service.rollover_budgets(self.user_id, RolloverBudgetRequest(12, 2025, [BudgetPeriod(1, 2026)]))
+            self.service.rollover_budgets(
+                self.user_id, RolloverBudgetRequest(12, 2025, [BudgetPeriod(11, 2025)], overwrite=True)
+            )
+            thresholds = query_db('''
+                SELECT year, month, alert_thresholds FROM budget_allocations
+                WHERE category_id = 1 AND ((month = 1 AND year = 2026) OR (month = 11 AND year = 2025))
+                ORDER BY year
+            ''')
+
+        self.assertEqual([tuple(row) for row in thresholds], [(2025, 11, '[50, 90]'), (2026, 1, '[50, 90]')])
+
+    def test_bulk_upsert_is_three_statements(self):
+        """Test that a bulk upsert creates and updates allocations with one check, one write and one read"""
+        requests = [CreateBudgetRequest(category_id, 200, 1, 2025) for category_id in (1, 2, 3)]
+        requests += [CreateBudgetRequest(category_id, 50, 1, 2026) for category_id in (1, 2, 3)]
+
+        with self.app.app_context():
+            (budgets, total_budget, total_spent), statements = self.count_statements(
+                lambda: self.service.upsert_budgets(self.user_id, requests)
+            )
+
+            with self.assertRaises(ValueError):
+                self.service.upsert_budgets(self.user_id, [CreateBudgetRequest(999, 1, 1, 2025)])
+
+        self.assertEqual(statements, 3)
+        self.assertEqual(len(budgets), 6)
+        self.assertEqual((total_budget, total_spent), (3 * 20000 + 3 * 5000, 1250))
+        self.assertEqual([b.amount for b in budgets if b.year == 2025], [200.0, 200.0, 200.0])
+
+if __name__ == '__main__':
+    unittest.main()
\ No newline at end of file
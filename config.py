@@ -3,5 +3,60 @@ import os
 
 SECRET_KEY = os.environ.get('SECRET_KEY', 'dev_key')
 DATABASE = os.path.join('instance', 'budget_tracker.db')
+DATABASE_POOL_SIZE = int(os.environ.get('DATABASE_POOL_SIZE', 5))
+DATABASE_POOL_TIMEOUT = float(os.environ.get('DATABASE_POOL_TIMEOUT', 30))
+# Writes go through a small serialized pool, GET handlers through read-only
+# connections, optionally against a replica made with `flask db-snapshot`
+DATABASE_WRITER_POOL_SIZE = int(os.environ.get('DATABASE_WRITER_POOL_SIZE', 1))
+DATABASE_READ_REPLICA = os.environ.get('DATABASE_READ_REPLICA')
+DATABASE_READ_ROUTING = os.environ.get('DATABASE_READ_ROUTING', '1') == '1'
+# Per-request statement counts/timings (Server-Timing header, debug log), and
+# a warning when one statement shape runs more than this many times (0 = off)
+DB_QUERY_STATS = os.environ.get('DB_QUERY_STATS', '1') == '1'
+DB_N_PLUS_ONE_THRESHOLD = int(os.environ.get('DB_N_PLUS_ONE_THRESHOLD', 0))
+# Response cache for the dashboard: 'lru' (in-process) or the import path of a
+# factory returning a shared backend, see utils/cache.py
+CACHE_BACKEND = os.environ.get('CACHE_BACKEND', 'lru')
+CACHE_MAX_ENTRIES = int(os.environ.get('CACHE_MAX_ENTRIES', 1024))
+# How writes keep the savings table current: 'delta' applies signed deltas in
+# the write's transaction, 'queue' recomputes dirty months on a background
+# thread after commit (see savings/queue.py)
+SAVINGS_MODE = os.environ.get('SAVINGS_MODE', 'delta')
+# Percentages of a budget at which an alert is recorded, unless a budget
+# overrides them (PUT /api/alerts/budgets/<id>)
+BUDGET_ALERT_THRESHOLDS = [int(value) for value in os.environ.get('BUDGET_ALERT_THRESHOLDS', '80,100').split(',')]
 JWT_SECRET_KEY = os.environ.get('JWT_SECRET_KEY', 'jwt_secret')
-JWT_ACCESS_TOKEN_EXPIRES = 3600  
\ No newline at end of file
+JWT_ACCESS_TOKEN_EXPIRES = 3600
+
+# SQLite tuning applied to every connection utils.db opens.
+# cache_size is in KiB when negative, mmap_size and busy_timeout in bytes/ms.
+SQLITE_PROFILES = {
+    # Every commit is fsynced; safest on power loss
+    'durable': {
+        'journal_mode': 'WAL',
+        'synchronous': 'FULL',
+        'mmap_size': 0,
+        'cache_size': -2000,
+        'temp_store': 'DEFAULT',
+        'busy_timeout': 5000
+    },
+    # WAL + NORMAL only loses the last commits on power loss, never corrupts
+    'balanced': {
+        'journal_mode': 'WAL',
+        'synchronous': 'NORMAL',
+        'mmap_size': 64 * 1024 * 1024,
+        'cache_size': -16000,
+        'temp_store': 'MEMORY',
+        'busy_timeout': 5000
+    },
+    # No fsync at all; for bulk loads and throwaway environments
+    'throughput': {
+        'journal_mode': 'WAL',
+        'synchronous': 'OFF',
+        'mmap_size': 256 * 1024 * 1024,
+        'cache_size': -64000,
+        'temp_store': 'MEMORY',
+        'busy_timeout': 10000
+    }
+}
+SQLITE_PROFILE = os.environ.get('SQLITE_PROFILE', 'balanced')
@@ -0,0 +1,57 @@
+import numpy as np
+
+# Vectorized building blocks for the analytics endpoint. Amounts stay integer
+# cents in int64 arrays; nothing here loops over rows in Python.
+
+ROLLING_WINDOWS = (30, 90)
+MOVING_AVERAGE_MONTHS = 3
+
+def column(rows, name, dtype=np.int64):
+    # One result column as an array, read straight off the rows
+    return np.fromiter((row[name] for row in rows), dtype=dtype, count=len(rows))
+
+def daily_category_matrix(days, category_ids, amounts, n_days):
+    # Scatter (day, category, amount) rows into an n_days x n_categories matrix
+    categories, category_index = np.unique(category_ids, return_inverse=True)
+    flat = np.bincount(
+        days * len(categories) + category_index,
+        weights=amounts,
+        minlength=n_days * len(categories)
+    )
+    return categories, np.rint(flat).astype(np.int64).reshape(n_days, len(categories))
+
+def rolling_sum(values, window):
+    # Trailing sum over up to `window` entries along the first axis
+    totals = np.cumsum(values, axis=0)
+    totals[window:] = totals[window:] - totals[:-window]
+    return totals
+
+def moving_average(values, window):
+    # Trailing mean over up to `window` entries along the first axis
+    counts = np.minimum(np.arange(1, len(values) + 1), window)
+    return rolling_sum(values, window) / counts.reshape((-1,) + (1,) * (values.ndim - 1))
+
+def month_of_day(start_date, n_days):
+    # Month offset (0 = start_date's month) of each of n_days from start_date
+    months = (np.datetime64(start_date, 'D') + np.arange(n_days)).astype('datetime64[M]')
+    return (months - months[0]).astype(np.int64) if n_days else np.zeros(0, dtype=np.int64)
+
+def sum_by_month(daily, month_index, n_months):
+    # Collapse daily rows into monthly rows
+    monthly = np.zeros((n_months,) + daily.shape[1:], dtype=daily.dtype)
+    np.add.at(monthly, month_index, daily)
+    return monthly
+
+def savings_rate(income, expenses):
+    # (income - expenses) / income, NaN where there is no income
+    income = np.asarray(income, dtype=np.float64)
+    rate = np.full(income.shape, np.nan)
+    np.divide(income - expenses, income, out=rate, where=income > 0)
+    return rate
+
+def to_amounts(cents):
+    # Cents array to a list of JSON numbers in major units
+    return np.round(np.asarray(cents) / 100, 2).tolist()
+
+def to_rates(rates):
+    return [None if np.isnan(rate) else round(float(rate), 4) for rate in np.atleast_1d(rates)]
@@ -1,127 +1,183 @@
-from utils.db import query_db
-import calendar
-from datetime import datetime, date
+from utils.db import query_db, iter_db
+from utils.dates import month_range
 
 class DashboardRepository:
-    def get_income_summary(self, user_id, month, year):
-        income_query = '''
-            SELECT 
-                SUM(expected_amount) as expected_income,
-                SUM(CASE WHEN is_received = 1 THEN actual_amount ELSE 0 END) as actual_income
-            FROM income_sources
-            WHERE user_id = ? AND month = ? AND year = ?
+    def get_overview(self, user_id, month, year):
+        # Whole month summary in one statement: per-category spend comes from
+        # the monthly rollup (spent), and totals, savings and per-budget spend
+        # are derived from it and the month's income. One row per budget
+        # allocation, or a single row with NULL budget columns when the month
+        # has none.
+        overview_query = '''
+            WITH
+            income AS (
+                SELECT
+                    COALESCE(SUM(expected_amount), 0) AS expected_income,
+                    COALESCE(SUM(CASE WHEN is_received = 1 THEN actual_amount ELSE 0 END), 0) AS actual_income
+                FROM income_sources
+                WHERE user_id = :user_id AND year = :year AND month = :month
+            ),
+            spent AS (
+                SELECT category_id, total AS spent_amount
+                FROM monthly_category_totals
+                WHERE user_id = :user_id AND year = :year AND month = :month
+            ),
+            totals AS (
+                SELECT COALESCE(SUM(spent_amount), 0) AS total_expenses
+                FROM spent
+            ),
+            budgets AS (
+                SELECT
+                    b.category_id,
+                    c.name AS category_name,
+                    b.amount AS budget_amount,
+                    COALESCE(s.spent_amount, 0) AS spent_amount
+                FROM budget_allocations b
+                JOIN categories c ON b.category_id = c.category_id
+                LEFT JOIN spent s ON s.category_id = b.category_id
+                WHERE b.user_id = :user_id AND b.year = :year AND b.month = :month
+            )
+            SELECT
+                i.expected_income,
+                i.actual_income,
+                t.total_expenses,
+                -- Same rule as SavingsService.update_savings, derived rather than
+                -- read from the savings table so the dashboard never writes
+                CASE WHEN i.actual_income > 0 THEN i.actual_income ELSE i.expected_income END
+                    - t.total_expenses AS savings,
+                bu.category_id,
+                bu.category_name,
+                bu.budget_amount,
+                bu.spent_amount
+            FROM income i
+            CROSS JOIN totals t
+            LEFT JOIN budgets bu ON 1 = 1
+            ORDER BY bu.category_name
         '''
         
-        income = query_db(income_query, (user_id, month, year), one=True)
+        rows = query_db(overview_query, {
+            'user_id': user_id,
+            'month': month,
+            'year': year
+        })
         
+        first = rows[0]
         return {
-            'expected_income': float(income['expected_income'] or 0),
-            'actual_income': float(income['actual_income'] or 0)
+            'expected_income': first['expected_income'],
+            'actual_income': first['actual_income'],
+            'total_expenses': first['total_expenses'],
+            'savings': first['savings'],
+            'budgets': [
+                {
+                    'category_id': row['category_id'],
+                    'category_name': row['category_name'],
+                    'budget_amount': row['budget_amount'],
+                    'spent_amount': row['spent_amount']
+                }
+                for row in rows if row['category_id'] is not None
+            ]
         }
     
-    def get_expenses_total(self, user_id, month, year):
-        # Get the first and last day of the month
-        _, last_day = calendar.monthrange(year, month)
-        start_date = f"{year}-{month:02d}-01"
-        end_date = f"{year}-{month:02d}-{last_day:02d}"
-        
-        expense_query = '''
-            SELECT SUM(amount) as total_expenses
-            FROM expenses
-            WHERE user_id = ? AND date BETWEEN ? AND ?
-        '''
-        
-        expenses = query_db(expense_query, (user_id, start_date, end_date), one=True)
+    def get_balance(self, user_id, month, year):
+        # The overview without per-budget rows, for callers that only need
+        # the month's totals: one row, no budget or category joins
+        balance = query_db('''
+            SELECT
+                i.expected_income,
+                i.actual_income,
+                t.total_expenses,
+                CASE WHEN i.actual_income > 0 THEN i.actual_income ELSE i.expected_income END
+                    - t.total_expenses AS savings
+            FROM (
+                SELECT
+                    COALESCE(SUM(expected_amount), 0) AS expected_income,
+                    COALESCE(SUM(CASE WHEN is_received = 1 THEN actual_amount ELSE 0 END), 0) AS actual_income
+                FROM income_sources
+                WHERE user_id = :user_id AND year = :year AND month = :month
+            ) i
+            CROSS JOIN (
+                SELECT COALESCE(SUM(total), 0) AS total_expenses
+                FROM monthly_category_totals
+                WHERE user_id = :user_id AND year = :year AND month = :month
+            ) t
+        ''', {'user_id': user_id, 'month': month, 'year': year}, one=True)
         
-        return float(expenses['total_expenses'] or 0)
+        return dict(balance)
     
-    def get_budget_summary(self, user_id, month, year):
-        budget_query = '''
-            SELECT 
-                b.category_id,
-                c.name as category_name,
-                b.amount as budget_amount
-            FROM budget_allocations b
-            JOIN categories c ON b.category_id = c.category_id
-            WHERE b.user_id = ? AND b.month = ? AND b.year = ?
-            ORDER BY c.name
-        '''
+    def get_trend(self, user_id, start, end):
+        # Income and per-category spend for every month in [start, end], as one
+        # statement ordered by month: each month's income row (NULL category)
+        # comes first, then its categories. Rows are streamed, not fetched at once.
+        (start_year, start_month), (end_year, end_month) = start, end
         
-        budgets = query_db(budget_query, (user_id, month, year))
-        return [dict(budget) for budget in budgets]
-    
-    def get_expenses_by_category(self, user_id, month, year):
-        # Get the first and last day of the month
-        _, last_day = calendar.monthrange(year, month)
-        start_date = f"{year}-{month:02d}-01"
-        end_date = f"{year}-{month:02d}-{last_day:02d}"
-        
-        category_expense_query = '''
-            SELECT 
-                e.category_id,
-                SUM(e.amount) as spent_amount
-            FROM expenses e
-            WHERE e.user_id = ? AND e.date BETWEEN ? AND ?
-            GROUP BY e.category_id
+        trend_query = '''
+            SELECT * FROM (
+                SELECT
+                    year,
+                    month,
+                    NULL AS category_id,
+                    NULL AS category_name,
+                    SUM(expected_amount) AS expected_income,
+                    SUM(CASE WHEN is_received = 1 THEN actual_amount ELSE 0 END) AS actual_income,
+                    NULL AS spent_amount
+                FROM income_sources
+                WHERE user_id = :user_id AND year BETWEEN :start_year AND :end_year
+                    AND year * 100 + month BETWEEN :start_key AND :end_key
+                GROUP BY year, month
+                UNION ALL
+                SELECT
+                    t.year,
+                    t.month,
+                    t.category_id,
+                    c.name AS category_name,
+                    NULL AS expected_income,
+                    NULL AS actual_income,
+                    t.total AS spent_amount
+                FROM monthly_category_totals t
+                JOIN categories c ON t.category_id = c.category_id
+                WHERE t.user_id = :user_id AND t.year BETWEEN :start_year AND :end_year
+                    AND t.year * 100 + t.month BETWEEN :start_key AND :end_key
+                    AND t.expense_count > 0
+            )
+            ORDER BY year, month, category_id IS NOT NULL, category_name
         '''
         
-        category_expenses = query_db(category_expense_query, (user_id, start_date, end_date))
-        
-        return {
-            expense['category_id']: float(expense['spent_amount'] or 0)
-            for expense in category_expenses
-        }
+        return iter_db(trend_query, {
+            'user_id': user_id,
+            'start_year': start_year,
+            'end_year': end_year,
+            'start_key': start_year * 100 + start_month,
+            'end_key': end_year * 100 + end_month
+        })
     
-    def get_recent_expenses(self, user_id, month, year, limit=5):
-        # Get the first and last day of the month
-        _, last_day = calendar.monthrange(year, month)
-        start_date = f"{year}-{month:02d}-01"
-        end_date = f"{year}-{month:02d}-{last_day:02d}"
-        
-        recent_expenses_query = '''
-            SELECT 
-                'expense' as type,
-                e.expense_id as id,
-                e.amount,
-                e.date as transaction_date,
-                e.description,
-                c.name as category_name,
-                c.category_id
-            FROM expenses e
-            JOIN categories c ON e.category_id = c.category_id
-            WHERE e.user_id = ? AND e.date BETWEEN ? AND ?
-            ORDER BY e.date DESC, e.created_at DESC
-            LIMIT ?
-        '''
-        
-        recent_expenses = query_db(recent_expenses_query, (user_id, start_date, end_date, limit))
-        return [dict(expense) for expense in recent_expenses]
+    def get_daily_category_spend(self, user_id, start_date, end_date):
+        # One row per (day, category) with spend in [start_date, end_date),
+        # day as an offset from start_date so no dates are parsed in Python.
+        # Grouping in index order lets SQLite aggregate straight off the
+        # (user_id, date, category_id, amount) index.
+        return query_db('''
+            SELECT
+                CAST(julianday(date) - julianday(:start_date) AS INTEGER) AS day,
+                category_id,
+                SUM(amount) AS amount
+            FROM expenses
+            WHERE user_id = :user_id AND date >= :start_date AND date < :end_date
+            GROUP BY date, category_id
+        ''', {'user_id': user_id, 'start_date': start_date, 'end_date': end_date})
     
-    def get_recent_income(self, user_id, month, year, limit=5):
-        recent_income_query = '''
-            SELECT 
-                'income' as type,
-                i.income_id as id,
-                CASE WHEN i.is_received = 1 THEN i.actual_amount ELSE i.expected_amount END as amount,
-                CASE WHEN i.is_received = 1 THEN i.receive_date ELSE i.due_date END as transaction_date,
-                i.description,
-                i.source_name
-            FROM income_sources i
-            WHERE i.user_id = ? AND i.month = ? AND i.year = ?
-            ORDER BY transaction_date DESC
-            LIMIT ?
-        '''
-        
-        recent_income = query_db(recent_income_query, (user_id, month, year, limit))
-        return [dict(income) for income in recent_income]
+    def get_monthly_income(self, user_id, year):
+        return query_db('''
+            SELECT
+                month,
+                SUM(expected_amount) AS expected_income,
+                SUM(CASE WHEN is_received = 1 THEN actual_amount ELSE 0 END) AS actual_income
+            FROM income_sources
+            WHERE user_id = ? AND year = ?
+            GROUP BY month
+        ''', (user_id, year))
     
-    def get_savings(self, user_id, month, year):
-        savings_query = '''
-            SELECT amount
-            FROM savings
-            WHERE user_id = ? AND month = ? AND year = ?
-        '''
-        
-        savings = query_db(savings_query, (user_id, month, year), one=True)
-        
-        return float(savings['amount']) if savings and savings['amount'] else 0
\ No newline at end of file
+    def get_category_names(self, user_id):
+        categories = query_db('''
+            SELECT category_id, name FROM categories WHERE user_id = ?
+        ''', (user_id,))
+        return {category['category_id']: category['name'] for category in categories}
\ No newline at end of file
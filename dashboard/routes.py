@@ -1,14 +1,26 @@
-from flask import request, jsonify, g
+from flask import request, jsonify, g, current_app, stream_with_context
 from http import HTTPStatus
 from utils.auth import login_required
-from dashboard.service import DashboardService
+from utils.etag import conditional_get
+from dashboard.service import DashboardService, DASHBOARD_FIELDS
 from dashboard import dashboard_bp
+from utils.dates import parse_month, parse_date
 from datetime import date
 
+# Ranges longer than TREND_STREAM_MONTHS are streamed month by month
+TREND_STREAM_MONTHS = 24
+TREND_MAX_MONTHS = 240
+
+# Analytics looks back from as_of and one day past it; keep that arithmetic
+# inside the years date can represent
+ANALYTICS_MIN_YEAR = 1900
+ANALYTICS_MAX_YEAR = 9998
+
 dashboard_service = DashboardService()
 
 @dashboard_bp.route('', methods=['GET'])
 @login_required
+@conditional_get
 def get_dashboard():
     print("Dashboard endpoint accessed")
     user_id = g.user['user_id']
@@ -19,10 +31,23 @@ def get_dashboard():
     month = request.args.get('month', type=int, default=current_date.month)
     year = request.args.get('year', type=int, default=current_date.year)
     print(f"Requested Month: {month}, Year: {year}")
+    
+    # Optional comma separated subset of the response sections
+    fields = DASHBOARD_FIELDS
+    if request.args.get('fields'):
+        fields = [field.strip() for field in request.args['fields'].split(',') if field.strip()]
+        unknown = [field for field in fields if field not in DASHBOARD_FIELDS]
+        if unknown or not fields:
+            return jsonify({
+                'status': 'error',
+                'message': f'Unknown fields: {", ".join(unknown)}. Choose from: {", ".join(DASHBOARD_FIELDS)}'
+            }), HTTPStatus.BAD_REQUEST
 
     try:
         print("Fetching dashboard overview...")
-        dashboard_data = dashboard_service.get_dashboard_overview(user_id, month, year)
+        dashboard_data = dashboard_service.get_cached_dashboard_overview(
+            user_id, month, year, g.user['data_version'], fields
+        )
         print(f"Dashboard Data: {dashboard_data}")
 
         return jsonify({
@@ -34,4 +59,73 @@ def get_dashboard():
         return jsonify({
             'status': 'error',
             'message': f'An error occurred while generating the dashboard: {str(e)}'
-        }), HTTPStatus.INTERNAL_SERVER_ERROR
\ No newline at end of file
+        }), HTTPStatus.INTERNAL_SERVER_ERROR
+
+@dashboard_bp.route('/trend', methods=['GET'])
+@login_required
+@conditional_get
+def get_trend():
+    user_id = g.user['user_id']
+    
+    try:
+        start = parse_month(request.args.get('from'))
+        end = parse_month(request.args.get('to'))
+    except ValueError as e:
+        return jsonify({
+            'status': 'error',
+            'message': str(e)
+        }), HTTPStatus.BAD_REQUEST
+    
+    months = (end[0] - start[0]) * 12 + end[1] - start[1] + 1
+    if months < 1 or months > TREND_MAX_MONTHS:
+        return jsonify({
+            'status': 'error',
+            'message': f'from must not be after to, and the range can be at most {TREND_MAX_MONTHS} months'
+        }), HTTPStatus.BAD_REQUEST
+    
+    trend = dashboard_service.get_trend(user_id, start, end)
+    
+    if months <= TREND_STREAM_MONTHS:
+        return jsonify({
+            'status': 'success',
+            'from': request.args['from'],
+            'to': request.args['to'],
+            'months': list(trend)
+        }), HTTPStatus.OK
+    
+    # Same document, written out as each month is built
+    def generate():
+        dumps = current_app.json.dumps
+        yield f'{{"status": "success", "from": {dumps(request.args["from"])}, "to": {dumps(request.args["to"])}, "months": ['
+        for index, month in enumerate(trend):
+            yield (',' if index else '') + dumps(month)
+        yield ']}'
+    
+    return current_app.response_class(stream_with_context(generate()), mimetype='application/json')
+
+@dashboard_bp.route('/analytics', methods=['GET'])
+@login_required
+@conditional_get
+def get_analytics():
+    user_id = g.user['user_id']
+    
+    try:
+        as_of = parse_date(request.args.get('as_of')) or date.today()
+    except ValueError:
+        return jsonify({
+            'status': 'error',
+            'message': 'as_of must be a date in YYYY-MM-DD format'
+        }), HTTPStatus.BAD_REQUEST
+    
+    if not ANALYTICS_MIN_YEAR <= as_of.year <= ANALYTICS_MAX_YEAR:
+        return jsonify({
+            'status': 'error',
+            'message': f'as_of must be between {ANALYTICS_MIN_YEAR} and {ANALYTICS_MAX_YEAR}'
+        }), HTTPStatus.BAD_REQUEST
+    
+    analytics = dashboard_service.get_analytics(user_id, as_of)
+    
+    return jsonify({
+        'status': 'success',
+        **analytics
+    }), HTTPStatus.OK
\ No newline at end of file
@@ -1,98 +1,215 @@
 from dashboard.repository import DashboardRepository
-from datetime import datetime, date
+from transaction.service import TransactionService
+from utils.money import from_cents
+from utils.cache import get_cache
+from utils.dates import iter_months
+from dashboard import analytics
+from itertools import groupby
+from datetime import date, timedelta
+import numpy as np
+
+# Sections of the dashboard response, selectable with ?fields=
+DASHBOARD_FIELDS = ('balance', 'budget_summary', 'recent_transactions', 'savings')
 
 class DashboardService:
     def __init__(self):
         self.repository = DashboardRepository()
+        self.transaction_service = TransactionService()
     
-    def get_dashboard_overview(self, user_id, month, year):
-        # 1. Get income summary
-        income_summary = self.repository.get_income_summary(user_id, month, year)
-        expected_income = income_summary['expected_income']
-        actual_income = income_summary['actual_income']
-        
-        # 2. Get total expenses
-        total_expenses = self.repository.get_expenses_total(user_id, month, year)
-        
-        # 3. Get budget summary
-        budgets = self.repository.get_budget_summary(user_id, month, year)
-        
-        # 4. Get expenses by category
-        expenses_by_category = self.repository.get_expenses_by_category(user_id, month, year)
-        
-        # 5. Combine budget and expenses data
-        budget_summary = []
-        for budget in budgets:
-            category_id = budget['category_id']
-            spent_amount = expenses_by_category.get(category_id, 0)
-            budget_amount = float(budget['budget_amount'])
-            remaining = budget_amount - spent_amount
-            percentage_used = (spent_amount / budget_amount * 100) if budget_amount > 0 else 0
-            
-            budget_summary.append({
-                'category_id': category_id,
-                'category_name': budget['category_name'],
-                'budget_amount': budget_amount,
-                'spent_amount': spent_amount,
-                'remaining': remaining,
-                'percentage_used': percentage_used
-            })
-        
-        # 6. Get recent transactions
-        recent_expenses = self.repository.get_recent_expenses(user_id, month, year, 5)
-        recent_income = self.repository.get_recent_income(user_id, month, year, 5)
-        
-        # Combine and sort transactions
-        transactions = []
-        
-        for expense in recent_expenses:
-            expense_dict = dict(expense)
-            if expense_dict['transaction_date']:
-                if isinstance(expense_dict['transaction_date'], str):
-                    expense_dict['transaction_date'] = datetime.strptime(
-                        expense_dict['transaction_date'], '%Y-%m-%d').date()
-            transactions.append(expense_dict)
-
-        for income in recent_income:
-            income_dict = dict(income)
-            if income_dict['transaction_date']:
-                if isinstance(income_dict['transaction_date'], str):
-                    income_dict['transaction_date'] = datetime.strptime(
-                        income_dict['transaction_date'], '%Y-%m-%d').date()
-            transactions.append(income_dict)
-
+    def get_cached_dashboard_overview(self, user_id, month, year, data_version, fields=DASHBOARD_FIELDS):
+        # Any write bumps the user's data_version, so a hit is always current
+        fields = tuple(field for field in DASHBOARD_FIELDS if field in fields)
+        return get_cache().get_or_set(
+            ('dashboard', user_id, month, year, data_version, fields),
+            lambda: self.get_dashboard_overview(user_id, month, year, fields)
+        )
+    
+    def get_dashboard_overview(self, user_id, month, year, fields=DASHBOARD_FIELDS):
+        # Only the queries the requested fields need are run: budget_summary
+        # needs the full overview statement, balance and savings the one-row
+        # balance, and recent_transactions the transactions feed
+        response = {'month': month, 'year': year}
+        
+        # 1. Income, expense totals, savings and per-budget spend in one statement
+        if 'budget_summary' in fields:
+            overview = self.repository.get_overview(user_id, month, year)
+        elif 'balance' in fields or 'savings' in fields:
+            overview = self.repository.get_balance(user_id, month, year)
         
-        # Sort by date (most recent first)
-        transactions.sort(key=lambda x: x['transaction_date'] if x['transaction_date'] else date.max, reverse=True)
-        transactions = transactions[:10]  # Limit to 10 most recent
+        # 2. Balance
+        if 'balance' in fields:
+            response['balance'] = {
+                'expected_income': from_cents(overview['expected_income']),
+                'actual_income': from_cents(overview['actual_income']),
+                'total_expenses': from_cents(overview['total_expenses']),
+                'remaining_budget': from_cents(overview['actual_income'] - overview['total_expenses'])
+            }
         
-        # 7. Get savings
-        savings_amount = self.repository.get_savings(user_id, month, year)
+        # 3. Budget summary
+        if 'budget_summary' in fields:
+            response['budget_summary'] = [self.build_budget_summary(budget) for budget in overview['budgets']]
         
-        # If savings record doesn't exist, calculate it
-        if savings_amount == 0:
-            # Update savings
-            from budget.routes import update_savings
-            try:
-                savings_amount = update_savings(user_id, month, year)
-            except:
-                # If update_savings function fails, calculate it here as fallback
-                savings_amount = actual_income - total_expenses
+        # 4. The month's 10 most recent transactions, merged and cut in SQL
+        if 'recent_transactions' in fields:
+            response['recent_transactions'], _ = self.transaction_service.get_transactions(
+                user_id, 10, month=month, year=year
+            )
         
-        # 8. Calculate remaining budget
-        remaining_budget = actual_income - total_expenses
+        # 5. Savings are derived in the overview query; the savings table is
+        # only refreshed by writes, never by this read
+        if 'savings' in fields:
+            response['savings'] = from_cents(overview['savings'])
+        
+        return response
+    
+    def build_budget_summary(self, budget):
+        spent_amount = budget['spent_amount']
+        budget_amount = budget['budget_amount']
+        remaining = budget_amount - spent_amount
+        percentage_used = (spent_amount / budget_amount * 100) if budget_amount > 0 else 0
+        
+        return {
+            'category_id': budget['category_id'],
+            'category_name': budget['category_name'],
+            'budget_amount': from_cents(budget_amount),
+            'spent_amount': from_cents(spent_amount),
+            'remaining': from_cents(remaining),
+            'percentage_used': percentage_used
+        }
+    
+    def get_trend(self, user_id, start, end):
+        # One summary per month from start to end, built while the rows stream
+        # in; months with no data still get a zeroed entry
+        rows = groupby(self.repository.get_trend(user_id, start, end), key=lambda row: (row['year'], row['month']))
+        current = next(rows, None)
+        
+        for period in iter_months(start, end):
+            period_rows = []
+            if current is not None and current[0] == period:
+                period_rows = list(current[1])
+                current = next(rows, None)
+            
+            yield self.build_trend_month(period, period_rows)
+    
+    def build_trend_month(self, period, rows):
+        year, month = period
+        expected_income = actual_income = 0
+        categories = []
+        
+        for row in rows:
+            if row['category_id'] is None:
+                expected_income = row['expected_income'] or 0
+                actual_income = row['actual_income'] or 0
+            else:
+                categories.append(row)
+        
+        total_expenses = sum(category['spent_amount'] for category in categories)
+        total_income = actual_income if actual_income > 0 else expected_income
         
-        # 9. Construct response
         return {
             'month': month,
             'year': year,
-            'balance': {
-                'expected_income': expected_income,
-                'actual_income': actual_income,
-                'total_expenses': total_expenses,
-                'remaining_budget': remaining_budget
+            'expected_income': from_cents(expected_income),
+            'actual_income': from_cents(actual_income),
+            'total_expenses': from_cents(total_expenses),
+            'savings': from_cents(total_income - total_expenses),
+            'categories': [
+                {
+                    'category_id': category['category_id'],
+                    'category_name': category['category_name'],
+                    'spent_amount': from_cents(category['spent_amount'])
+                }
+                for category in categories
+            ]
+        }
+    
+    def get_analytics(self, user_id, as_of):
+        # Year-to-date statistics up to and including as_of. Expenses are
+        # loaded from max(ROLLING_WINDOWS) - 1 days before January 1 so the
+        # rolling sums are complete from the first day of the year.
+        year_start = date(as_of.year, 1, 1)
+        load_start = year_start - timedelta(days=max(analytics.ROLLING_WINDOWS) - 1)
+        end = as_of + timedelta(days=1)
+        n_days = (end - load_start).days
+        offset = (year_start - load_start).days
+        
+        rows = self.repository.get_daily_category_spend(user_id, load_start.isoformat(), end.isoformat())
+        categories, spend = analytics.daily_category_matrix(
+            analytics.column(rows, 'day'),
+            analytics.column(rows, 'category_id'),
+            analytics.column(rows, 'amount', np.float64),
+            n_days
+        )
+        
+        # Rolling spend per day of the year
+        daily = spend.sum(axis=1)
+        rolling = {
+            f'spend_{window}d': analytics.rolling_sum(daily, window)[offset:]
+            for window in analytics.ROLLING_WINDOWS
+        }
+        
+        # Month by month, per category and overall
+        ytd_spend = spend[offset:]
+        month_index = analytics.month_of_day(year_start, len(ytd_spend))
+        monthly_spend = analytics.sum_by_month(ytd_spend, month_index, as_of.month)
+        moving_average = analytics.moving_average(monthly_spend, analytics.MOVING_AVERAGE_MONTHS)
+        monthly_expenses = monthly_spend.sum(axis=1)
+        
+        # Income per month, with the same actual-else-expected rule as savings
+        income_rows = [
+            row for row in self.repository.get_monthly_income(user_id, as_of.year)
+            if row['month'] <= as_of.month
+        ]
+        months = analytics.column(income_rows, 'month') - 1
+        monthly_income = np.zeros(as_of.month, dtype=np.int64)
+        monthly_income[months] = np.where(
+            analytics.column(income_rows, 'actual_income') > 0,
+            analytics.column(income_rows, 'actual_income'),
+            analytics.column(income_rows, 'expected_income')
+        )
+        
+        ytd_income = int(monthly_income.sum())
+        ytd_expenses = int(monthly_expenses.sum())
+        names = self.repository.get_category_names(user_id)
+        ytd_by_category = ytd_spend.sum(axis=0)
+        
+        return {
+            'as_of': as_of.isoformat(),
+            'ytd': {
+                'income': from_cents(ytd_income),
+                'expenses': from_cents(ytd_expenses),
+                'savings': from_cents(ytd_income - ytd_expenses),
+                'savings_rate': analytics.to_rates(analytics.savings_rate(ytd_income, ytd_expenses))[0]
+            },
+            'rolling': {
+                'start_date': year_start.isoformat(),
+                **{name: analytics.to_amounts(values) for name, values in rolling.items()}
             },
-            'budget_summary': budget_summary,
-            'recent_transactions': transactions,
-            'savings': savings_amount
+            'months': [
+                {
+                    'month': month + 1,
+                    'year': as_of.year,
+                    'income': income,
+                    'expenses': expenses,
+                    'savings': savings,
+                    'savings_rate': rate
+                }
+                for month, (income, expenses, savings, rate) in enumerate(zip(
+                    analytics.to_amounts(monthly_income),
+                    analytics.to_amounts(monthly_expenses),
+                    analytics.to_amounts(monthly_income - monthly_expenses),
+                    analytics.to_rates(analytics.savings_rate(monthly_income, monthly_expenses))
+                ))
+            ],
+            'categories': [
+                {
+                    'category_id': int(category_id),
+                    'category_name': names.get(int(category_id)),
+                    'ytd_total': from_cents(int(ytd_by_category[index])),
+                    'monthly': analytics.to_amounts(monthly_spend[:, index]),
+                    'moving_average': analytics.to_amounts(moving_average[:, index])
+                }
+                for index, category_id in enumerate(categories)
+                if ytd_by_category[index]
+            ]
         }
\ No newline at end of file
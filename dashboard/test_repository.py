@@ -0,0 +1,119 @@
+import unittest
+from datetime import date
+from utils.db import query_db, insert_db
+from utils.testing import DatabaseTestCase
+from expense.repository import ExpenseRepository
+from dashboard.repository import DashboardRepository
+from dashboard.service import DashboardService
+from savings.service import SavingsService
+from benchmarks.dashboard_overview import LegacyDashboardRepository, legacy_overview
+
+class TestDashboardOverview(DatabaseTestCase):
+    def setUp(self):
+        super().setUp()
+        self.service = DashboardService()
+
+    def seed(self):
+        category_id = insert_db('INSERT INTO categories (user_id, name) VALUES (?, ?)', (self.user_id, 'Food'))
+        insert_db(
+            'INSERT INTO income_sources (user_id, source_name, expected_amount, month, year) VALUES (?, ?, ?, ?, ?)',
+            (self.user_id, 'Job', 100000, 3, 2025)
+        )
+        insert_db(
+            'INSERT INTO expenses (user_id, category_id, amount, date) VALUES (?, ?, ?, ?)',
+            (self.user_id, category_id, 2550, '2025-03-04')
+        )
+        ExpenseRepository().rebuild_category_totals(self.user_id)
+
+    def test_savings_derived_without_writes(self):
+        """Test that savings are computed on read and the savings table is left alone"""
+        with self.app.app_context():
+            overview = self.service.get_dashboard_overview(self.user_id, 3, 2025)
+            empty_month = self.service.get_dashboard_overview(self.user_id, 4, 2025)
+            saved_rows = query_db('SELECT COUNT(*) AS n FROM savings', one=True)['n']
+
+        self.assertEqual(overview['savings'], 974.5)
+        self.assertEqual(empty_month['savings'], 0.0)
+        self.assertEqual(saved_rows, 0)
+
+    def test_fields_skip_unneeded_queries(self):
+        """Test that a balance-only dashboard runs one small statement"""
+        with self.app.app_context():
+            balance_only, statements = self.count_statements(
+                lambda: self.service.get_dashboard_overview(self.user_id, 3, 2025, ('balance',))
+            )
+            full = self.service.get_dashboard_overview(self.user_id, 3, 2025)
+
+        self.assertEqual(statements, 1)
+        self.assertEqual(set(balance_only), {'month', 'year', 'balance'})
+        self.assertEqual(balance_only['balance'], full['balance'])
+
+    def test_trend_covers_range_in_one_statement(self):
+        """Test that every month in the range is summarized from a single query"""
+        with self.app.app_context():
+            trend, statements = self.count_statements(
+                lambda: list(self.service.get_trend(self.user_id, (2025, 2), (2025, 4)))
+            )
+
+        self.assertEqual(statements, 1)
+        self.assertEqual([(m['year'], m['month']) for m in trend], [(2025, 2), (2025, 3), (2025, 4)])
+        self.assertEqual(trend[0]['total_expenses'], 0.0)
+        self.assertEqual(trend[1]['expected_income'], 1000.0)
+        self.assertEqual(trend[1]['savings'], 974.5)
+        self.assertEqual(trend[1]['categories'], [{'category_id': 1, 'category_name': 'Food', 'spent_amount': 25.5}])
+
+    def test_analytics_windows_and_year_to_date(self):
+        """Test rolling windows, monthly series and savings rate on a known ledger"""
+        with self.app.app_context():
+            insert_db(
+                'INSERT INTO expenses (user_id, category_id, amount, date) VALUES (?, ?, ?, ?)',
+                (self.user_id, 1, 1000, '2024-12-20')
+            )
+            result = self.service.get_analytics(self.user_id, date(2025, 3, 31))
+
+        rolling = result['rolling']
+        self.assertEqual(len(rolling['spend_30d']), 90)
+        # December spend counts toward January's windows but not the year to date
+        self.assertEqual(rolling['spend_30d'][0], 10.0)
+        self.assertEqual(rolling['spend_90d'][-1], 25.5)
+        self.assertEqual(rolling['spend_30d'][-1], 25.5)
+        self.assertEqual(result['ytd'], {'income': 1000.0, 'expenses': 25.5, 'savings': 974.5, 'savings_rate': 0.9745})
+        self.assertEqual([m['savings_rate'] for m in result['months']], [None, None, 0.9745])
+        self.assertEqual(result['categories'][0]['monthly'], [0.0, 0.0, 25.5])
+        self.assertEqual(result['categories'][0]['moving_average'], [0.0, 0.0, 8.5])
+
+    def test_overview_matches_per_section_reads(self):
+        """Test that the fused overview statement returns what the original seven reads did"""
+        with self.app.app_context():
+            rent = insert_db('INSERT INTO categories (user_id, name) VALUES (?, ?)', (self.user_id, 'Rent'))
+            travel = insert_db('INSERT INTO categories (user_id, name) VALUES (?, ?)', (self.user_id, 'Travel'))
+            for category_id, amount in ((1, 20000), (rent, 90000), (travel, 5000)):
+                insert_db(
+                    'INSERT INTO budget_allocations (user_id, category_id, amount, month, year) VALUES (?, ?, ?, ?, ?)',
+                    (self.user_id, category_id, amount, 3, 2025)
+                )
+            for category_id, amount, expense_date in ((rent, 85000, '2025-03-01'), (1, 1200, '2025-03-31'), (1, 999, '2025-04-01')):
+                insert_db(
+                    'INSERT INTO expenses (user_id, category_id, amount, date) VALUES (?, ?, ?, ?)',
+                    (self.user_id, category_id, amount, expense_date)
+                )
+            insert_db(
+                'INSERT INTO income_sources (user_id, source_name, expected_amount, actual_amount, is_received, month, year) VALUES (?, ?, ?, ?, 1, ?, ?)',
+                (self.user_id, 'Bonus', 30000, 31000, 3, 2025)
+            )
+            ExpenseRepository().rebuild_category_totals(self.user_id)
+
+            repository = DashboardRepository()
+            legacy = LegacyDashboardRepository()
+            results = []
+            for month, year in ((3, 2025), (4, 2025), (5, 2025)):
+                # The original dashboard refreshed the savings row before reading it
+                SavingsService().update_savings(self.user_id, month, year)
+                results.append((repository.get_overview(self.user_id, month, year), legacy_overview(legacy, self.user_id, month, year)))
+
+        for fused, original in results:
+            self.assertEqual(fused, original)
+        self.assertEqual(len(results[0][0]['budgets']), 3)
+
+if __name__ == '__main__':
+    unittest.main()
\ No newline at end of file
@@ -2,6 +2,7 @@ import unittest
 from flask import Flask
 from dashboard.routes import dashboard_bp
 from http import HTTPStatus
+from utils.testing import DatabaseTestCase
 
 class TestDashboardRoutes(unittest.TestCase):
     def setUp(self):
@@ -14,5 +15,24 @@ class TestDashboardRoutes(unittest.TestCase):
         response = self.client.get('/api/dashboard')
         self.assertEqual(response.status_code, HTTPStatus.UNAUTHORIZED)
 
+class TestAnalyticsRoute(DatabaseTestCase):
+    def setUp(self):
+        super().setUp()
+        self.app.register_blueprint(dashboard_bp, url_prefix='/api/dashboard')
+        self.client = self.app.test_client()
+
+    def test_as_of_out_of_range(self):
+        """Test that as_of dates at the edges of the calendar are a 400, not an overflow"""
+        headers = self.auth_headers()
+
+        for as_of in ('9999-12-31', '0001-01-05', '1899-12-31'):
+            response = self.client.get(f'/api/dashboard/analytics?as_of={as_of}', headers=headers)
+            self.assertEqual(response.status_code, HTTPStatus.BAD_REQUEST, as_of)
+            self.assertEqual(response.get_json()['status'], 'error')
+
+        for as_of in ('1900-01-01', '9998-12-31'):
+            response = self.client.get(f'/api/dashboard/analytics?as_of={as_of}', headers=headers)
+            self.assertEqual(response.status_code, HTTPStatus.OK, as_of)
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
@@ -1,8 +0,0 @@
-from flask import Blueprint
-
-expense_bp = Blueprint('expense', __name__)
-
-from expense.routes import *
-
-def get_blueprint():
-    return expense_bp
\ No newline at end of file
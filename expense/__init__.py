@@ -0,0 +1,10 @@
+from flask import Blueprint
+
+# cli_group=None puts the expense commands at the top level (`flask rebuild-category-totals`)
+expense_bp = Blueprint('expense', __name__, cli_group=None)
+
+from expense.routes import *
+from expense.commands import *
+
+def get_blueprint():
+    return expense_bp
\ No newline at end of file
@@ -0,0 +1,13 @@
+import click
+from expense.repository import ExpenseRepository
+from expense import expense_bp
+from utils.db import transaction
+
+@expense_bp.cli.command('rebuild-category-totals')
+@click.option('--user-id', type=int, default=None, help='Only rebuild this user\'s totals.')
+def rebuild_category_totals_command(user_id):
+    # Recompute monthly_category_totals from the expenses table
+    with transaction():
+        rows = ExpenseRepository().rebuild_category_totals(user_id)
+    
+    click.echo(f'Rebuilt {rows} monthly category totals.')
\ No newline at end of file
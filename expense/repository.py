@@ -1,11 +1,14 @@
-from utils.db import query_db, insert_db, update_db
+from utils.db import query_db, insert_db, update_db, executemany_db
+from utils.dates import month_range, year_range
 from datetime import datetime, date
-import calendar
+
+# The generated year/month columns are for filtering only, not for responses
+EXPENSE_COLUMNS = 'e.expense_id, e.user_id, e.category_id, e.amount, e.date, e.description, e.created_at, e.updated_at'
 
 class ExpenseRepository:
-    def get_expenses(self, user_id, month=None, year=None, category_id=None):
-        query = '''
-            SELECT e.*, c.name AS category_name
+    def build_expenses_query(self, user_id, month=None, year=None, category_id=None):
+        query = f'''
+            SELECT {EXPENSE_COLUMNS}, c.name AS category_name
             FROM expenses e
             JOIN categories c ON e.category_id = c.category_id
             WHERE e.user_id = ?
@@ -13,15 +16,17 @@ class ExpenseRepository:
         
         args = [user_id]
         
+        # Period filters are sargable: half-open date ranges where possible,
+        # the indexed generated month column for "this month in any year"
         if month and year:
-            query += ' AND strftime("%m", e.date) = ? AND strftime("%Y", e.date) = ?'
-            args.extend([f'{month:02d}', str(year)])
+            query += ' AND e.date >= ? AND e.date < ?'
+            args.extend(month_range(year, month))
         elif month:
-            query += ' AND strftime("%m", e.date) = ?'
-            args.append(f'{month:02d}')
+            query += ' AND e.month = ?'
+            args.append(month)
         elif year:
-            query += ' AND strftime("%Y", e.date) = ?'
-            args.append(str(year))
+            query += ' AND e.date >= ? AND e.date < ?'
+            args.extend(year_range(year))
         
         if category_id:
             query += ' AND e.category_id = ?'
@@ -29,12 +34,17 @@ class ExpenseRepository:
         
         query += ' ORDER BY e.date DESC, e.created_at DESC'
         
-        expenses = query_db(query, tuple(args))
+        return query, tuple(args)
+    
+    def get_expenses(self, user_id, month=None, year=None, category_id=None):
+        query, args = self.build_expenses_query(user_id, month, year, category_id)
+        
+        expenses = query_db(query, args)
         return [dict(expense) for expense in expenses]
     
     def get_expense_by_id(self, user_id, expense_id):
-        expense = query_db('''
-            SELECT e.*, c.name AS category_name
+        expense = query_db(f'''
+            SELECT {EXPENSE_COLUMNS}, c.name AS category_name
             FROM expenses e
             JOIN categories c ON e.category_id = c.category_id
             WHERE e.expense_id = ? AND e.user_id = ?
@@ -48,6 +58,24 @@ class ExpenseRepository:
             WHERE category_id = ? AND user_id = ?
         ''', (category_id, user_id), one=True)
     
+    def get_category_lookup(self, user_id):
+        # All of the user's categories in one query, for validating many rows
+        categories = query_db('''
+            SELECT category_id, name FROM categories
+            WHERE user_id = ?
+        ''', (user_id,))
+        
+        by_id = {category['category_id']: category['name'] for category in categories}
+        by_name = {category['name'].lower(): category['category_id'] for category in categories}
+        return by_id, by_name
+    
+    def create_expenses(self, rows):
+        # rows: (user_id, category_id, amount, date, description) tuples
+        return executemany_db('''
+            INSERT INTO expenses (user_id, category_id, amount, date, description)
+            VALUES (?, ?, ?, ?, ?)
+        ''', rows)
+    
     def create_expense(self, user_id, category_id, amount, expense_date, description=None):
         return insert_db('''
             INSERT INTO expenses (user_id, category_id, amount, date, description)
@@ -81,31 +109,57 @@ class ExpenseRepository:
         return rows_affected > 0
     
     def calculate_total_amount(self, expenses):
-        total = 0.0
-        for expense in expenses:
-            total += float(expense['amount'])
-        return total
+        # Amounts are integer cents, so the total is exact
+        return sum(expense['amount'] for expense in expenses)
     
     def get_monthly_expenses_by_category(self, user_id, month, year):
-        _, last_day = calendar.monthrange(year, month)
-        start_date = f"{year}-{month:02d}-01"
-        end_date = f"{year}-{month:02d}-{last_day:02d}"
-        
+        # Answered from the rollup: one row per category, not per expense
         query = '''
-            SELECT e.category_id, c.name AS category_name, SUM(e.amount) AS total
-            FROM expenses e
-            JOIN categories c ON e.category_id = c.category_id
-            WHERE e.user_id = ? AND e.date BETWEEN ? AND ?
-            GROUP BY e.category_id
-            ORDER BY total DESC
+            SELECT t.category_id, c.name AS category_name, t.total
+            FROM monthly_category_totals t
+            JOIN categories c ON t.category_id = c.category_id
+            WHERE t.user_id = ? AND t.year = ? AND t.month = ? AND t.expense_count > 0
+            ORDER BY t.total DESC
         '''
         
-        expenses = query_db(query, (user_id, start_date, end_date))
+        expenses = query_db(query, (user_id, year, month))
         return [dict(expense) for expense in expenses]
     
+    def apply_category_totals(self, user_id, deltas):
+        # deltas: (year, month, category_id, amount, count) tuples added to the
+        # user's rollup rows; callers run this in the expense write's transaction
+        executemany_db('''
+            INSERT INTO monthly_category_totals (user_id, year, month, category_id, total, expense_count)
+            VALUES (?, ?, ?, ?, ?, ?)
+            ON CONFLICT (user_id, year, month, category_id) DO UPDATE SET
+                total = total + excluded.total,
+                expense_count = expense_count + excluded.expense_count
+        ''', [(user_id,) + tuple(delta) for delta in deltas])
+        
+        # Drop rows whose last expense moved or was deleted
+        if any(delta[4] < 0 for delta in deltas):
+            update_db('''
+                DELETE FROM monthly_category_totals
+                WHERE user_id = ? AND expense_count <= 0
+            ''', (user_id,))
+    
+    def rebuild_category_totals(self, user_id=None):
+        # Recompute the rollup from expenses, for one user or everyone
+        where = 'WHERE user_id = ?' if user_id is not None else ''
+        args = (user_id,) if user_id is not None else ()
+        
+        update_db(f'DELETE FROM monthly_category_totals {where}', args)
+        return update_db(f'''
+            INSERT INTO monthly_category_totals (user_id, year, month, category_id, total, expense_count)
+            SELECT user_id, year, month, category_id, SUM(amount), COUNT(*)
+            FROM expenses
+            {where}
+            GROUP BY user_id, year, month, category_id
+        ''', args)
+    
     def get_recent_expenses(self, user_id, limit=5):
-        query = '''
-            SELECT e.*, c.name AS category_name
+        query = f'''
+            SELECT {EXPENSE_COLUMNS}, c.name AS category_name
             FROM expenses e
             JOIN categories c ON e.category_id = c.category_id
             WHERE e.user_id = ?
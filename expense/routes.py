@@ -1,5 +1,7 @@
 from flask import request, jsonify, g
+import io
 from utils.auth import login_required
+from utils.etag import conditional_get
 from expense.service import ExpenseService
 from expense import expense_bp
 
@@ -7,6 +9,7 @@ expense_service = ExpenseService()
 
 @expense_bp.route('', methods=['GET'])
 @login_required
+@conditional_get
 def get_expenses():
     user_id = g.user['user_id']
     
@@ -14,7 +17,19 @@ def get_expenses():
     year = request.args.get('year', type=int)
     category_id = request.args.get('category', type=int)
     
-    expenses, total_amount = expense_service.get_expenses(user_id, month, year, category_id)
+    if month is not None and not 1 <= month <= 12:
+        return jsonify({
+            'status': 'error',
+            'message': 'month must be between 1 and 12'
+        }), 400
+    
+    try:
+        expenses, total_amount = expense_service.get_expenses(user_id, month, year, category_id)
+    except ValueError as e:
+        return jsonify({
+            'status': 'error',
+            'message': str(e)
+        }), 400
     
     return jsonify({
         'status': 'success',
@@ -95,6 +110,47 @@ def create_expense():
             'message': str(e)
         }), 500
 
+@expense_bp.route('/import', methods=['POST'])
+@login_required
+def import_expenses():
+    user_id = g.user['user_id']
+    
+    import_format = request.args.get('format')
+    if not import_format:
+        if request.mimetype == 'text/csv':
+            import_format = 'csv'
+        elif request.mimetype in ('application/x-ndjson', 'application/ndjson'):
+            import_format = 'ndjson'
+    
+    if import_format not in ('csv', 'ndjson'):
+        return jsonify({
+            'status': 'error',
+            'message': 'Body must be text/csv or application/x-ndjson'
+        }), 415
+    
+    # Parse the body as a stream instead of buffering it
+    stream = io.TextIOWrapper(io.BufferedReader(request.stream), encoding='utf-8-sig', newline='')
+    
+    try:
+        imported, months = expense_service.import_expenses(user_id, stream, import_format)
+        
+        return jsonify({
+            'status': 'success',
+            'imported': imported,
+            'months': months
+        }), 201
+        
+    except (ValueError, UnicodeDecodeError) as e:
+        return jsonify({
+            'status': 'error',
+            'message': str(e)
+        }), 400
+    except Exception as e:
+        return jsonify({
+            'status': 'error',
+            'message': str(e)
+        }), 500
+
 @expense_bp.route('/<int:expense_id>', methods=['PUT'])
 @login_required
 def update_expense(expense_id):
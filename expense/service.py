@@ -1,9 +1,22 @@
 from expense.repository import ExpenseRepository
+from savings.service import SavingsService
+from alert.service import AlertService
+from utils.money import to_cents, from_cents
+from utils.dates import parse_date
+from utils.db import transaction
 from datetime import datetime
+from collections import defaultdict
+import csv
+import json
+
+IMPORT_BATCH_SIZE = 500
+IMPORT_FORMATS = ('csv', 'ndjson')
 
 class ExpenseService:
     def __init__(self):
         self.repository = ExpenseRepository()
+        self.savings = SavingsService()
+        self.alerts = AlertService()
     
     def get_expenses(self, user_id, month=None, year=None, category_id=None):
         expenses = self.repository.get_expenses(user_id, month, year, category_id)
@@ -17,12 +30,13 @@ class ExpenseService:
                 if isinstance(processed_expense['date'], str):  # Only convert if it's a string
                     processed_expense['date'] = datetime.strptime(processed_expense['date'], '%Y-%m-%d').date()
             
+            processed_expense['amount'] = from_cents(processed_expense['amount'])
             processed_expenses.append(processed_expense)
         
         # Calculate total amount
         total_amount = self.repository.calculate_total_amount(expenses)
         
-        return processed_expenses, total_amount
+        return processed_expenses, from_cents(total_amount)
     
     def get_expense_by_id(self, user_id, expense_id):
         expense = self.repository.get_expense_by_id(user_id, expense_id)
@@ -35,108 +49,221 @@ class ExpenseService:
             if isinstance(expense['date'], str):  # Only convert if it's a string
                 expense['date'] = datetime.strptime(expense['date'], '%Y-%m-%d').date()
         
+        expense['amount'] = from_cents(expense['amount'])
+        
         return expense
     
     def create_expense(self, user_id, create_request):
-        # Check if category exists and belongs to user
-        category = self.repository.get_category(user_id, create_request.category_id)
-        
-        if not category:
-            raise ValueError("Category not found or does not belong to user")
-        
-        # Create new expense
-        expense_id = self.repository.create_expense(
-            user_id=user_id,
-            category_id=create_request.category_id,
-            amount=create_request.amount,
-            expense_date=create_request.date,
-            description=create_request.description
-        )
+        with transaction():
+            # Check if category exists and belongs to user
+            category = self.repository.get_category(user_id, create_request.category_id)
+            
+            if not category:
+                raise ValueError("Category not found or does not belong to user")
+            
+            # Create new expense, stored with the canonical date
+            amount = to_cents(create_request.amount)
+            expense_date = parse_date(create_request.date)
+            expense_id = self.repository.create_expense(
+                user_id=user_id,
+                category_id=create_request.category_id,
+                amount=amount,
+                expense_date=expense_date.isoformat(),
+                description=create_request.description
+            )
+            
+            # Update the monthly rollup and savings in the same commit
+            self.repository.apply_category_totals(user_id, [
+                (expense_date.year, expense_date.month, create_request.category_id, amount, 1)
+            ])
+            self.apply_savings_delta(user_id, expense_date.month, expense_date.year, amount)
+            
+            # Only the budget this expense counts against is checked
+            self.alerts.evaluate(user_id, [(expense_date.year, expense_date.month, create_request.category_id)])
         
         # Get the newly created expense
-        expense = self.get_expense_by_id(user_id, expense_id)
-        
-        # Update savings
-        if expense:
-            expense_date = datetime.strptime(create_request.date, '%Y-%m-%d').date()
-            self.update_savings(user_id, expense_date.month, expense_date.year)
-        
-        return expense
+        return self.get_expense_by_id(user_id, expense_id)
     
     def update_expense(self, user_id, expense_id, update_request):
-        # Get current expense
-        expense = self.repository.get_expense_by_id(user_id, expense_id)
-        
-        if not expense:
-            return None
-        
-        # Store old date for savings update
-        old_date = datetime.strptime(expense['date'], '%Y-%m-%d').date()
-        
-        # Validate category if changed
-        if update_request.category_id is not None and update_request.category_id != expense['category_id']:
-            category = self.repository.get_category(user_id, update_request.category_id)
-            if not category:
-                raise ValueError("Category not found or does not belong to user")
-        
-        # Update expense
-        success = self.repository.update_expense(
-            user_id=user_id,
-            expense_id=expense_id,
-            category_id=update_request.category_id,
-            amount=update_request.amount,
-            expense_date=update_request.date,
-            description=update_request.description
-        )
-        
-        if not success:
-            return None
-        
-        # Get updated expense
-        updated_expense = self.get_expense_by_id(user_id, expense_id)
-        
-        # Update savings if needed
-        if updated_expense:
+        with transaction():
+            # Get current expense
+            expense = self.repository.get_expense_by_id(user_id, expense_id)
+            
+            if not expense:
+                return None
+            
+            # Store old date for savings update
+            old_date = parse_date(expense['date'])
+            new_date = parse_date(update_request.date) if update_request.date is not None else old_date
+            new_amount = to_cents(update_request.amount) if update_request.amount is not None else expense['amount']
+            new_category_id = update_request.category_id if update_request.category_id is not None else expense['category_id']
+            
+            # Validate category if changed
+            if update_request.category_id is not None and update_request.category_id != expense['category_id']:
+                category = self.repository.get_category(user_id, update_request.category_id)
+                if not category:
+                    raise ValueError("Category not found or does not belong to user")
+            
+            # Update expense
+            success = self.repository.update_expense(
+                user_id=user_id,
+                expense_id=expense_id,
+                category_id=update_request.category_id,
+                amount=to_cents(update_request.amount),
+                expense_date=new_date.isoformat() if update_request.date is not None else None,
+                description=update_request.description
+            )
+            
+            if not success:
+                return None
+            
+            # Update savings if needed
             has_changes = (
-                update_request.amount is not None and float(update_request.amount) != float(expense['amount']) or
-                update_request.date is not None and update_request.date != expense['date'] or
-                update_request.category_id is not None and update_request.category_id != expense['category_id']
+                new_amount != expense['amount'] or
+                new_date != old_date or
+                new_category_id != expense['category_id']
             )
             
             if has_changes:
-                # Update savings for old month/year
-                self.update_savings(user_id, old_date.month, old_date.year)
+                # Move the expense out of its old rollup row and into the new one
+                self.repository.apply_category_totals(user_id, [
+                    (old_date.year, old_date.month, expense['category_id'], -expense['amount'], -1),
+                    (new_date.year, new_date.month, new_category_id, new_amount, 1)
+                ])
                 
-                # If date changed, update savings for new month/year as well
-                if update_request.date is not None and update_request.date != expense['date']:
-                    new_date = datetime.strptime(update_request.date, '%Y-%m-%d').date()
-                    if new_date.month != old_date.month or new_date.year != old_date.year:
-                        self.update_savings(user_id, new_date.month, new_date.year)
+                # Take the old amount out of the old month's savings and put
+                # the new amount into the new month's (the same month nets out)
+                self.apply_savings_delta(user_id, old_date.month, old_date.year, -expense['amount'])
+                self.apply_savings_delta(user_id, new_date.month, new_date.year, new_amount)
+                
+                # Spend left the old budget and reached the new one (the same
+                # budget when only the amount changed)
+                self.alerts.rearm(user_id, [(old_date.year, old_date.month, expense['category_id'])])
+                self.alerts.evaluate(user_id, [(new_date.year, new_date.month, new_category_id)])
         
-        return updated_expense
+        # Get updated expense
+        return self.get_expense_by_id(user_id, expense_id)
     
     def delete_expense(self, user_id, expense_id):
-        # Get expense before deletion
-        expense = self.repository.get_expense_by_id(user_id, expense_id)
+        with transaction():
+            # Get expense before deletion
+            expense = self.repository.get_expense_by_id(user_id, expense_id)
+            
+            if not expense:
+                return False
+            
+            # Store date for savings update
+            expense_date = parse_date(expense['date'])
+            
+            # Delete expense
+            success = self.repository.delete_expense(user_id, expense_id)
+            
+            # Update the rollup and savings if deletion was successful
+            if success:
+                self.repository.apply_category_totals(user_id, [
+                    (expense_date.year, expense_date.month, expense['category_id'], -expense['amount'], -1)
+                ])
+                self.apply_savings_delta(user_id, expense_date.month, expense_date.year, -expense['amount'])
+                self.alerts.rearm(user_id, [(expense_date.year, expense_date.month, expense['category_id'])])
         
-        if not expense:
-            return False
+        return success
+    
+    def import_expenses(self, user_id, stream, import_format, batch_size=None):
+        # The whole stream is parsed and validated before the write lock is
+        # taken, so a slow upload never holds it. The validated rows are then
+        # inserted in batches inside one short transaction: a bad row, or
+        # any failure while writing, imports nothing.
+        batch_size = batch_size or IMPORT_BATCH_SIZE
+        categories_by_id, categories_by_name = self.repository.get_category_lookup(user_id)
         
-        print(expense)
-        # Store date for savings update
-        expense_date = expense['date']
+        rows = []
+        totals = defaultdict(lambda: [0, 0])
+        month_totals = defaultdict(int)
         
-        # Delete expense
-        success = self.repository.delete_expense(user_id, expense_id)
+        for line_number, record in self.parse_import_rows(stream, import_format):
+            category_id, amount, expense_date, description = self.validate_import_row(
+                record, line_number, categories_by_id, categories_by_name
+            )
+            
+            rows.append((user_id, category_id, amount, expense_date.isoformat(), description))
+            
+            period_total = totals[(expense_date.year, expense_date.month, category_id)]
+            period_total[0] += amount
+            period_total[1] += 1
+            month_totals[(expense_date.year, expense_date.month)] += amount
         
-        # Update savings if deletion was successful
-        if success:
-            self.update_savings(user_id, expense_date.month, expense_date.year)
+        imported = 0
         
-        return success
+        with transaction():
+            for start in range(0, len(rows), batch_size):
+                imported += self.repository.create_expenses(rows[start:start + batch_size])
+            
+            # The rollup gets one delta per month and category, and savings
+            # one delta per affected month, not one per row
+            self.repository.apply_category_totals(
+                user_id, [key + tuple(value) for key, value in totals.items()]
+            )
+            for (year, month), amount in sorted(month_totals.items()):
+                self.apply_savings_delta(user_id, month, year, amount)
+            
+            self.alerts.evaluate(user_id, sorted(totals))
+        
+        return imported, [{'month': month, 'year': year} for year, month in sorted(month_totals)]
+    
+    def parse_import_rows(self, stream, import_format):
+        if import_format == 'csv':
+            reader = csv.DictReader(stream)
+            for record in reader:
+                yield reader.line_num, record
+        elif import_format == 'ndjson':
+            for line_number, line in enumerate(stream, start=1):
+                if not line.strip():
+                    continue
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    raise ValueError(f"Line {line_number}: invalid JSON")
+                if not isinstance(record, dict):
+                    raise ValueError(f"Line {line_number}: expected a JSON object")
+                yield line_number, record
+        else:
+            raise ValueError(f"Unsupported import format: {import_format}")
+    
+    def validate_import_row(self, record, line_number, categories_by_id, categories_by_name):
+        category_id = record.get('category_id')
+        category_name = record.get('category')
+        
+        try:
+            if category_id not in (None, ''):
+                category_id = int(category_id)
+                if category_id not in categories_by_id:
+                    raise ValueError("Category not found or does not belong to user")
+            elif category_name:
+                category_id = categories_by_name.get(str(category_name).strip().lower())
+                if category_id is None:
+                    raise ValueError(f"Unknown category: {category_name}")
+            else:
+                raise ValueError("Missing required field: category_id or category")
+            
+            if record.get('amount') in (None, ''):
+                raise ValueError("Missing required field: amount")
+            amount = to_cents(record['amount'])
+            
+            if not record.get('date'):
+                raise ValueError("Missing required field: date")
+            expense_date = parse_date(str(record['date']).strip())
+        except ValueError as e:
+            raise ValueError(f"Line {line_number}: {e}")
+        
+        return category_id, amount, expense_date, record.get('description') or None
     
     def get_monthly_expenses_by_category(self, user_id, month, year):
-        return self.repository.get_monthly_expenses_by_category(user_id, month, year)
+        expenses = self.repository.get_monthly_expenses_by_category(user_id, month, year)
+        
+        for expense in expenses:
+            expense['total'] = from_cents(expense['total'])
+        
+        return expenses
     
     def get_recent_expenses(self, user_id, limit=5):
         expenses = self.repository.get_recent_expenses(user_id, limit)
@@ -145,10 +272,10 @@ class ExpenseService:
             if expense['date']:
                 if isinstance(expense['date'], str):  # Only convert if it's a string
                     expense['date'] = datetime.strptime(expense['date'], '%Y-%m-%d').date()
+            
+            expense['amount'] = from_cents(expense['amount'])
         
         return expenses
     
-    def update_savings(self, user_id, month, year):
-        # Import locally to avoid circular imports
-        from budget.routes import update_savings
-        return update_savings(user_id, month, year)
+    def apply_savings_delta(self, user_id, month, year, expenses_delta):
+        return self.savings.apply_savings_delta(user_id, month, year, expenses_delta=expenses_delta)
@@ -0,0 +1,117 @@
+import sqlite3
+import unittest
+from utils.db import query_db, insert_db
+from utils.testing import DatabaseTestCase
+from types import SimpleNamespace
+from expense.repository import ExpenseRepository
+from expense.service import ExpenseService
+
+class TestExpenseRepository(DatabaseTestCase):
+    def setUp(self):
+        super().setUp()
+        self.repository = ExpenseRepository()
+
+    def seed(self):
+        self.category_id = insert_db(
+            'INSERT INTO categories (user_id, name) VALUES (?, ?)', (self.user_id, 'Food')
+        )
+        for expense_date in ('2024-03-31', '2025-02-28', '2025-03-01', '2025-03-31', '2025-04-01'):
+            insert_db(
+                'INSERT INTO expenses (user_id, category_id, amount, date) VALUES (?, ?, ?, ?)',
+                (self.user_id, self.category_id, 10, expense_date)
+            )
+
+    def test_period_filters(self):
+        """Test that month/year filters match exactly the calendar period"""
+        def dates(**filters):
+            return sorted(str(e['date']) for e in self.repository.get_expenses(self.user_id, **filters))
+
+        with self.app.app_context():
+            self.assertEqual(dates(month=3, year=2025), ['2025-03-01', '2025-03-31'])
+            self.assertEqual(dates(month=3), ['2024-03-31', '2025-03-01', '2025-03-31'])
+            self.assertEqual(dates(year=2025), ['2025-02-28', '2025-03-01', '2025-03-31', '2025-04-01'])
+            self.assertEqual(dates(month=12, year=2024), [])
+
+    def test_period_filters_use_index(self):
+        """Test that no period filter falls back to scanning the user's expenses"""
+        cases = [
+            dict(month=3, year=2025),
+            dict(month=3),
+            dict(year=2025),
+            dict(month=3, category_id=self.category_id)
+        ]
+
+        with self.app.app_context():
+            for filters in cases:
+                query, args = self.repository.build_expenses_query(self.user_id, **filters)
+                plan = [row['detail'] for row in query_db('EXPLAIN QUERY PLAN ' + query, args)]
+                expense_steps = [step for step in plan if step.split()[1] == 'e']
+
+                self.assertTrue(expense_steps, plan)
+                for step in expense_steps:
+                    self.assertTrue(step.startswith('SEARCH e USING'), f'{filters}: {plan}')
+                    self.assertIn('INDEX', step, f'{filters}: {plan}')
+                    self.assertNotIn('strftime', query)
+
+class TestCategoryTotals(DatabaseTestCase):
+    def setUp(self):
+        super().setUp()
+        self.service = ExpenseService()
+
+    def seed(self):
+        self.food = insert_db('INSERT INTO categories (user_id, name) VALUES (?, ?)', (self.user_id, 'Food'))
+        self.rent = insert_db('INSERT INTO categories (user_id, name) VALUES (?, ?)', (self.user_id, 'Rent'))
+
+    def totals(self):
+        rows = query_db('''
+            SELECT year, month, category_id, total, expense_count
+            FROM monthly_category_totals ORDER BY year, month, category_id
+        ''')
+        return [tuple(row) for row in rows]
+
+    def create(self, category_id, amount, expense_date):
+        return self.service.create_expense(self.user_id, SimpleNamespace(
+            category_id=category_id, amount=amount, date=expense_date, description=None
+        ))
+
+    def test_totals_follow_expense_writes(self):
+        """Test that creates, moves and deletes keep the rollup equal to a rebuild"""
+        with self.app.app_context():
+            first = self.create(self.food, 10.5, '2025-03-04')
+            second = self.create(self.food, 4.5, '2025-03-20')
+            self.create(self.rent, 100, '2025-03-01')
+
+            self.assertEqual(self.totals(), [(2025, 3, self.food, 1500, 2), (2025, 3, self.rent, 10000, 1)])
+
+            self.service.update_expense(self.user_id, second['expense_id'], SimpleNamespace(
+                category_id=self.rent, amount=5, date='2025-04-02', description=None
+            ))
+            self.service.delete_expense(self.user_id, first['expense_id'])
+
+            self.assertEqual(self.totals(), [(2025, 3, self.rent, 10000, 1), (2025, 4, self.rent, 500, 1)])
+
+            incremental = self.totals()
+            ExpenseRepository().rebuild_category_totals(self.user_id)
+            self.assertEqual(self.totals(), incremental)
+
+    def test_import_parses_without_the_write_lock(self):
+        """Test that other connections can write while an import is still reading its body"""
+        other = sqlite3.connect(self.db_path, timeout=0)
+        self.addCleanup(other.close)
+
+        def body():
+            yield 'category,amount,date\n'
+            for day in range(1, 6):
+                # Raises "database is locked" if the import holds the lock
+                other.execute('UPDATE users SET email = email WHERE user_id = ?', (self.user_id,))
+                other.commit()
+                yield f'Food,1,2025-04-{day:02d}\n'
+
+        with self.app.app_context():
+            imported, _ = self.service.import_expenses(self.user_id, body(), 'csv', batch_size=2)
+
+            self.assertEqual(imported, 5)
+            self.assertEqual(self.totals(), [(2025, 4, self.food, 500, 5)])
+
+if __name__ == '__main__':
+    unittest.main()
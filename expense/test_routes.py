@@ -1,7 +1,12 @@
+import json
 import unittest
+from datetime import date
+from unittest import mock
 from flask import Flask
 from expense.routes import expense_bp
 from http import HTTPStatus
+from utils.db import query_db, insert_db
+from utils.testing import DatabaseTestCase
 
 class TestExpenseRoutes(unittest.TestCase):
     def setUp(self):
@@ -13,6 +18,171 @@ class TestExpenseRoutes(unittest.TestCase):
         """Test that endpoints require authentication"""
         response = self.client.get('/api/expenses')
         self.assertEqual(response.status_code, HTTPStatus.UNAUTHORIZED)
+    
+    def test_import_requires_authentication(self):
+        """Test that bulk import requires authentication"""
+        response = self.client.post(
+            '/api/expenses/import',
+            data='category,amount,date\nFood,1.00,2025-04-01\n',
+            content_type='text/csv'
+        )
+        self.assertEqual(response.status_code, HTTPStatus.UNAUTHORIZED)
+
+class TestExpenseEndpoints(DatabaseTestCase):
+    def setUp(self):
+        super().setUp()
+        self.app.register_blueprint(expense_bp, url_prefix='/api/expenses')
+        self.client = self.app.test_client()
+        self.headers = self.auth_headers()
+
+    def seed(self):
+        self.category_id = insert_db('INSERT INTO categories (user_id, name) VALUES (?, ?)', (self.user_id, 'Food'))
+
+    def expense_dates(self):
+        with self.app.app_context():
+            return [str(row['date']) for row in query_db('SELECT date FROM expenses ORDER BY expense_id')]
+
+    def test_non_canonical_dates_rejected(self):
+        """Test that only YYYY-MM-DD dates are stored, on create and update"""
+        for bad_date in ('20250304', '2025-W10-2', '2025-03-04T10:00', 20250304):
+            response = self.client.post('/api/expenses', headers=self.headers, json={
+                'category_id': self.category_id, 'amount': 5, 'date': bad_date
+            })
+            self.assertEqual(response.status_code, HTTPStatus.BAD_REQUEST, bad_date)
+            self.assertIn('expected YYYY-MM-DD', response.get_json()['message'])
+
+        created = self.client.post('/api/expenses', headers=self.headers, json={
+            'category_id': self.category_id, 'amount': 5, 'date': '2025-3-4'
+        })
+        expense_id = created.get_json()['expense']['expense_id']
+        updated = self.client.put(f'/api/expenses/{expense_id}', headers=self.headers, json={'date': '20250305'})
+
+        self.assertEqual(created.status_code, HTTPStatus.CREATED)
+        self.assertEqual(updated.status_code, HTTPStatus.BAD_REQUEST)
+        self.assertEqual(self.expense_dates(), ['2025-03-04'])
+
+    def test_out_of_range_amounts_rejected(self):
+        """Test that amounts beyond the 64-bit cent range are a 400, not a 500"""
+        for amount in (1e20, -1e20, '1e400', 92233720368547758.08):
+            response = self.client.post('/api/expenses', headers=self.headers, json={
+                'category_id': self.category_id, 'amount': amount, 'date': '2025-03-04'
+            })
+            self.assertEqual(response.status_code, HTTPStatus.BAD_REQUEST, amount)
+
+        self.assertEqual(self.expense_dates(), [])
+
+    def test_reads_return_documented_fields(self):
+        """Test that list, single and recent reads return the same fields, without the generated columns"""
+        created = self.client.post('/api/expenses', headers=self.headers, json={
+            'category_id': self.category_id, 'amount': 5, 'date': '2025-03-04'
+        }).get_json()['expense']
+        listed = self.client.get('/api/expenses?month=3&year=2025', headers=self.headers).get_json()['expenses']
+        recent = self.client.get('/api/expenses/recent', headers=self.headers).get_json()['expenses']
+        fields = {
+            'expense_id', 'user_id', 'category_id', 'category_name', 'amount', 'date',
+            'description', 'created_at', 'updated_at'
+        }
+
+        self.assertEqual(set(created), fields)
+        self.assertEqual(set(listed[0]), fields)
+        self.assertEqual(set(recent[0]), fields)
+
+    def test_invalid_period_rejected(self):
+        """Test that an out of range month or year is a 400"""
+        for query in ('month=13&year=2025', 'month=0', 'month=13', 'year=10000', 'month=1&year=10000'):
+            response = self.client.get(f'/api/expenses?{query}', headers=self.headers)
+            self.assertEqual(response.status_code, HTTPStatus.BAD_REQUEST, query)
+            self.assertEqual(response.get_json()['status'], 'error')
+
+class TestExpenseImport(DatabaseTestCase):
+    def setUp(self):
+        super().setUp()
+        self.app.register_blueprint(expense_bp, url_prefix='/api/expenses')
+        self.client = self.app.test_client()
+        self.headers = self.auth_headers()
+
+    def seed(self):
+        self.food = insert_db('INSERT INTO categories (user_id, name) VALUES (?, ?)', (self.user_id, 'Food'))
+        self.rent = insert_db('INSERT INTO categories (user_id, name) VALUES (?, ?)', (self.user_id, 'Rent'))
+
+    def post(self, body, content_type):
+        return self.client.post('/api/expenses/import', headers=self.headers, data=body, content_type=content_type)
+
+    def stored(self):
+        with self.app.app_context():
+            expenses = query_db('SELECT category_id, amount, date FROM expenses ORDER BY expense_id')
+            totals = query_db('''
+                SELECT year, month, category_id, total, expense_count
+                FROM monthly_category_totals ORDER BY year, month, category_id
+            ''')
+            savings = query_db('SELECT year, month, amount FROM savings ORDER BY year, month')
+            return [[tuple(row) for row in rows] for rows in (expenses, totals, savings)]
+
+    def test_csv_import_updates_rollup_and_savings(self):
+        """Test that a CSV import stores every row and moves the rollup and savings once per month"""
+        response = self.post(
+            'category,category_id,amount,date,description\n'
+            'Food,,12.34,2025-04-10,Lunch\n'
+            'rent,,800.00,2025-04-01,\n'
+            f',{self.food},1.66,2025-05-02,\n',
+            'text/csv'
+        )
+        expenses, totals, savings = self.stored()
+
+        self.assertEqual(response.status_code, HTTPStatus.CREATED)
+        self.assertEqual(response.get_json()['imported'], 3)
+        self.assertEqual(response.get_json()['months'], [{'month': 4, 'year': 2025}, {'month': 5, 'year': 2025}])
+        self.assertEqual(expenses[1], (self.rent, 80000, date(2025, 4, 1)))
+        self.assertEqual(totals, [(2025, 4, self.food, 1234, 1), (2025, 4, self.rent, 80000, 1), (2025, 5, self.food, 166, 1)])
+        self.assertEqual(savings, [(2025, 4, -81234), (2025, 5, -166)])
+
+    def test_ndjson_import_by_category_id(self):
+        """Test that NDJSON rows are read by category_id and blank lines are skipped"""
+        body = '\n'.join([
+            json.dumps({'category_id': self.food, 'amount': 2.5, 'date': '2025-04-10'}),
+            '',
+            json.dumps({'category_id': self.rent, 'amount': '7', 'date': '2025-04-11', 'description': 'Key'})
+        ])
+        response = self.post(body, 'application/x-ndjson')
+        expenses, totals, _ = self.stored()
+
+        self.assertEqual(response.status_code, HTTPStatus.CREATED)
+        self.assertEqual(expenses, [(self.food, 250, date(2025, 4, 10)), (self.rent, 700, date(2025, 4, 11))])
+        self.assertEqual(totals, [(2025, 4, self.food, 250, 1), (2025, 4, self.rent, 700, 1)])
+
+    def test_bad_rows_name_their_line(self):
+        """Test that an invalid row is a 400 naming its line, with nothing written"""
+        cases = [
+            ('category,amount,date\nFood,1,2025-04-01\nGroceries,1,2025-04-02\n', 'text/csv', 'Line 3: Unknown category'),
+            ('category,amount,date\nFood,,2025-04-01\n', 'text/csv', 'Line 2: Missing required field: amount'),
+            ('category,amount,date\nFood,1,20250401\n', 'text/csv', 'Line 2: Invalid date'),
+            ('{"category_id": 1, "amount": 1, "date": "2025-04-01"}\n{oops\n', 'application/x-ndjson', 'Line 2: invalid JSON'),
+            ('[1, 2]\n', 'application/x-ndjson', 'Line 1: expected a JSON object')
+        ]
+
+        for body, content_type, message in cases:
+            response = self.post(body, content_type)
+            self.assertEqual(response.status_code, HTTPStatus.BAD_REQUEST, body)
+            self.assertTrue(response.get_json()['message'].startswith(message), response.get_json()['message'])
+
+        self.assertEqual(self.stored(), [[], [], []])
+
+    @mock.patch('expense.service.IMPORT_BATCH_SIZE', 2)
+    def test_batches_import_all_or_nothing(self):
+        """Test that full and partial batches all land, and a bad row in a later batch imports nothing"""
+        rows = ''.join(f'Food,1,2025-04-{day:02d}\n' for day in range(1, 6))
+        complete = self.post('category,amount,date\n' + rows, 'text/csv')
+
+        failed = self.post('category,amount,date\n' + rows[:54] + 'Food,x,2025-04-06\n', 'text/csv')
+        expenses, totals, savings = self.stored()
+
+        self.assertEqual(complete.get_json()['imported'], 5)
+        self.assertEqual(failed.status_code, HTTPStatus.BAD_REQUEST)
+        self.assertNotIn('imported', failed.get_json())
+        self.assertTrue(failed.get_json()['message'].startswith('Line 5:'))
+        self.assertEqual(len(expenses), 5)
+        self.assertEqual(totals, [(2025, 4, self.food, 500, 5)])
+        self.assertEqual(savings, [(2025, 4, -500)])
 
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
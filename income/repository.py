@@ -100,13 +100,14 @@ class IncomeRepository:
         return rows_affected > 0
     
     def calculate_income_totals(self, incomes):
-        total_expected = 0.0
-        total_received = 0.0
+        # Amounts are integer cents, so the totals are exact
+        total_expected = 0
+        total_received = 0
         
         for income in incomes:
-            total_expected += float(income['expected_amount'])
+            total_expected += income['expected_amount']
             
             if income['is_received'] and income['actual_amount']:
-                total_received += float(income['actual_amount'])
+                total_received += income['actual_amount']
         
         return total_expected, total_received
\ No newline at end of file
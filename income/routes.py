@@ -1,5 +1,6 @@
 from flask import request, jsonify, g
 from utils.auth import login_required
+from utils.etag import conditional_get
 from income.service import IncomeService
 from income import income_bp
 from datetime import date
@@ -8,6 +9,7 @@ income_service = IncomeService()
 
 @income_bp.route('', methods=['GET'])
 @login_required
+@conditional_get
 def get_incomes():
     user_id = g.user['user_id']
     
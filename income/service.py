@@ -1,9 +1,13 @@
 from income.repository import IncomeRepository
+from savings.service import SavingsService
+from utils.money import to_cents, from_cents
+from utils.db import transaction
 from datetime import datetime
 
 class IncomeService:
     def __init__(self):
         self.repository = IncomeRepository()
+        self.savings = SavingsService()
     
     def get_incomes(self, user_id, month=None, year=None):
         incomes = self.repository.get_incomes(user_id, month, year)
@@ -20,12 +24,14 @@ class IncomeService:
             if processed_income['receive_date'] and isinstance(processed_income['receive_date'], str):
                 processed_income['receive_date'] = datetime.strptime(processed_income['receive_date'], '%Y-%m-%d').date()
             
+            processed_income['expected_amount'] = from_cents(processed_income['expected_amount'])
+            processed_income['actual_amount'] = from_cents(processed_income['actual_amount'])
             processed_incomes.append(processed_income)
         
         # Calculate totals
         total_expected, total_received = self.repository.calculate_income_totals(incomes)
         
-        return processed_incomes, total_expected, total_received
+        return processed_incomes, from_cents(total_expected), from_cents(total_received)
     
     def get_income_by_id(self, user_id, income_id):
         income = self.repository.get_income_by_id(user_id, income_id)
@@ -40,95 +46,117 @@ class IncomeService:
         if income['receive_date'] and isinstance(income['receive_date'], str):
             income['receive_date'] = datetime.strptime(income['receive_date'], '%Y-%m-%d').date()
         
+        income['expected_amount'] = from_cents(income['expected_amount'])
+        income['actual_amount'] = from_cents(income['actual_amount'])
+        
         return income
     
     def create_income(self, user_id, create_request):
-        income_id = self.repository.create_income(
-            user_id=user_id,
-            source_name=create_request.source_name,
-            expected_amount=create_request.expected_amount,
-            month=create_request.month,
-            year=create_request.year,
-            due_date=create_request.due_date,
-            description=create_request.description
-        )
+        with transaction():
+            expected_amount = to_cents(create_request.expected_amount)
+            income_id = self.repository.create_income(
+                user_id=user_id,
+                source_name=create_request.source_name,
+                expected_amount=expected_amount,
+                month=create_request.month,
+                year=create_request.year,
+                due_date=create_request.due_date,
+                description=create_request.description
+            )
+            
+            # New income counts towards its month's expected income
+            self.apply_savings_change(user_id, None, {
+                'month': create_request.month,
+                'year': create_request.year,
+                'expected_amount': expected_amount,
+                'actual_amount': 0,
+                'is_received': False
+            })
         
         return self.get_income_by_id(user_id, income_id)
     
     def update_income(self, user_id, income_id, update_request):
-        income = self.repository.get_income_by_id(user_id, income_id)
-        
-        if not income:
-            return None
-        
-        success = self.repository.update_income(
-            user_id=user_id,
-            income_id=income_id,
-            source_name=update_request.source_name,
-            expected_amount=update_request.expected_amount,
-            actual_amount=update_request.actual_amount,
-            is_received=update_request.is_received,
-            due_date=update_request.due_date,
-            receive_date=update_request.receive_date,
-            month=update_request.month,
-            year=update_request.year,
-            description=update_request.description
-        )
-        
-        if not success:
-            return None
-        
-        # If income was updated and affects savings, update savings
-        if update_request.is_received is not None or update_request.actual_amount is not None:
-            self.update_savings(user_id, income['month'], income['year'])
-        
-        # If month or year was changed, update savings for both old and new periods
-        if (update_request.month is not None and update_request.month != income['month']) or \
-           (update_request.year is not None and update_request.year != income['year']):
-            self.update_savings(user_id, income['month'], income['year'])
-            self.update_savings(user_id, update_request.month or income['month'], 
-                               update_request.year or income['year'])
+        with transaction():
+            income = self.repository.get_income_by_id(user_id, income_id)
+            
+            if not income:
+                return None
+            
+            success = self.repository.update_income(
+                user_id=user_id,
+                income_id=income_id,
+                source_name=update_request.source_name,
+                expected_amount=to_cents(update_request.expected_amount),
+                actual_amount=to_cents(update_request.actual_amount),
+                is_received=update_request.is_received,
+                due_date=update_request.due_date,
+                receive_date=update_request.receive_date,
+                month=update_request.month,
+                year=update_request.year,
+                description=update_request.description
+            )
+            
+            if not success:
+                return None
+            
+            # Move the income's old contribution out of savings and the new one in
+            self.apply_savings_change(user_id, income, self.repository.get_income_by_id(user_id, income_id))
         
         return self.get_income_by_id(user_id, income_id)
     
     def delete_income(self, user_id, income_id):
-        income = self.repository.get_income_by_id(user_id, income_id)
-        
-        if not income:
-            return False
-        
-        month, year = income['month'], income['year']
-        
-        success = self.repository.delete_income(user_id, income_id)
-        
-        if success:
-            # Update savings after deleting income
-            self.update_savings(user_id, month, year)
+        with transaction():
+            income = self.repository.get_income_by_id(user_id, income_id)
+            
+            if not income:
+                return False
+            
+            success = self.repository.delete_income(user_id, income_id)
+            
+            if success:
+                # Take the income's contribution out of savings
+                self.apply_savings_change(user_id, income, None)
         
         return success
     
     def receive_income(self, user_id, income_id, receive_request):
-        income = self.repository.get_income_by_id(user_id, income_id)
-        
-        if not income:
-            return None
-        
-        success = self.repository.receive_income(
-            user_id=user_id,
-            income_id=income_id,
-            actual_amount=receive_request.actual_amount,
-            receive_date=receive_request.receive_date
-        )
-        
-        if not success:
-            return None
-        
-        # Update savings after receiving income
-        self.update_savings(user_id, income['month'], income['year'])
+        with transaction():
+            income = self.repository.get_income_by_id(user_id, income_id)
+            
+            if not income:
+                return None
+            
+            success = self.repository.receive_income(
+                user_id=user_id,
+                income_id=income_id,
+                actual_amount=to_cents(receive_request.actual_amount),
+                receive_date=receive_request.receive_date
+            )
+            
+            if not success:
+                return None
+            
+            # Update savings after receiving income
+            self.apply_savings_change(user_id, income, self.repository.get_income_by_id(user_id, income_id))
         
         return self.get_income_by_id(user_id, income_id)
     
-    def update_savings(self, user_id, month, year):
-        # Import locally to avoid circular imports
-        from budget.routes import update_savings
-        return update_savings(user_id, month, year)
\ No newline at end of file
+    def savings_contribution(self, income):
+        # What one income adds to its month's savings inputs, in cents
+        actual_amount = (income['actual_amount'] or 0) if income['is_received'] else 0
+        return (income['month'], income['year']), income['expected_amount'] or 0, actual_amount
+    
+    def apply_savings_change(self, user_id, before, after):
+        # Signed savings deltas between two states of an income (None when
+        # it doesn't exist), grouped per month
+        deltas = {}
+        
+        for income, sign in ((before, -1), (after, 1)):
+            if income is None:
+                continue
+            period, expected_amount, actual_amount = self.savings_contribution(income)
+            expected_delta, actual_delta = deltas.get(period, (0, 0))
+            deltas[period] = (expected_delta + sign * expected_amount, actual_delta + sign * actual_amount)
+        
+        for (month, year), (expected_delta, actual_delta) in deltas.items():
+            self.savings.apply_savings_delta(user_id, month, year, expected_delta=expected_delta, actual_delta=actual_delta)
\ No newline at end of file
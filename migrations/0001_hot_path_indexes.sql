@@ -0,0 +1,20 @@
+-- Composite covering indexes for the per-user, per-period query shapes in
+-- DashboardRepository, ExpenseRepository and BudgetRepository.
+
+-- Monthly totals, per-category GROUP BY and date-range listings:
+-- WHERE user_id = ? AND date BETWEEN ? AND ? [GROUP BY category_id]
+CREATE INDEX IF NOT EXISTS idx_expenses_user_date
+    ON expenses (user_id, date, category_id, amount);
+
+-- Per-budget spend and category-filtered listings:
+-- WHERE user_id = ? AND category_id = ? AND date BETWEEN ? AND ?
+CREATE INDEX IF NOT EXISTS idx_expenses_user_category_date
+    ON expenses (user_id, category_id, date, amount);
+
+-- Income summaries: WHERE user_id = ? AND month = ? AND year = ?
+CREATE INDEX IF NOT EXISTS idx_income_user_period
+    ON income_sources (user_id, year, month, is_received, expected_amount, actual_amount);
+
+-- Budget listings and summaries: WHERE user_id = ? AND month = ? AND year = ?
+CREATE INDEX IF NOT EXISTS idx_budget_user_period
+    ON budget_allocations (user_id, year, month, category_id, amount);
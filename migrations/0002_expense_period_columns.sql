@@ -0,0 +1,13 @@
+-- Generated year/month columns on expenses so period filters that can't be
+-- expressed as a date range ("every March") are still served from an index.
+-- The index is ordered by date to match the listing ORDER BY.
+-- Dates are stored as ISO 'YYYY-MM-DD' text.
+
+ALTER TABLE expenses ADD COLUMN year INTEGER
+    GENERATED ALWAYS AS (CAST(substr(date, 1, 4) AS INTEGER)) VIRTUAL;
+
+ALTER TABLE expenses ADD COLUMN month INTEGER
+    GENERATED ALWAYS AS (CAST(substr(date, 6, 2) AS INTEGER)) VIRTUAL;
+
+CREATE INDEX IF NOT EXISTS idx_expenses_user_month_date
+    ON expenses (user_id, month, date);
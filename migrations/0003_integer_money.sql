@@ -0,0 +1,113 @@
+-- Store every money column as INTEGER minor units (cents). SQLite kept the
+-- DECIMAL(10, 2) columns as REAL, so sums drifted; integer cents sum exactly.
+-- SQLite can't change a column type in place, so each table is rebuilt and
+-- its indexes recreated. Existing values are rounded to the nearest cent.
+
+CREATE TABLE expenses_new (
+    expense_id INTEGER PRIMARY KEY,
+    user_id INTEGER NOT NULL,
+    category_id INTEGER NOT NULL,
+    amount INTEGER NOT NULL,
+    date DATE NOT NULL,
+    description TEXT,
+    created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+    updated_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+    year INTEGER GENERATED ALWAYS AS (CAST(substr(date, 1, 4) AS INTEGER)) VIRTUAL,
+    month INTEGER GENERATED ALWAYS AS (CAST(substr(date, 6, 2) AS INTEGER)) VIRTUAL,
+    FOREIGN KEY (user_id) REFERENCES users(user_id) ON DELETE CASCADE,
+    FOREIGN KEY (category_id) REFERENCES categories(category_id) ON DELETE CASCADE
+);
+
+INSERT INTO expenses_new (expense_id, user_id, category_id, amount, date, description, created_at, updated_at)
+SELECT expense_id, user_id, category_id, CAST(ROUND(amount * 100) AS INTEGER), date, description, created_at, updated_at
+FROM expenses;
+
+DROP TABLE expenses;
+ALTER TABLE expenses_new RENAME TO expenses;
+
+CREATE INDEX idx_expenses_user_date
+    ON expenses (user_id, date, category_id, amount);
+CREATE INDEX idx_expenses_user_category_date
+    ON expenses (user_id, category_id, date, amount);
+CREATE INDEX idx_expenses_user_month_date
+    ON expenses (user_id, month, date);
+
+
+CREATE TABLE income_sources_new (
+    income_id INTEGER PRIMARY KEY,
+    user_id INTEGER NOT NULL,
+    source_name VARCHAR(100) NOT NULL,
+    expected_amount INTEGER NOT NULL,
+    actual_amount INTEGER,
+    is_received BOOLEAN DEFAULT 0,
+    due_date DATE,
+    receive_date DATE,
+    month INTEGER NOT NULL,
+    year INTEGER NOT NULL,
+    description TEXT,
+    created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+    updated_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+    FOREIGN KEY (user_id) REFERENCES users(user_id) ON DELETE CASCADE
+);
+
+INSERT INTO income_sources_new (
+    income_id, user_id, source_name, expected_amount, actual_amount, is_received,
+    due_date, receive_date, month, year, description, created_at, updated_at
+)
+SELECT
+    income_id, user_id, source_name,
+    CAST(ROUND(expected_amount * 100) AS INTEGER),
+    CAST(ROUND(actual_amount * 100) AS INTEGER),
+    is_received, due_date, receive_date, month, year, description, created_at, updated_at
+FROM income_sources;
+
+DROP TABLE income_sources;
+ALTER TABLE income_sources_new RENAME TO income_sources;
+
+CREATE INDEX idx_income_user_period
+    ON income_sources (user_id, year, month, is_received, expected_amount, actual_amount);
+
+
+CREATE TABLE budget_allocations_new (
+    budget_id INTEGER PRIMARY KEY,
+    user_id INTEGER NOT NULL,
+    category_id INTEGER NOT NULL,
+    amount INTEGER NOT NULL,
+    month INTEGER NOT NULL,
+    year INTEGER NOT NULL,
+    created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+    updated_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+    FOREIGN KEY (user_id) REFERENCES users(user_id) ON DELETE CASCADE,
+    FOREIGN KEY (category_id) REFERENCES categories(category_id) ON DELETE CASCADE,
+    UNIQUE (user_id, category_id, month, year)
+);
+
+INSERT INTO budget_allocations_new (budget_id, user_id, category_id, amount, month, year, created_at, updated_at)
+SELECT budget_id, user_id, category_id, CAST(ROUND(amount * 100) AS INTEGER), month, year, created_at, updated_at
+FROM budget_allocations;
+
+DROP TABLE budget_allocations;
+ALTER TABLE budget_allocations_new RENAME TO budget_allocations;
+
+CREATE INDEX idx_budget_user_period
+    ON budget_allocations (user_id, year, month, category_id, amount);
+
+
+CREATE TABLE savings_new (
+    savings_id INTEGER PRIMARY KEY,
+    user_id INTEGER NOT NULL,
+    amount INTEGER NOT NULL,
+    month INTEGER NOT NULL,
+    year INTEGER NOT NULL,
+    created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+    updated_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+    FOREIGN KEY (user_id) REFERENCES users(user_id) ON DELETE CASCADE,
+    UNIQUE (user_id, month, year)
+);
+
+INSERT INTO savings_new (savings_id, user_id, amount, month, year, created_at, updated_at)
+SELECT savings_id, user_id, CAST(ROUND(amount * 100) AS INTEGER), month, year, created_at, updated_at
+FROM savings;
+
+DROP TABLE savings;
+ALTER TABLE savings_new RENAME TO savings;
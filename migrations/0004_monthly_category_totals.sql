@@ -0,0 +1,19 @@
+-- Per-user, per-month, per-category expense totals. Kept up to date by
+-- ExpenseService on every expense write, so monthly summaries read a row
+-- per category instead of summing every expense. `flask rebuild-category-totals`
+-- recomputes it from expenses if it ever drifts.
+
+CREATE TABLE monthly_category_totals (
+    user_id INTEGER NOT NULL,
+    year INTEGER NOT NULL,
+    month INTEGER NOT NULL,
+    category_id INTEGER NOT NULL,
+    total INTEGER NOT NULL DEFAULT 0,
+    expense_count INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (user_id, year, month, category_id)
+) WITHOUT ROWID;
+
+INSERT INTO monthly_category_totals (user_id, year, month, category_id, total, expense_count)
+SELECT user_id, year, month, category_id, SUM(amount), COUNT(*)
+FROM expenses
+GROUP BY user_id, year, month, category_id;
@@ -0,0 +1,83 @@
+-- Per-user data version, bumped by triggers on every write to data the
+-- dashboard is built from. Cached responses are keyed by it, so any write
+-- invalidates that user's entries without tracking which keys it touched.
+
+ALTER TABLE users ADD COLUMN data_version INTEGER NOT NULL DEFAULT 0;
+
+CREATE TRIGGER expenses_insert_data_version AFTER INSERT ON expenses
+BEGIN
+    UPDATE users SET data_version = data_version + 1 WHERE user_id = NEW.user_id;
+END;
+
+CREATE TRIGGER expenses_update_data_version AFTER UPDATE ON expenses
+BEGIN
+    UPDATE users SET data_version = data_version + 1 WHERE user_id = NEW.user_id;
+END;
+
+CREATE TRIGGER expenses_delete_data_version AFTER DELETE ON expenses
+BEGIN
+    UPDATE users SET data_version = data_version + 1 WHERE user_id = OLD.user_id;
+END;
+
+CREATE TRIGGER income_sources_insert_data_version AFTER INSERT ON income_sources
+BEGIN
+    UPDATE users SET data_version = data_version + 1 WHERE user_id = NEW.user_id;
+END;
+
+CREATE TRIGGER income_sources_update_data_version AFTER UPDATE ON income_sources
+BEGIN
+    UPDATE users SET data_version = data_version + 1 WHERE user_id = NEW.user_id;
+END;
+
+CREATE TRIGGER income_sources_delete_data_version AFTER DELETE ON income_sources
+BEGIN
+    UPDATE users SET data_version = data_version + 1 WHERE user_id = OLD.user_id;
+END;
+
+CREATE TRIGGER budget_allocations_insert_data_version AFTER INSERT ON budget_allocations
+BEGIN
+    UPDATE users SET data_version = data_version + 1 WHERE user_id = NEW.user_id;
+END;
+
+CREATE TRIGGER budget_allocations_update_data_version AFTER UPDATE ON budget_allocations
+BEGIN
+    UPDATE users SET data_version = data_version + 1 WHERE user_id = NEW.user_id;
+END;
+
+CREATE TRIGGER budget_allocations_delete_data_version AFTER DELETE ON budget_allocations
+BEGIN
+    UPDATE users SET data_version = data_version + 1 WHERE user_id = OLD.user_id;
+END;
+
+CREATE TRIGGER categories_insert_data_version AFTER INSERT ON categories
+BEGIN
+    UPDATE users SET data_version = data_version + 1 WHERE user_id = NEW.user_id;
+END;
+
+CREATE TRIGGER categories_update_data_version AFTER UPDATE ON categories
+BEGIN
+    UPDATE users SET data_version = data_version + 1 WHERE user_id = NEW.user_id;
+END;
+
+CREATE TRIGGER categories_delete_data_version AFTER DELETE ON categories
+BEGIN
+    UPDATE users SET data_version = data_version + 1 WHERE user_id = OLD.user_id;
+END;
+
+-- Savings are rewritten whenever they're recomputed; only a changed amount
+-- is a change to the data
+CREATE TRIGGER savings_insert_data_version AFTER INSERT ON savings
+BEGIN
+    UPDATE users SET data_version = data_version + 1 WHERE user_id = NEW.user_id;
+END;
+
+CREATE TRIGGER savings_update_data_version AFTER UPDATE ON savings
+WHEN OLD.amount IS NOT NEW.amount
+BEGIN
+    UPDATE users SET data_version = data_version + 1 WHERE user_id = NEW.user_id;
+END;
+
+CREATE TRIGGER savings_delete_data_version AFTER DELETE ON savings
+BEGIN
+    UPDATE users SET data_version = data_version + 1 WHERE user_id = OLD.user_id;
+END;
\ No newline at end of file
@@ -0,0 +1,30 @@
+-- Keep the inputs of each month's savings on the savings row so writes can
+-- apply signed deltas instead of re-aggregating the month:
+--   amount = (actual_income if > 0 else expected_income) - total_expenses
+-- Every month with income or expenses gets a row, backfilled from the data.
+
+ALTER TABLE savings ADD COLUMN expected_income INTEGER NOT NULL DEFAULT 0;
+ALTER TABLE savings ADD COLUMN actual_income INTEGER NOT NULL DEFAULT 0;
+ALTER TABLE savings ADD COLUMN total_expenses INTEGER NOT NULL DEFAULT 0;
+
+INSERT OR IGNORE INTO savings (user_id, month, year, amount)
+SELECT user_id, month, year, 0 FROM income_sources
+UNION
+SELECT user_id, month, year, 0 FROM monthly_category_totals;
+
+UPDATE savings SET
+    expected_income = COALESCE((
+        SELECT SUM(i.expected_amount) FROM income_sources i
+        WHERE i.user_id = savings.user_id AND i.year = savings.year AND i.month = savings.month
+    ), 0),
+    actual_income = COALESCE((
+        SELECT SUM(CASE WHEN i.is_received = 1 THEN i.actual_amount ELSE 0 END) FROM income_sources i
+        WHERE i.user_id = savings.user_id AND i.year = savings.year AND i.month = savings.month
+    ), 0),
+    total_expenses = COALESCE((
+        SELECT SUM(t.total) FROM monthly_category_totals t
+        WHERE t.user_id = savings.user_id AND t.year = savings.year AND t.month = savings.month
+    ), 0);
+
+UPDATE savings SET
+    amount = CASE WHEN actual_income > 0 THEN actual_income ELSE expected_income END - total_expenses;
@@ -0,0 +1,22 @@
+-- Budget threshold alerts. A budget alerts once per threshold (percent of
+-- its amount) when the month's spend in its category reaches it.
+-- alert_thresholds is a JSON array overriding the app's default thresholds
+-- for one budget, NULL to use the default.
+
+ALTER TABLE budget_allocations ADD COLUMN alert_thresholds TEXT;
+
+CREATE TABLE budget_alerts (
+    alert_id INTEGER PRIMARY KEY,
+    user_id INTEGER NOT NULL,
+    budget_id INTEGER NOT NULL,
+    threshold INTEGER NOT NULL,
+    spent_amount INTEGER NOT NULL,
+    budget_amount INTEGER NOT NULL,
+    created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+    FOREIGN KEY (user_id) REFERENCES users(user_id) ON DELETE CASCADE,
+    FOREIGN KEY (budget_id) REFERENCES budget_allocations(budget_id) ON DELETE CASCADE,
+    UNIQUE (budget_id, threshold)
+);
+
+-- Clients poll for alerts newer than the last alert_id they saw
+CREATE INDEX idx_budget_alerts_user ON budget_alerts (user_id, alert_id);
@@ -0,0 +1,8 @@
+-- Alerts are against a budget's current amount: changing the amount clears
+-- the budget's alerts so each threshold can fire again for the new amount.
+
+CREATE TRIGGER budget_allocations_amount_clears_alerts AFTER UPDATE OF amount ON budget_allocations
+WHEN NEW.amount IS NOT OLD.amount
+BEGIN
+    DELETE FROM budget_alerts WHERE budget_id = NEW.budget_id;
+END;
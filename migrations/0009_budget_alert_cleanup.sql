@@ -0,0 +1,11 @@
+-- foreign_keys is off, so ON DELETE CASCADE on budget_alerts never fires and
+-- SQLite can hand a deleted budget_id to the next budget. Drop a budget's
+-- alerts with it; other budget_alerts rows without a budget go too.
+
+DELETE FROM budget_alerts
+WHERE budget_id NOT IN (SELECT budget_id FROM budget_allocations);
+
+CREATE TRIGGER budget_allocations_delete_alerts AFTER DELETE ON budget_allocations
+BEGIN
+    DELETE FROM budget_alerts WHERE budget_id = OLD.budget_id;
+END;
@@ -0,0 +1,10 @@
+from flask import Blueprint
+
+# Savings have no routes of their own; the blueprint carries the
+# `flask recompute-savings` command
+savings_bp = Blueprint('savings', __name__, cli_group=None)
+
+from savings.commands import *
+
+def get_blueprint():
+    return savings_bp
@@ -0,0 +1,64 @@
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+import click
+from flask import Flask, current_app
+from savings import savings_bp
+from savings.repository import SavingsRepository
+from utils.db import init_app, transaction
+
+# Config a shard worker needs to open the same database the same way
+WORKER_CONFIG = ('DATABASE', 'DATABASE_POOL_TIMEOUT', 'SQLITE_PROFILE', 'SQLITE_PROFILES')
+
+def compute_shard(config, first_user_id, last_user_id):
+    # Runs in a worker process: recompute one user_id range, read-only, and
+    # hand the rows back for the parent to write
+    app = Flask(__name__)
+    app.config.update(config)
+    app.config['DATABASE_WRITER_POOL_SIZE'] = 1
+    init_app(app)
+    
+    with app.app_context():
+        rows = SavingsRepository().compute_savings(first_user_id, last_user_id)
+        return first_user_id, last_user_id, [tuple(row) for row in rows]
+
+@savings_bp.cli.command('recompute-savings')
+@click.option('--user-id', type=int, default=None, help='Only recompute this user\'s savings.')
+@click.option('--workers', type=int, default=os.cpu_count() or 1, show_default=True,
+              help='Processes to spread user_id ranges across.')
+def recompute_savings_command(user_id, workers):
+    # Rebuild the savings table from income and the expense rollup (rebuild
+    # that first with `flask rebuild-category-totals` if expenses were edited
+    # directly). Users are split into contiguous user_id ranges computed in
+    # parallel; SQLite takes one writer, so each range's rows are written
+    # here as it comes back.
+    repository = SavingsRepository()
+    start = time.perf_counter()
+    recomputed = changed = 0
+    
+    if user_id is not None:
+        shards = [(user_id, user_id)]
+    else:
+        shards = repository.get_user_ranges(max(workers, 1))
+    
+    if len(shards) <= 1:
+        for first_user_id, last_user_id in shards:
+            with transaction():
+                rows = repository.compute_savings(first_user_id, last_user_id)
+                recomputed += len(rows)
+                changed += repository.write_savings(rows, first_user_id, last_user_id)
+    else:
+        config = {name: current_app.config.get(name) for name in WORKER_CONFIG}
+        
+        with ProcessPoolExecutor(max_workers=len(shards)) as pool:
+            for first_user_id, last_user_id, rows in pool.map(compute_shard, [config] * len(shards), *zip(*shards)):
+                with transaction():
+                    recomputed += len(rows)
+                    changed += repository.write_savings(rows, first_user_id, last_user_id)
+    
+    elapsed = time.perf_counter() - start
+    rate = recomputed / elapsed if elapsed > 0 else 0
+    click.echo(
+        f'Recomputed {recomputed} savings rows ({changed} changed) in {elapsed:.2f}s, '
+        f'{rate:,.0f} rows/s with {max(len(shards), 1)} worker(s).'
+    )
@@ -0,0 +1,21 @@
+from functools import partial
+from utils.db import transaction
+from utils.workqueue import CoalescingQueue, get_queue
+
+# With SAVINGS_MODE = 'queue', writes mark (user_id, month, year) dirty after
+# they commit and a background thread recomputes each dirty month once
+
+def recompute_savings(app, key):
+    # Import locally to avoid circular imports
+    from savings.service import SavingsService
+    
+    user_id, month, year = key
+    with app.app_context():
+        with transaction():
+            SavingsService().update_savings(user_id, month, year)
+
+def create_savings_queue(app):
+    return CoalescingQueue(partial(recompute_savings, app), name='savings-recompute', logger=app.logger)
+
+def get_savings_queue(app=None):
+    return get_queue('savings', create_savings_queue, app)
@@ -0,0 +1,167 @@
+from utils.db import query_db, update_db, executemany_db
+
+# A month's savings: received income (expected income until something is
+# received) minus the month's expenses
+SAVINGS_AMOUNT = 'CASE WHEN actual_income > 0 THEN actual_income ELSE expected_income END - total_expenses'
+
+class SavingsRepository:
+    def get_income_summary(self, user_id, month, year):
+        income = query_db('''
+            SELECT 
+                SUM(expected_amount) as expected_income,
+                SUM(CASE WHEN is_received = 1 THEN actual_amount ELSE 0 END) as actual_income
+            FROM income_sources
+            WHERE user_id = ? AND month = ? AND year = ?
+        ''', (user_id, month, year), one=True)
+        
+        expected_income = income['expected_income'] or 0
+        actual_income = income['actual_income'] or 0
+        
+        return expected_income, actual_income
+    
+    def get_expenses_summary(self, user_id, month, year):
+        expenses = query_db('''
+            SELECT SUM(total) as total_expenses
+            FROM monthly_category_totals
+            WHERE user_id = ? AND year = ? AND month = ?
+        ''', (user_id, year, month), one=True)
+        
+        return expenses['total_expenses'] or 0
+    
+    def get_existing_savings(self, user_id, month, year):
+        savings = query_db('''
+            SELECT * FROM savings
+            WHERE user_id = ? AND month = ? AND year = ?
+        ''', (user_id, month, year), one=True)
+        
+        return dict(savings) if savings else None
+    
+    def apply_savings_delta(self, user_id, month, year, expected_delta=0, actual_delta=0, expenses_delta=0):
+        # Add signed deltas to the month's savings components and re-derive
+        # amount in the same statement. SET expressions see the old row.
+        update_db('''
+            INSERT INTO savings (user_id, month, year, expected_income, actual_income, total_expenses, amount)
+            VALUES (:user_id, :month, :year, :expected, :actual, :expenses,
+                CASE WHEN :actual > 0 THEN :actual ELSE :expected END - :expenses)
+            ON CONFLICT (user_id, month, year) DO UPDATE SET
+                expected_income = expected_income + excluded.expected_income,
+                actual_income = actual_income + excluded.actual_income,
+                total_expenses = total_expenses + excluded.total_expenses,
+                amount = CASE
+                    WHEN actual_income + excluded.actual_income > 0 THEN actual_income + excluded.actual_income
+                    ELSE expected_income + excluded.expected_income
+                END - (total_expenses + excluded.total_expenses),
+                updated_at = CURRENT_TIMESTAMP
+        ''', {
+            'user_id': user_id,
+            'month': month,
+            'year': year,
+            'expected': expected_delta,
+            'actual': actual_delta,
+            'expenses': expenses_delta
+        })
+    
+    def set_savings(self, user_id, month, year, expected_income, actual_income, total_expenses):
+        # Overwrite the month's savings components (full recompute)
+        amount = (actual_income if actual_income > 0 else expected_income) - total_expenses
+        update_db('''
+            INSERT INTO savings (user_id, month, year, expected_income, actual_income, total_expenses, amount)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT (user_id, month, year) DO UPDATE SET
+                expected_income = excluded.expected_income,
+                actual_income = excluded.actual_income,
+                total_expenses = excluded.total_expenses,
+                amount = excluded.amount,
+                updated_at = CURRENT_TIMESTAMP
+        ''', (user_id, month, year, expected_income, actual_income, total_expenses, amount))
+        
+        return amount
+    
+    def compute_savings(self, first_user_id, last_user_id):
+        # Every (user, month, year) with income or expenses, recomputed in one
+        # set-based statement over a contiguous user_id range, which the
+        # (user_id, ...) indexes can seek to. Read-only, so ranges can run in
+        # parallel.
+        user_filter = 'user_id BETWEEN :first_user_id AND :last_user_id'
+        
+        return query_db(f'''
+            WITH income AS (
+                SELECT
+                    user_id, year, month,
+                    SUM(expected_amount) AS expected_income,
+                    SUM(CASE WHEN is_received = 1 THEN actual_amount ELSE 0 END) AS actual_income
+                FROM income_sources
+                WHERE {user_filter}
+                GROUP BY user_id, year, month
+            ),
+            spent AS (
+                SELECT user_id, year, month, SUM(total) AS total_expenses
+                FROM monthly_category_totals
+                WHERE {user_filter}
+                GROUP BY user_id, year, month
+            ),
+            periods AS (
+                SELECT user_id, year, month FROM income
+                UNION
+                SELECT user_id, year, month FROM spent
+            ),
+            components AS (
+                SELECT
+                    p.user_id, p.month, p.year,
+                    COALESCE(i.expected_income, 0) AS expected_income,
+                    COALESCE(i.actual_income, 0) AS actual_income,
+                    COALESCE(s.total_expenses, 0) AS total_expenses
+                FROM periods p
+                LEFT JOIN income i ON i.user_id = p.user_id AND i.year = p.year AND i.month = p.month
+                LEFT JOIN spent s ON s.user_id = p.user_id AND s.year = p.year AND s.month = p.month
+            )
+            SELECT user_id, month, year, expected_income, actual_income, total_expenses,
+                {SAVINGS_AMOUNT} AS amount
+            FROM components
+        ''', {'first_user_id': first_user_id, 'last_user_id': last_user_id})
+    
+    def write_savings(self, rows, first_user_id, last_user_id):
+        # Upsert recomputed rows, then zero the covered users' months that no
+        # longer have any income or expenses. Unchanged rows keep their
+        # amount, so data_version only moves for users whose savings changed.
+        written = executemany_db('''
+            INSERT INTO savings (user_id, month, year, expected_income, actual_income, total_expenses, amount)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT (user_id, month, year) DO UPDATE SET
+                expected_income = excluded.expected_income,
+                actual_income = excluded.actual_income,
+                total_expenses = excluded.total_expenses,
+                amount = excluded.amount,
+                updated_at = CURRENT_TIMESTAMP
+            WHERE (expected_income, actual_income, total_expenses, amount)
+                IS NOT (excluded.expected_income, excluded.actual_income, excluded.total_expenses, excluded.amount)
+        ''', [tuple(row) for row in rows])
+        
+        written += update_db('''
+            UPDATE savings SET expected_income = 0, actual_income = 0, total_expenses = 0, amount = 0,
+                updated_at = CURRENT_TIMESTAMP
+            WHERE user_id BETWEEN :first_user_id AND :last_user_id
+                AND (expected_income, actual_income, total_expenses, amount) IS NOT (0, 0, 0, 0)
+                AND NOT EXISTS (
+                    SELECT 1 FROM income_sources i
+                    WHERE i.user_id = savings.user_id AND i.year = savings.year AND i.month = savings.month
+                )
+                AND NOT EXISTS (
+                    SELECT 1 FROM monthly_category_totals t
+                    WHERE t.user_id = savings.user_id AND t.year = savings.year AND t.month = savings.month
+                )
+        ''', {'first_user_id': first_user_id, 'last_user_id': last_user_id})
+        
+        return written
+    
+    def get_user_ranges(self, shards):
+        # Split users into up to `shards` contiguous (first_user_id,
+        # last_user_id) ranges of about the same number of users
+        ranges = query_db('''
+            SELECT MIN(user_id) AS first_user_id, MAX(user_id) AS last_user_id
+            FROM (SELECT user_id, NTILE(?) OVER (ORDER BY user_id) AS shard FROM users)
+            GROUP BY shard
+            ORDER BY shard
+        ''', (shards,))
+        
+        return [(row['first_user_id'], row['last_user_id']) for row in ranges]
@@ -0,0 +1,46 @@
+from functools import partial
+from flask import current_app
+from savings.repository import SavingsRepository
+from savings.queue import get_savings_queue
+from utils.db import after_commit, in_transaction
+
+class SavingsService:
+    def __init__(self):
+        self.repository = SavingsRepository()
+    
+    def get_savings(self, user_id, month, year):
+        return self.repository.get_existing_savings(user_id, month, year)
+    
+    def update_savings(self, user_id, month, year):
+        # Full recompute of the month's savings from income and the expense
+        # rollup. Writes keep savings current with apply_savings_delta; this
+        # is the repair path (see also `flask recompute-savings`).
+        expected_income, actual_income = self.repository.get_income_summary(user_id, month, year)
+        total_expenses = self.repository.get_expenses_summary(user_id, month, year)
+        
+        return self.repository.set_savings(user_id, month, year, expected_income, actual_income, total_expenses)
+    
+    def apply_savings_delta(self, user_id, month, year, expected_delta=0, actual_delta=0, expenses_delta=0):
+        # Savings move by exactly what the write changed, O(1) per write
+        if not (expected_delta or actual_delta or expenses_delta):
+            return
+        
+        if current_app.config.get('SAVINGS_MODE', 'delta') == 'queue':
+            # Recompute the month in the background once the write commits;
+            # repeated writes to one month before then cost one recompute
+            after_commit(partial(get_savings_queue().mark, (user_id, month, year)))
+            return
+        
+        self.repository.apply_savings_delta(user_id, month, year, expected_delta, actual_delta, expenses_delta)
+    
+    def flush_savings(self, user_id, timeout=None):
+        # Read-your-writes for SAVINGS_MODE=queue: wait until the user's
+        # queued recomputes are done; returns False on timeout. The worker
+        # needs the writer, which is only held inside transaction(), so this
+        # can't run in one.
+        if current_app.config.get('SAVINGS_MODE', 'delta') != 'queue':
+            return True
+        if in_transaction():
+            raise RuntimeError("Cannot flush savings inside a transaction")
+        
+        return get_savings_queue().flush(lambda key: key[0] == user_id, timeout)
\ No newline at end of file
@@ -0,0 +1,156 @@
+import unittest
+from types import SimpleNamespace
+from utils.db import insert_db, executemany_db, update_db, query_db, transaction
+from utils.testing import DatabaseTestCase
+from expense.repository import ExpenseRepository
+from expense.service import ExpenseService
+from income.service import IncomeService
+from savings import get_blueprint
+from savings.service import SavingsService
+from savings.queue import get_savings_queue
+
+class TestSavingsService(DatabaseTestCase):
+    def setUp(self):
+        super().setUp()
+        self.app.register_blueprint(get_blueprint())
+        self.service = SavingsService()
+
+    def seed(self):
+        for name in ('Food', 'Rent'):
+            insert_db('INSERT INTO categories (user_id, name) VALUES (?, ?)', (self.user_id, name))
+        executemany_db(
+            'INSERT INTO expenses (user_id, category_id, amount, date) VALUES (?, ?, ?, ?)',
+            [(self.user_id, 1, 1250, f'2025-{month:02d}-15') for month in range(1, 13)]
+        )
+        ExpenseRepository().rebuild_category_totals(self.user_id)
+
+    def test_savings_deltas_match_full_recompute(self):
+        """Test that delta-maintained savings agree with a full recompute after every write"""
+        expenses, incomes = ExpenseService(), IncomeService()
+        expense = lambda **fields: SimpleNamespace(**{'category_id': None, 'amount': None, 'date': None, 'description': None, **fields})
+        income = lambda **fields: SimpleNamespace(**{
+            'source_name': None, 'expected_amount': None, 'actual_amount': None, 'is_received': None,
+            'due_date': None, 'receive_date': None, 'month': None, 'year': None, 'description': None, **fields
+        })
+
+        with self.app.app_context():
+            # Expenses were seeded behind the services' back, so start from a recompute
+            for month in (3, 4):
+                self.service.update_savings(self.user_id, month, 2025)
+
+            def assert_consistent():
+                for month in (3, 4):
+                    delta_amount = self.service.get_savings(self.user_id, month, 2025)['amount']
+                    self.assertEqual(delta_amount, self.service.update_savings(self.user_id, month, 2025))
+
+            salary = incomes.create_income(self.user_id, income(source_name='Salary', expected_amount=3000, month=3, year=2025))
+            assert_consistent()
+            incomes.receive_income(self.user_id, salary['income_id'], SimpleNamespace(actual_amount=2800, receive_date='2025-03-25'))
+            assert_consistent()
+            incomes.update_income(self.user_id, salary['income_id'], income(expected_amount=3100, month=4))
+            assert_consistent()
+
+            created = expenses.create_expense(self.user_id, expense(category_id=1, amount='45.10', date='2025-03-02'))
+            assert_consistent()
+            expenses.update_expense(self.user_id, created['expense_id'], expense(amount=60, date='2025-04-09'))
+            assert_consistent()
+            expenses.delete_expense(self.user_id, created['expense_id'])
+            incomes.delete_income(self.user_id, salary['income_id'])
+            assert_consistent()
+
+            march = self.service.get_savings(self.user_id, 3, 2025)
+
+        self.assertEqual(march['amount'], -1250)
+
+    def test_queued_savings_recompute_coalesces(self):
+        """Test that in queue mode a burst of writes to one month recomputes it once, after commit"""
+        self.app.config['SAVINGS_MODE'] = 'queue'
+        expenses = ExpenseService()
+        expense = lambda **fields: SimpleNamespace(**{'category_id': None, 'amount': None, 'date': None, 'description': None, **fields})
+
+        with self.app.app_context():
+            queue = get_savings_queue()
+            with transaction():
+                for amount in range(1, 11):
+                    expenses.create_expense(self.user_id, expense(category_id=2, amount=amount, date='2025-05-20'))
+                self.assertEqual(queue.stats()['marked'], 0)
+
+            self.assertTrue(self.service.flush_savings(self.user_id, timeout=5))
+            savings = self.service.get_savings(self.user_id, 5, 2025)
+        queue.stop(5)
+
+        # The worker may pick the month up between the first marks and the
+        # rest, so it runs once or twice, never once per write
+        stats = queue.stats()
+        self.assertEqual((stats['marked'], stats['depth']), (10, 0))
+        self.assertLessEqual(stats['processed'], 2)
+        self.assertEqual(savings['amount'], -(1250 + 5500))
+
+    def test_flush_makes_queued_savings_visible(self):
+        """Test that a read right after flush_savings sees the queued recompute, and that it refuses to run in a transaction"""
+        self.app.config['SAVINGS_MODE'] = 'queue'
+        expenses = ExpenseService()
+
+        with self.app.test_request_context('/', method='POST'):
+            queue = get_savings_queue()
+            expenses.create_expense(self.user_id, SimpleNamespace(category_id=2, amount=40, date='2025-06-01', description=None))
+            flushed = self.service.flush_savings(self.user_id, timeout=5)
+            savings = self.service.get_savings(self.user_id, 6, 2025)
+
+            with self.assertRaises(RuntimeError):
+                with transaction():
+                    self.service.flush_savings(self.user_id)
+        queue.stop(5)
+
+        self.assertTrue(flushed)
+        self.assertEqual(savings['amount'], -(1250 + 4000))
+
+    def test_recompute_command_rebuilds_every_month(self):
+        """Test that recompute-savings restores drifted rows and zeroes emptied months, across workers"""
+        with self.app.app_context():
+            for user in range(2, 6):
+                user_id = self.create_user(f'user{user}')
+                insert_db(
+                    'INSERT INTO income_sources (user_id, source_name, expected_amount, month, year) VALUES (?, ?, ?, ?, ?)',
+                    (user_id, 'Salary', 100000 * user, 1, 2025)
+                )
+            insert_db('INSERT INTO savings (user_id, amount, month, year) VALUES (?, ?, ?, ?)', (self.user_id, 999, 1, 2024))
+            update_db('UPDATE savings SET amount = 1 WHERE user_id = ?', (self.user_id,))
+
+        result = self.app.test_cli_runner().invoke(args=['recompute-savings', '--workers', '2'])
+
+        with self.app.app_context():
+            amounts = {
+                (row['user_id'], row['year'], row['month']): row['amount']
+                for row in query_db('SELECT user_id, year, month, amount FROM savings')
+            }
+
+        self.assertIn('Recomputed 16 savings rows', result.output)
+        self.assertIn('with 2 worker(s)', result.output)
+        self.assertIn('rows/s', result.output)
+        self.assertEqual(amounts[(self.user_id, 2025, 6)], -1250)
+        self.assertEqual(amounts[(self.user_id, 2024, 1)], 0)
+        self.assertEqual(amounts[(5, 2025, 1)], 500000)
+
+    def test_recompute_shards_are_user_id_ranges(self):
+        """Test that users split into contiguous, even ranges and one range leaves others alone"""
+        with self.app.app_context():
+            for user in range(2, 6):
+                self.create_user(f'user{user}')
+            ranges = [self.service.repository.get_user_ranges(shards) for shards in (1, 2, 3, 9)]
+            insert_db('INSERT INTO savings (user_id, amount, month, year) VALUES (?, ?, ?, ?)', (self.user_id, 1, 1, 2025))
+
+        result = self.app.test_cli_runner().invoke(args=['recompute-savings', '--user-id', '2'])
+
+        with self.app.app_context():
+            untouched = query_db('SELECT DISTINCT amount FROM savings WHERE user_id = ?', (self.user_id,))
+
+        self.assertEqual(ranges[0], [(1, 5)])
+        self.assertEqual(ranges[1], [(1, 3), (4, 5)])
+        self.assertEqual(ranges[2], [(1, 2), (3, 4), (5, 5)])
+        self.assertEqual(ranges[3], [(user, user) for user in range(1, 6)])
+        self.assertIn('Recomputed 0 savings rows', result.output)
+        self.assertEqual([row['amount'] for row in untouched], [1])
+
+if __name__ == '__main__':
+    unittest.main()
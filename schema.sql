@@ -1,3 +1,6 @@
+-- Baseline schema (version 0). Schema changes go in migrations/ as numbered
+-- files and are applied by `flask db-upgrade` (init-db runs them too).
+
 CREATE TABLE users (
     user_id INTEGER PRIMARY KEY,  
     username VARCHAR(50) UNIQUE NOT NULL,
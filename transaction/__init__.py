@@ -0,0 +1,8 @@
+from flask import Blueprint
+
+transaction_bp = Blueprint('transaction', __name__)
+
+from transaction.routes import *
+
+def get_blueprint():
+    return transaction_bp
\ No newline at end of file
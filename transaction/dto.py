@@ -0,0 +1,23 @@
+from dataclasses import dataclass
+from typing import Optional, List
+from datetime import date
+
+
+# Response DTOs
+@dataclass
+class TransactionResponse:
+    type: str  # expense or income
+    id: int
+    amount: float
+    transaction_date: Optional[date] = None
+    description: Optional[str] = None
+    category_id: Optional[int] = None  # For expenses
+    category_name: Optional[str] = None  # For expenses
+    source_name: Optional[str] = None  # For income
+
+
+@dataclass
+class TransactionListResponse:
+    status: str
+    transactions: List[TransactionResponse]
+    next_cursor: Optional[str] = None
\ No newline at end of file
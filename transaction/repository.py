@@ -0,0 +1,77 @@
+from utils.db import query_db
+from utils.dates import month_range
+
+class TransactionRepository:
+    def get_transactions(self, user_id, limit, before=None, month=None, year=None):
+        # Expenses and income as one feed, newest first, merged and cut in SQL.
+        # Each branch is limited on its own first, so only 2 * limit rows are
+        # ever sorted. Income without a date sorts as the first of its month.
+        #
+        # Order is (sort_date, type, id) descending; `before` is that key of
+        # the last row already seen (keyset pagination).
+        expense_filters = ''
+        income_filters = ''
+        args = {'user_id': user_id, 'limit': limit}
+        
+        if month and year:
+            expense_filters += ' AND e.date >= :start_date AND e.date < :end_date'
+            income_filters += ' AND i.year = :year AND i.month = :month'
+            args['start_date'], args['end_date'] = month_range(year, month)
+            args['year'], args['month'] = year, month
+        
+        if before:
+            expense_filters += (
+                " AND e.date <= :before_date"
+                " AND (e.date, 'expense', e.expense_id) < (:before_date, :before_type, :before_id)"
+            )
+            income_filters += (
+                " AND (sort_date, 'income', i.income_id) < (:before_date, :before_type, :before_id)"
+            )
+            args['before_date'], args['before_type'], args['before_id'] = before
+        
+        transactions_query = f'''
+            SELECT * FROM (
+                SELECT * FROM (
+                    SELECT
+                        'expense' AS type,
+                        e.expense_id AS id,
+                        e.amount,
+                        e.date AS transaction_date,
+                        e.date AS sort_date,
+                        e.description,
+                        c.category_id,
+                        c.name AS category_name,
+                        NULL AS source_name
+                    FROM expenses e
+                    JOIN categories c ON e.category_id = c.category_id
+                    WHERE e.user_id = :user_id{expense_filters}
+                    ORDER BY e.date DESC, e.expense_id DESC
+                    LIMIT :limit
+                )
+                UNION ALL
+                SELECT * FROM (
+                    SELECT
+                        'income' AS type,
+                        i.income_id AS id,
+                        CASE WHEN i.is_received = 1 THEN i.actual_amount ELSE i.expected_amount END AS amount,
+                        CASE WHEN i.is_received = 1 THEN i.receive_date ELSE i.due_date END AS transaction_date,
+                        COALESCE(
+                            CASE WHEN i.is_received = 1 THEN i.receive_date ELSE i.due_date END,
+                            printf('%04d-%02d-01', i.year, i.month)
+                        ) AS sort_date,
+                        i.description,
+                        NULL AS category_id,
+                        NULL AS category_name,
+                        i.source_name
+                    FROM income_sources i
+                    WHERE i.user_id = :user_id{income_filters}
+                    ORDER BY sort_date DESC, i.income_id DESC
+                    LIMIT :limit
+                )
+            )
+            ORDER BY sort_date DESC, type DESC, id DESC
+            LIMIT :limit
+        '''
+        
+        transactions = query_db(transactions_query, args)
+        return [dict(transaction) for transaction in transactions]
\ No newline at end of file
@@ -0,0 +1,41 @@
+from flask import request, jsonify, g
+from utils.auth import login_required
+from utils.etag import conditional_get
+from transaction.service import TransactionService
+from transaction import transaction_bp
+
+DEFAULT_PAGE_SIZE = 20
+MAX_PAGE_SIZE = 100
+
+transaction_service = TransactionService()
+
+@transaction_bp.route('', methods=['GET'])
+@login_required
+@conditional_get
+def get_transactions():
+    user_id = g.user['user_id']
+    
+    month = request.args.get('month', type=int)
+    year = request.args.get('year', type=int)
+    limit = request.args.get('limit', type=int, default=DEFAULT_PAGE_SIZE)
+    cursor = request.args.get('cursor')
+    
+    if not 1 <= limit <= MAX_PAGE_SIZE:
+        return jsonify({
+            'status': 'error',
+            'message': f'limit must be between 1 and {MAX_PAGE_SIZE}'
+        }), 400
+    
+    try:
+        transactions, next_cursor = transaction_service.get_transactions(user_id, limit, cursor, month, year)
+    except ValueError as e:
+        return jsonify({
+            'status': 'error',
+            'message': str(e)
+        }), 400
+    
+    return jsonify({
+        'status': 'success',
+        'transactions': transactions,
+        'next_cursor': next_cursor
+    })
\ No newline at end of file
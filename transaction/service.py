@@ -0,0 +1,42 @@
+from transaction.repository import TransactionRepository
+from utils.money import from_cents
+from utils.dates import parse_date
+import base64
+import binascii
+
+class TransactionService:
+    def __init__(self):
+        self.repository = TransactionRepository()
+    
+    def get_transactions(self, user_id, limit, cursor=None, month=None, year=None):
+        # One row past the page tells us whether there is a next one
+        before = self.decode_cursor(cursor) if cursor else None
+        transactions = self.repository.get_transactions(user_id, limit + 1, before, month, year)
+        
+        next_cursor = None
+        if len(transactions) > limit:
+            transactions = transactions[:limit]
+            next_cursor = self.encode_cursor(transactions[-1])
+        
+        for transaction in transactions:
+            del transaction['sort_date']
+            transaction['transaction_date'] = parse_date(transaction['transaction_date'])
+            transaction['amount'] = from_cents(transaction['amount'])
+        
+        return transactions, next_cursor
+    
+    def encode_cursor(self, transaction):
+        key = f"{transaction['sort_date']}|{transaction['type']}|{transaction['id']}"
+        return base64.urlsafe_b64encode(key.encode('utf-8')).decode('ascii')
+    
+    def decode_cursor(self, cursor):
+        try:
+            sort_date, transaction_type, transaction_id = (
+                base64.urlsafe_b64decode(cursor.encode('ascii')).decode('utf-8').split('|')
+            )
+            parse_date(sort_date)
+            if transaction_type not in ('expense', 'income'):
+                raise ValueError
+            return sort_date, transaction_type, int(transaction_id)
+        except (ValueError, UnicodeError, binascii.Error):
+            raise ValueError("Invalid cursor")
\ No newline at end of file
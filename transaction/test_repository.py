@@ -0,0 +1,49 @@
+import unittest
+from utils.db import insert_db
+from utils.testing import DatabaseTestCase
+from transaction.service import TransactionService
+
+class TestTransactionFeed(DatabaseTestCase):
+    def setUp(self):
+        super().setUp()
+        self.service = TransactionService()
+
+    def seed(self):
+        category_id = insert_db('INSERT INTO categories (user_id, name) VALUES (?, ?)', (self.user_id, 'Food'))
+        # Mostly expenses, so a per-type top 5 would miss some of the newest rows
+        for expense_date in ('2025-03-02', '2025-03-05', '2025-03-05', '2025-03-08', '2025-03-09', '2025-03-10', '2025-03-11', '2025-03-12'):
+            insert_db(
+                'INSERT INTO expenses (user_id, category_id, amount, date) VALUES (?, ?, ?, ?)',
+                (self.user_id, category_id, 100, expense_date)
+            )
+        insert_db(
+            'INSERT INTO income_sources (user_id, source_name, expected_amount, due_date, month, year) VALUES (?, ?, ?, ?, ?, ?)',
+            (self.user_id, 'Job', 5000, '2025-03-05', 3, 2025)
+        )
+        insert_db(
+            'INSERT INTO income_sources (user_id, source_name, expected_amount, month, year) VALUES (?, ?, ?, ?, ?)',
+            (self.user_id, 'Gift', 1000, 3, 2025)
+        )
+
+    def test_pages_follow_one_order_without_gaps(self):
+        """Test that keyset pages walk the merged feed newest first, each row once"""
+        with self.app.app_context():
+            full, _ = self.service.get_transactions(self.user_id, 50)
+
+            paged, cursor = [], None
+            while True:
+                page, cursor = self.service.get_transactions(self.user_id, 3, cursor)
+                paged.extend(page)
+                if not cursor:
+                    break
+
+        keys = [(t['type'], t['id']) for t in full]
+        self.assertEqual([(t['type'], t['id']) for t in paged], keys)
+        self.assertEqual(len(keys), 10)
+        self.assertEqual(keys[:2], [('expense', 8), ('expense', 7)])
+        # Same-day income sorts before expenses, undated income at the start of its month
+        self.assertEqual(keys[5:8], [('income', 1), ('expense', 3), ('expense', 2)])
+        self.assertEqual(keys[-2:], [('expense', 1), ('income', 2)])
+
+if __name__ == '__main__':
+    unittest.main()
\ No newline at end of file
@@ -0,0 +1,18 @@
+import unittest
+from flask import Flask
+from transaction.routes import transaction_bp
+from http import HTTPStatus
+
+class TestTransactionRoutes(unittest.TestCase):
+    def setUp(self):
+        self.app = Flask(__name__)
+        self.app.register_blueprint(transaction_bp, url_prefix='/api/transactions')
+        self.client = self.app.test_client()
+    
+    def test_unauthorized_access(self):
+        """Test that the feed requires authentication"""
+        response = self.client.get('/api/transactions')
+        self.assertEqual(response.status_code, HTTPStatus.UNAUTHORIZED)
+
+if __name__ == '__main__':
+    unittest.main()
\ No newline at end of file
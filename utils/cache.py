@@ -0,0 +1,124 @@
+import pickle
+import threading
+from collections import OrderedDict
+from flask import current_app
+from werkzeug.utils import import_string
+
+_cache_lock = threading.Lock()
+
+class LRUBackend:
+    # In-process cache: the least recently used entry is evicted once
+    # max_entries is reached. Values are stored as-is, so callers must not
+    # mutate what they get back.
+    def __init__(self, max_entries=1024):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.evictions = 0
+
+    def get(self, key):
+        with self._lock:
+            if key not in self._entries:
+                return None
+            self._entries.move_to_end(key)
+            return self._entries[key]
+
+    def set(self, key, value):
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        with self._lock:
+            return {'entries': len(self._entries), 'max_entries': self.max_entries, 'evictions': self.evictions}
+
+class ClientBackend:
+    # Shared cache across processes, on top of any client with get(key) and
+    # set(key, value, ex=seconds), e.g. redis.Redis. Keys are prefixed and
+    # values pickled.
+    def __init__(self, client, prefix='budgeta:', ttl=None):
+        self.client = client
+        self.prefix = prefix
+        self.ttl = ttl
+
+    def get(self, key):
+        raw = self.client.get(self.prefix + repr(key))
+        return pickle.loads(raw) if raw is not None else None
+
+    def set(self, key, value):
+        self.client.set(self.prefix + repr(key), pickle.dumps(value), ex=self.ttl)
+
+    def clear(self):
+        pass
+
+    def stats(self):
+        return {'prefix': self.prefix, 'ttl': self.ttl}
+
+class Cache:
+    # Hit/miss accounting in front of a backend. Keys carry the data version
+    # they were computed at, so entries are never invalidated, only outdated.
+    def __init__(self, backend):
+        self.backend = backend
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get_or_set(self, key, compute):
+        value = self.backend.get(key)
+
+        with self._lock:
+            if value is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+
+        if value is None:
+            value = compute()
+            self.backend.set(key, value)
+
+        return value
+
+    def clear(self):
+        self.backend.clear()
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            stats = {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': round(self.hits / lookups, 3) if lookups else 0.0
+            }
+        stats.update(self.backend.stats())
+        return stats
+
+def create_backend(app):
+    # CACHE_BACKEND is 'lru' or the import path of a factory taking the app,
+    # e.g. 'myproject.cache:redis_backend' returning a ClientBackend
+    name = app.config.get('CACHE_BACKEND', 'lru')
+
+    if name == 'lru':
+        return LRUBackend(app.config.get('CACHE_MAX_ENTRIES', 1024))
+
+    return import_string(name.replace(':', '.'))(app)
+
+def get_cache(app=None):
+    # Get (or lazily create) the app's response cache
+    app = app or current_app._get_current_object()
+    cache = app.extensions.get('cache')
+
+    if cache is None:
+        with _cache_lock:
+            cache = app.extensions.get('cache')
+            if cache is None:
+                cache = Cache(create_backend(app))
+                app.extensions['cache'] = cache
+
+    return cache
@@ -0,0 +1,48 @@
+from datetime import date, datetime
+
+
+def month_range(year, month):
+    # Half-open [start, end) ISO date bounds for a month, index friendly
+    if not 1 <= month <= 12:
+        raise ValueError(f"Invalid month: {month}, expected 1-12")
+    start = date(year, month, 1)
+    end = date(year + 1, 1, 1) if month == 12 else date(year, month + 1, 1)
+    return start.isoformat(), end.isoformat()
+
+
+def year_range(year):
+    # Half-open [start, end) ISO date bounds for a year
+    return date(year, 1, 1).isoformat(), date(year + 1, 1, 1).isoformat()
+
+
+def parse_date(value):
+    # Accept YYYY-MM-DD strings from requests and date objects from
+    # PARSE_DECLTYPES. Only that format: fromisoformat would also take
+    # '20250304' or week dates, which sqlite can't read back as a date.
+    if value is None or isinstance(value, date):
+        return value
+    if not isinstance(value, str):
+        raise ValueError(f"Invalid date: {value!r}, expected YYYY-MM-DD")
+    try:
+        return datetime.strptime(value, '%Y-%m-%d').date()
+    except ValueError:
+        raise ValueError(f"Invalid date: {value!r}, expected YYYY-MM-DD")
+
+
+def parse_month(value):
+    # 'YYYY-MM' to a (year, month) tuple
+    try:
+        year, month = (int(part) for part in value.split('-'))
+    except (AttributeError, ValueError):
+        raise ValueError(f"Invalid month: {value!r}, expected YYYY-MM")
+    if not 1 <= month <= 12 or not 1 <= year <= 9999:
+        raise ValueError(f"Invalid month: {value!r}, expected YYYY-MM")
+    return year, month
+
+
+def iter_months(start, end):
+    # Every (year, month) from start to end inclusive
+    year, month = start
+    while (year, month) <= end:
+        yield year, month
+        year, month = (year + 1, 1) if month == 12 else (year, month + 1)
@@ -1,30 +1,199 @@
 import sqlite3
-from flask import g, current_app
+import threading
+from contextlib import contextmanager
+from functools import partial
+from urllib.parse import quote
+from flask import g, current_app, request, has_request_context
 import click
 from flask.cli import with_appcontext
+from utils.pool import ConnectionPool
+from utils.instrumentation import timed_query
+
+_pool_lock = threading.Lock()
+
+def connect(database, readonly=False):
+    # Open a raw connection; pooled connections are shared across threads
+    # (one at a time), so the same-thread check has to be disabled
+    if readonly:
+        return sqlite3.connect(
+            f'file:{quote(database)}?mode=ro',
+            uri=True,
+            detect_types=sqlite3.PARSE_DECLTYPES,
+            check_same_thread=False
+        )
+    
+    return sqlite3.connect(
+        database,
+        detect_types=sqlite3.PARSE_DECLTYPES,
+        check_same_thread=False
+    )
+
+_PRAGMA_CHOICES = {
+    'journal_mode': ('DELETE', 'TRUNCATE', 'PERSIST', 'MEMORY', 'WAL', 'OFF'),
+    'synchronous': ('OFF', 'NORMAL', 'FULL', 'EXTRA'),
+    'temp_store': ('DEFAULT', 'FILE', 'MEMORY')
+}
+
+# busy_timeout goes first so a journal_mode switch waits for other writers
+_PRAGMA_ORDER = ('busy_timeout', 'journal_mode', 'synchronous', 'mmap_size', 'cache_size', 'temp_store')
+
+def init_connection(db):
+    # Per-connection setup, run once when the pool opens a connection
+    db.row_factory = sqlite3.Row
+
+def init_read_connection(db):
+    # Belt and braces on top of mode=ro: refuse writes at the SQL level too
+    db.execute('PRAGMA query_only = 1')
+
+def get_sqlite_profile(app=None):
+    app = app or current_app
+    name = app.config.get('SQLITE_PROFILE')
+    profiles = app.config.get('SQLITE_PROFILES', {})
+    
+    if not name:
+        return {}
+    if name not in profiles:
+        raise ValueError(f"Unknown SQLite profile: {name}")
+    
+    return profiles[name]
+
+def apply_pragmas(db, pragmas):
+    # Apply a tuning profile; values are validated since PRAGMA can't be parameterized
+    for name in _PRAGMA_ORDER:
+        if name not in pragmas:
+            continue
+        
+        value = pragmas[name]
+        if name in _PRAGMA_CHOICES:
+            value = str(value).upper()
+            if value not in _PRAGMA_CHOICES[name]:
+                raise ValueError(f"Invalid value for PRAGMA {name}: {pragmas[name]}")
+        else:
+            value = int(value)
+        
+        db.execute(f'PRAGMA {name} = {value}').fetchall()
+
+def get_pool(app=None, readonly=False):
+    # Get (or lazily create) the writer or reader connection pool for the app
+    app = app or current_app._get_current_object()
+    name = 'reader' if readonly else 'writer'
+    pools = app.extensions.setdefault('db_pools', {})
+    pool = pools.get(name)
+    
+    if pool is None:
+        with _pool_lock:
+            pool = pools.get(name)
+            if pool is None:
+                pool = _create_pool(app, readonly)
+                pools[name] = pool
+    
+    return pool
+
+def _create_pool(app, readonly):
+    pragmas = get_sqlite_profile(app)
+    
+    if readonly:
+        # Readers may point at a replica file produced by `flask db-snapshot`.
+        # journal_mode is a property of the file and can't be set read-only.
+        database = app.config.get('DATABASE_READ_REPLICA') or app.config['DATABASE']
+        pragmas = {name: value for name, value in pragmas.items() if name != 'journal_mode'}
+        return ConnectionPool(
+            lambda: connect(database, readonly=True),
+            size=app.config.get('DATABASE_POOL_SIZE', 5),
+            timeout=app.config.get('DATABASE_POOL_TIMEOUT', 30.0),
+            init_hooks=[init_connection, init_read_connection, partial(apply_pragmas, pragmas=pragmas)]
+        )
+    
+    # A single writer by default: writes queue here instead of fighting
+    # over SQLite's write lock
+    database = app.config['DATABASE']
+    return ConnectionPool(
+        lambda: connect(database),
+        size=app.config.get('DATABASE_WRITER_POOL_SIZE', 1),
+        timeout=app.config.get('DATABASE_POOL_TIMEOUT', 30.0),
+        init_hooks=[init_connection, partial(apply_pragmas, pragmas=pragmas)]
+    )
+
+def get_pool_stats(app=None):
+    app = app or current_app._get_current_object()
+    return {name: pool.stats() for name, pool in app.extensions.get('db_pools', {}).items()}
 
 def get_db():
-    # Connect to the database
+    # Check the read-write connection out of the pool for the rest of the app
+    # context. Writes and transaction() borrow it only while they run; this
+    # is for callers that need the writer itself (migrations, backups).
     if 'db' not in g:
-        g.db = sqlite3.connect(
-            current_app.config['DATABASE'],
-            detect_types=sqlite3.PARSE_DECLTYPES
-        )
-        g.db.row_factory = sqlite3.Row
+        g.db = get_pool().checkout()
     
     return g.db
 
+@contextmanager
+def _writer():
+    # The context's writer if one is checked out, otherwise borrow it from
+    # the pool for just this block so other requests can write meanwhile
+    if 'db' in g:
+        yield g.db
+        return
+    
+    pool = get_pool()
+    db = pool.checkout()
+    try:
+        yield db
+    finally:
+        pool.checkin(db)
+
+def get_read_db():
+    # Reads go through a separate read-only connection so they never wait on
+    # the write lock. Anything inside a transaction, or behind uncommitted
+    # work on the writer, stays on the writer to see its own changes.
+    if not _use_read_connection():
+        return get_db()
+    
+    if 'read_db' not in g:
+        g.read_db = get_pool(readonly=True).checkout()
+    
+    return g.read_db
+
+def _use_read_connection():
+    if in_transaction() or not current_app.config.get('DATABASE_READ_ROUTING', True):
+        return False
+    if 'db' in g and g.db.in_transaction:
+        return False
+    # A replica lags the live file, so only read requests may use it; a write
+    # request has to be able to read back what it just committed
+    if current_app.config.get('DATABASE_READ_REPLICA'):
+        return has_request_context() and request.method in ('GET', 'HEAD')
+    return True
+
 def close_db(e=None):
     db = g.pop('db', None)
+    read_db = g.pop('read_db', None)
     
     if db is not None:
-        db.close()
+        get_pool().checkin(db)
+    
+    if read_db is not None:
+        get_pool(readonly=True).checkin(read_db)
+
+def backup_db(target):
+    # Online, consistent copy of the database (e.g. a read replica file)
+    destination = sqlite3.connect(target)
+    try:
+        get_db().backup(destination)
+    finally:
+        destination.close()
 
 def init_db():
+    # Import locally to avoid circular imports
+    from utils.migrations import upgrade_db
+    
     db = get_db()
     
     with current_app.open_resource('schema.sql') as f:
         db.executescript(f.read().decode('utf8'))
+    
+    # schema.sql is the baseline; migrations bring a fresh database up to date
+    upgrade_db()
 
 @click.command('init-db')
 @with_appcontext
@@ -32,32 +201,138 @@ def init_db_command():
     init_db()
     click.echo('Initialized the database.')
 
+@click.command('db-snapshot')
+@click.argument('target')
+@with_appcontext
+def db_snapshot_command(target):
+    backup_db(target)
+    click.echo(f'Wrote database snapshot to {target}.')
+
 def query_db(query, args=(), one=False):
     # Execute a query and return the results
-    cur = get_db().execute(query, args)
-    rv = cur.fetchall()
+    db = get_read_db()
+    with timed_query(query):
+        cur = db.execute(query, args)
+        rv = cur.fetchall()
     cur.close()
     return (rv[0] if rv else None) if one else rv
 
+def iter_db(query, args=(), batch_size=500):
+    # Execute a query and yield rows as they're fetched, for results too large
+    # to build in memory; only the execute is timed
+    db = get_read_db()
+    with timed_query(query):
+        cur = db.execute(query, args)
+    
+    try:
+        while True:
+            rows = cur.fetchmany(batch_size)
+            if not rows:
+                break
+            yield from rows
+    finally:
+        cur.close()
+
+def in_transaction():
+    return g.get('tx_depth', 0) > 0
+
+def after_commit(callback):
+    # Run callback once the enclosing transaction commits, or right away
+    # outside one. Callbacks of a rolled back block are dropped.
+    if not in_transaction():
+        callback()
+        return
+    
+    g.setdefault('after_commit', []).append(callback)
+
+@contextmanager
+def transaction():
+    # Unit of work: every write inside the block is committed once at the end,
+    # or rolled back if it raises. Nested blocks become savepoints. The
+    # outermost block checks the writer out and hands it back when it ends.
+    depth = g.get('tx_depth', 0)
+    borrowed = depth == 0 and 'db' not in g
+    db = get_db()
+    
+    if depth == 0:
+        if db.in_transaction:
+            db.commit()
+        # Take the write lock up front instead of upgrading mid-transaction
+        db.execute('BEGIN IMMEDIATE')
+        g.after_commit = []
+    else:
+        db.execute(f'SAVEPOINT tx_{depth}')
+    
+    pending = len(g.after_commit)
+    g.tx_depth = depth + 1
+    try:
+        yield db
+    except BaseException:
+        g.tx_depth = depth
+        del g.after_commit[pending:]
+        if depth == 0:
+            db.rollback()
+            _release_writer(borrowed)
+        else:
+            db.execute(f'ROLLBACK TO tx_{depth}')
+            db.execute(f'RELEASE tx_{depth}')
+        raise
+    
+    g.tx_depth = depth
+    if depth == 0:
+        try:
+            db.commit()
+        finally:
+            _release_writer(borrowed)
+        for callback in g.pop('after_commit'):
+            callback()
+    else:
+        db.execute(f'RELEASE tx_{depth}')
+
+def _release_writer(borrowed):
+    if borrowed:
+        get_pool().checkin(g.pop('db'))
+
 def insert_db(query, args=()):
     # Insert data and return the ID
-    db = get_db()
-    cur = db.execute(query, args)
-    last_id = cur.lastrowid
-    db.commit()
-    cur.close()
+    with _writer() as db:
+        with timed_query(query):
+            cur = db.execute(query, args)
+            last_id = cur.lastrowid
+            if not in_transaction():
+                db.commit()
+        cur.close()
     return last_id
 
 def update_db(query, args=()):
     # Update data and return rows affected
-    db = get_db()
-    cur = db.execute(query, args)
-    affected = cur.rowcount
-    db.commit()
-    cur.close()
+    with _writer() as db:
+        with timed_query(query):
+            cur = db.execute(query, args)
+            affected = cur.rowcount
+            if not in_transaction():
+                db.commit()
+        cur.close()
+    return affected
+
+def executemany_db(query, seq_of_args):
+    # Run one statement for a batch of rows and return rows affected
+    with _writer() as db:
+        with timed_query(query):
+            cur = db.executemany(query, seq_of_args)
+            affected = cur.rowcount
+            if not in_transaction():
+                db.commit()
+        cur.close()
     return affected
 
 def init_app(app):
     # Register database functions with the app
+    from utils.migrations import db_upgrade_command
+    from utils import instrumentation
+    
+    instrumentation.init_app(app)
     app.teardown_appcontext(close_db)
-    app.cli.add_command(init_db_command)
\ No newline at end of file
+    app.cli.add_command(init_db_command)
+    app.cli.add_command(db_snapshot_command)
+    app.cli.add_command(db_upgrade_command)
@@ -0,0 +1,35 @@
+import hashlib
+from datetime import date
+from functools import wraps
+from flask import request, g, current_app, make_response
+
+# Bump when a response shape changes so clients don't keep revalidating
+# bodies in the old format
+ETAG_VERSION = 1
+
+def compute_etag(user_id, data_version):
+    # A response is a function of the user's data, the full URL and, for
+    # endpoints that default to the current month, today's date
+    source = f'{ETAG_VERSION}:{user_id}:{data_version}:{request.full_path}:{date.today().isoformat()}'
+    return hashlib.sha1(source.encode('utf-8')).hexdigest()
+
+def conditional_get(f):
+    # Goes under @login_required: answers 304 Not Modified from g.user alone
+    # when the client's ETag is current, before any service code runs
+    @wraps(f)
+    def decorated(*args, **kwargs):
+        etag = compute_etag(g.user['user_id'], g.user['data_version'])
+
+        if request.if_none_match.contains_weak(etag):
+            response = current_app.response_class(status=304)
+        else:
+            response = make_response(f(*args, **kwargs))
+            if response.status_code != 200:
+                return response
+
+        response.set_etag(etag, weak=True)
+        # Cached copies must be revalidated, and never shared between users
+        response.headers['Cache-Control'] = 'private, no-cache'
+        return response
+
+    return decorated
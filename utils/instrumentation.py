@@ -0,0 +1,76 @@
+import re
+import time
+from contextlib import contextmanager
+from collections import Counter
+from flask import g, has_app_context, request
+
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_LITERAL = re.compile(r'\b\d+(?:\.\d+)?\b')
+_IN_LIST = re.compile(r'\(\s*\?(?:\s*,\s*\?)*\s*\)')
+_WHITESPACE = re.compile(r'\s+')
+
+def normalize_sql(query):
+    # Collapse whitespace and literals so the same statement shape groups together
+    query = _STRING_LITERAL.sub('?', query)
+    query = _NUMBER_LITERAL.sub('?', query)
+    query = _IN_LIST.sub('(?)', query)
+    return _WHITESPACE.sub(' ', query).strip()
+
+def record_query(query, duration):
+    # Per-request statement log, kept on g next to the request's connection
+    if not has_app_context():
+        return
+    
+    if 'query_log' not in g:
+        g.query_log = []
+    g.query_log.append((query, duration))
+
+def get_query_stats():
+    log = g.get('query_log', [])
+    statements = Counter(normalize_sql(query) for query, _ in log)
+    
+    return {
+        'count': len(log),
+        'total_ms': sum(duration for _, duration in log) * 1000,
+        'statements': statements
+    }
+
+@contextmanager
+def timed_query(query):
+    # Record the statement and how long the block running it took
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        record_query(query, time.perf_counter() - start)
+
+def init_app(app):
+    @app.after_request
+    def report_query_stats(response):
+        if not app.config.get('DB_QUERY_STATS', True) or 'query_log' not in g:
+            return response
+        # A streamed body runs its queries after the headers are sent, so
+        # any figure here would undercount them
+        if response.is_streamed:
+            return response
+        
+        stats = get_query_stats()
+        response.headers.add(
+            'Server-Timing',
+            f'db;dur={stats["total_ms"]:.3f};desc="{stats["count"]} queries"'
+        )
+        app.logger.debug(
+            '%s %s: %d queries in %.3fms',
+            request.method, request.path, stats['count'], stats['total_ms']
+        )
+        
+        threshold = app.config.get('DB_N_PLUS_ONE_THRESHOLD')
+        if threshold:
+            for statement, count in stats['statements'].items():
+                if count > threshold:
+                    app.logger.warning(
+                        'Possible N+1 in %s %s: statement ran %d times: %s',
+                        request.method, request.path, count, statement
+                    )
+        
+        return response
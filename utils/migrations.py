@@ -0,0 +1,80 @@
+import os
+import re
+import sqlite3
+import click
+from flask import current_app
+from flask.cli import with_appcontext
+from utils.db import get_db
+
+MIGRATIONS_DIR = 'migrations'
+MIGRATION_FILE_PATTERN = re.compile(r'^(\d{4})_([a-z0-9_]+)\.sql$')
+
+def ensure_version_table(db):
+    db.execute('''
+        CREATE TABLE IF NOT EXISTS schema_migrations (
+            version INTEGER PRIMARY KEY,
+            name VARCHAR(100) NOT NULL,
+            applied_at DATETIME DEFAULT CURRENT_TIMESTAMP
+        )
+    ''')
+    db.commit()
+
+def get_current_version(db):
+    ensure_version_table(db)
+    row = db.execute('SELECT MAX(version) AS version FROM schema_migrations').fetchone()
+    return row['version'] or 0
+
+def load_migrations():
+    # Migrations are numbered SQL files, applied in version order
+    directory = os.path.join(current_app.root_path, MIGRATIONS_DIR)
+    migrations = []
+    
+    for filename in sorted(os.listdir(directory)):
+        match = MIGRATION_FILE_PATTERN.match(filename)
+        if not match:
+            continue
+        
+        with current_app.open_resource(os.path.join(MIGRATIONS_DIR, filename)) as f:
+            migrations.append((int(match.group(1)), match.group(2), f.read().decode('utf8')))
+    
+    return migrations
+
+def apply_migration(db, version, name, script):
+    # executescript commits anything pending first, so wrap the migration and
+    # its version row in one explicit transaction to keep it all-or-nothing
+    try:
+        db.executescript(
+            f"BEGIN;\n{script}\n"
+            f"INSERT INTO schema_migrations (version, name) VALUES ({version}, '{name}');\n"
+            f"COMMIT;"
+        )
+    except sqlite3.Error:
+        if db.in_transaction:
+            db.rollback()
+        raise
+
+def upgrade_db(target=None):
+    # Apply every pending migration up to target (default: latest)
+    db = get_db()
+    current = get_current_version(db)
+    applied = []
+    
+    for version, name, script in load_migrations():
+        if version <= current or (target is not None and version > target):
+            continue
+        
+        apply_migration(db, version, name, script)
+        applied.append((version, name))
+    
+    return applied
+
+@click.command('db-upgrade')
+@click.option('--target', type=int, default=None, help='Stop after this migration version.')
+@with_appcontext
+def db_upgrade_command(target):
+    applied = upgrade_db(target)
+    
+    for version, name in applied:
+        click.echo(f'Applied migration {version:04d}_{name}')
+    
+    click.echo(f'Database is at version {get_current_version(get_db())}.')
@@ -0,0 +1,35 @@
+from decimal import Decimal, InvalidOperation, ROUND_HALF_UP
+
+# Money is stored and summed as integer minor units (cents); floats only
+# appear at the JSON boundary.
+
+# SQLite integers are signed 64-bit
+MAX_CENTS = 2 ** 63 - 1
+
+def to_cents(amount):
+    # Convert a request amount (number or numeric string) to integer cents
+    if amount is None:
+        return None
+    if isinstance(amount, bool):
+        raise ValueError(f"Invalid amount: {amount}")
+    
+    try:
+        value = Decimal(str(amount))
+    except InvalidOperation:
+        raise ValueError(f"Invalid amount: {amount}")
+    
+    if not value.is_finite():
+        raise ValueError(f"Invalid amount: {amount}")
+    
+    # Compare before quantizing: huge exponents overflow the decimal context
+    if abs(value * 100) > MAX_CENTS:
+        raise ValueError(f"Amount out of range: {amount}")
+    
+    return int((value * 100).quantize(Decimal('1'), rounding=ROUND_HALF_UP))
+
+def from_cents(cents):
+    # Convert integer cents to a JSON number in major units
+    if cents is None:
+        return None
+    
+    return cents / 100
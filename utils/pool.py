@@ -0,0 +1,161 @@
+import queue
+import sqlite3
+import threading
+import time
+
+
+class PoolTimeout(Exception):
+    pass
+
+
+class ConnectionPool:
+    # Bounded pool of reusable SQLite connections. Idle connections are kept
+    # in a LIFO queue so the most recently used (warmest) one is handed out first.
+    def __init__(self, factory, size=5, timeout=30.0, init_hooks=None, health_check=True):
+        self.factory = factory
+        self.size = size
+        self.timeout = timeout
+        self.init_hooks = list(init_hooks or [])
+        self.health_check = health_check
+
+        self._idle = queue.LifoQueue(maxsize=size)
+        self._lock = threading.Lock()
+        self._created = 0
+        self._closed = False
+
+        self._checkouts = 0
+        self._waits = 0
+        self._total_wait = 0.0
+        self._max_wait = 0.0
+        self._discarded = 0
+        self._timeouts = 0
+
+    def add_init_hook(self, hook):
+        self.init_hooks.append(hook)
+
+    def checkout(self):
+        if self._closed:
+            raise PoolTimeout("Connection pool is closed")
+
+        start = time.perf_counter()
+        waited = False
+
+        while True:
+            try:
+                conn = self._idle.get_nowait()
+            except queue.Empty:
+                conn = self._create_if_allowed()
+                if conn is None:
+                    # Pool exhausted, block until another request checks one in
+                    waited = True
+                    remaining = self.timeout - (time.perf_counter() - start)
+                    try:
+                        conn = self._idle.get(timeout=max(remaining, 0))
+                    except queue.Empty:
+                        with self._lock:
+                            self._timeouts += 1
+                        raise PoolTimeout(
+                            f"Timed out after {self.timeout}s waiting for a database connection"
+                        )
+
+            if self._is_healthy(conn):
+                break
+
+            self._discard(conn)
+
+        wait = time.perf_counter() - start
+        with self._lock:
+            self._checkouts += 1
+            self._total_wait += wait
+            self._max_wait = max(self._max_wait, wait)
+            if waited:
+                self._waits += 1
+
+        return conn
+
+    def checkin(self, conn):
+        try:
+            # Never hand out a connection with a half-finished transaction
+            if conn.in_transaction:
+                conn.rollback()
+        except sqlite3.Error:
+            self._discard(conn)
+            return
+
+        if self._closed:
+            self._discard(conn)
+            return
+
+        try:
+            self._idle.put_nowait(conn)
+        except queue.Full:
+            self._discard(conn)
+
+    def close_all(self):
+        self._closed = True
+        while True:
+            try:
+                conn = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            self._discard(conn)
+
+    def stats(self):
+        with self._lock:
+            return {
+                'size': self.size,
+                'created': self._created,
+                'idle': self._idle.qsize(),
+                'in_use': self._created - self._idle.qsize(),
+                'checkouts': self._checkouts,
+                'waits': self._waits,
+                'timeouts': self._timeouts,
+                'discarded': self._discarded,
+                'total_wait_ms': round(self._total_wait * 1000, 3),
+                'avg_wait_ms': round(self._total_wait * 1000 / self._checkouts, 3) if self._checkouts else 0.0,
+                'max_wait_ms': round(self._max_wait * 1000, 3)
+            }
+
+    def _create_if_allowed(self):
+        with self._lock:
+            if self._created >= self.size:
+                return None
+            self._created += 1
+
+        conn = None
+        try:
+            conn = self.factory()
+            for hook in self.init_hooks:
+                hook(conn)
+        except Exception:
+            # A hook failed on a fresh connection: close it rather than leak it
+            if conn is not None:
+                try:
+                    conn.close()
+                except sqlite3.Error:
+                    pass
+            with self._lock:
+                self._created -= 1
+            raise
+
+        return conn
+
+    def _is_healthy(self, conn):
+        if not self.health_check:
+            return True
+
+        try:
+            conn.execute('SELECT 1').fetchone()
+            return True
+        except sqlite3.Error:
+            return False
+
+    def _discard(self, conn):
+        try:
+            conn.close()
+        except sqlite3.Error:
+            pass
+
+        with self._lock:
+            self._created -= 1
+            self._discarded += 1
@@ -0,0 +1,41 @@
+import unittest
+from flask import Flask
+from utils.cache import LRUBackend, Cache, get_cache
+
+class TestCache(unittest.TestCase):
+    def test_lru_evicts_least_recently_used(self):
+        """Test that the oldest untouched entry is evicted at max_entries"""
+        backend = LRUBackend(max_entries=2)
+        backend.set('a', 1)
+        backend.set('b', 2)
+        backend.get('a')
+        backend.set('c', 3)
+
+        self.assertEqual(backend.get('a'), 1)
+        self.assertIsNone(backend.get('b'))
+        self.assertEqual(backend.get('c'), 3)
+        self.assertEqual(backend.stats()['evictions'], 1)
+
+    def test_get_or_set_counts_hits_and_misses(self):
+        """Test that a value is computed once per key and lookups are counted"""
+        cache = Cache(LRUBackend())
+        calls = []
+        compute = lambda: calls.append(1) or {'total': 10}
+
+        for version in (1, 1, 1, 2):
+            cache.get_or_set(('dashboard', 1, 3, 2025, version), compute)
+
+        self.assertEqual(len(calls), 2)
+        self.assertEqual(cache.stats()['hits'], 2)
+        self.assertEqual(cache.stats()['misses'], 2)
+
+    def test_backend_from_config(self):
+        """Test that the app's cache is built once from CACHE_* settings"""
+        app = Flask(__name__)
+        app.config['CACHE_MAX_ENTRIES'] = 3
+
+        self.assertIs(get_cache(app), get_cache(app))
+        self.assertEqual(get_cache(app).stats()['max_entries'], 3)
+
+if __name__ == '__main__':
+    unittest.main()
\ No newline at end of file
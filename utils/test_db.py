@@ -0,0 +1,198 @@
+import unittest
+import sqlite3
+from utils.db import get_db, get_read_db, get_pool, query_db, insert_db, update_db, executemany_db, transaction, after_commit
+from utils.pool import ConnectionPool
+from utils.testing import DatabaseTestCase
+
+class TestConnectionPool(unittest.TestCase):
+    def test_failed_init_hook_closes_connection(self):
+        """Test that a connection whose init hook raises is closed and not counted"""
+        created = []
+
+        def factory():
+            conn = sqlite3.connect(':memory:')
+            created.append(conn)
+            return conn
+
+        def failing_hook(conn):
+            raise sqlite3.OperationalError('hook failed')
+
+        pool = ConnectionPool(factory, size=1, init_hooks=[failing_hook])
+
+        with self.assertRaises(sqlite3.OperationalError):
+            pool.checkout()
+
+        self.assertEqual(len(created), 1)
+        with self.assertRaises(sqlite3.ProgrammingError):
+            created[0].execute('SELECT 1')
+        self.assertEqual(pool.stats()['created'], 0)
+
+class TestDatabasePool(DatabaseTestCase):
+    init_database = False
+    app_config = {'DATABASE_POOL_SIZE': 2, 'DATABASE_POOL_TIMEOUT': 0.1}
+
+    def test_connection_reused_across_requests(self):
+        """Test that a connection is returned to the pool and handed out again"""
+        with self.app.app_context():
+            first = get_db()
+
+        with self.app.app_context():
+            second = get_db()
+            self.assertIs(first, second)
+            self.assertEqual(query_db('SELECT 1 AS one', one=True)['one'], 1)
+
+        stats = get_pool(self.app).stats()
+        self.assertEqual(stats['created'], 1)
+        self.assertEqual(stats['checkouts'], 2)
+        self.assertEqual(stats['idle'], 1)
+
+    def test_broken_connection_replaced(self):
+        """Test that a closed connection is never handed out again"""
+        with self.app.app_context():
+            broken = get_db()
+            broken.close()
+
+        with self.app.app_context():
+            self.assertIsNot(get_db(), broken)
+            self.assertEqual(query_db('SELECT 1 AS one', one=True)['one'], 1)
+
+        self.assertEqual(get_pool(self.app).stats()['discarded'], 1)
+
+    def test_open_transaction_rolled_back_on_checkin(self):
+        """Test that uncommitted work never leaks into the next request"""
+        with self.app.app_context():
+            get_db().execute('CREATE TABLE t (x INTEGER)')
+            get_db().commit()
+            get_db().execute('INSERT INTO t VALUES (1)')
+
+        with self.app.app_context():
+            self.assertEqual(query_db('SELECT COUNT(*) AS n FROM t', one=True)['n'], 0)
+
+class TestReadRouting(DatabaseTestCase):
+    init_database = False
+    app_config = {'DATABASE_POOL_TIMEOUT': 0.1}
+
+    def seed(self):
+        get_db().execute('CREATE TABLE t (x INTEGER)')
+        get_db().commit()
+
+    def test_get_requests_read_from_read_only_connection(self):
+        """Test that GET handlers get a separate connection that refuses writes"""
+        with self.app.test_request_context('/', method='GET'):
+            self.assertIsNot(get_read_db(), get_db())
+            with self.assertRaises(sqlite3.OperationalError):
+                get_read_db().execute('INSERT INTO t VALUES (1)')
+
+            insert_db('INSERT INTO t VALUES (?)', (1,))
+            self.assertEqual(query_db('SELECT COUNT(*) AS n FROM t', one=True)['n'], 1)
+
+    def test_writer_only_held_while_writing(self):
+        """Test that a write request reads on a reader and holds the writer only for its writes"""
+        writer = get_pool(self.app)
+
+        with self.app.test_request_context('/', method='POST'):
+            self.assertIsNot(get_read_db(), get_db())
+
+        with self.app.test_request_context('/', method='POST'):
+            query_db('SELECT COUNT(*) AS n FROM t')
+            insert_db('INSERT INTO t VALUES (?)', (1,))
+            with transaction():
+                insert_db('INSERT INTO t VALUES (?)', (2,))
+                self.assertIs(get_read_db(), get_db())
+                self.assertEqual(query_db('SELECT COUNT(*) AS n FROM t', one=True)['n'], 2)
+            idle_during_request = writer.stats()['idle']
+
+            # Another request can write while this one is still open
+            with self.app.test_request_context('/', method='DELETE'):
+                update_db('DELETE FROM t WHERE x = ?', (1,))
+
+            self.assertEqual(query_db('SELECT COUNT(*) AS n FROM t', one=True)['n'], 1)
+
+        self.assertEqual(idle_during_request, 1)
+
+    def test_replica_reads_only_for_read_requests(self):
+        """Test that with a replica, write requests read back through the live database"""
+        self.app.config['DATABASE_READ_REPLICA'] = self.db_path
+
+        with self.app.test_request_context('/', method='POST'):
+            self.assertIs(get_read_db(), get_db())
+
+        with self.app.test_request_context('/', method='GET'):
+            self.assertIsNot(get_read_db(), get_db())
+
+class TestTransaction(DatabaseTestCase):
+    init_database = False
+
+    def seed(self):
+        get_db().execute('CREATE TABLE t (x INTEGER)')
+        get_db().commit()
+
+    def count(self):
+        return query_db('SELECT COUNT(*) AS n FROM t', one=True)['n']
+
+    def test_writes_commit_once(self):
+        """Test that all writes in a transaction share a single commit"""
+        statements = []
+
+        with self.app.app_context():
+            get_db().set_trace_callback(statements.append)
+            with transaction():
+                insert_db('INSERT INTO t VALUES (?)', (1,))
+                executemany_db('INSERT INTO t VALUES (?)', [(2,), (3,), (4,)])
+            get_db().set_trace_callback(None)
+
+            self.assertEqual(self.count(), 4)
+
+        self.assertEqual([s for s in statements if s.upper() == 'COMMIT'], ['COMMIT'])
+
+    def test_rollback_on_error(self):
+        """Test that an exception discards every write in the block"""
+        with self.app.app_context():
+            with self.assertRaises(ValueError):
+                with transaction():
+                    insert_db('INSERT INTO t VALUES (?)', (1,))
+                    raise ValueError('boom')
+
+            self.assertEqual(self.count(), 0)
+
+    def test_nested_block_rolls_back_to_savepoint(self):
+        """Test that a failing nested block only undoes its own writes"""
+        with self.app.app_context():
+            with transaction():
+                insert_db('INSERT INTO t VALUES (?)', (1,))
+                try:
+                    with transaction():
+                        insert_db('INSERT INTO t VALUES (?)', (2,))
+                        raise ValueError('boom')
+                except ValueError:
+                    pass
+
+            self.assertEqual(self.count(), 1)
+
+    def test_after_commit_runs_once_committed(self):
+        """Test that after_commit callbacks run after the commit and are dropped on rollback"""
+        calls = []
+
+        with self.app.app_context():
+            with transaction():
+                insert_db('INSERT INTO t VALUES (?)', (1,))
+                after_commit(lambda: calls.append(('kept', self.count())))
+                try:
+                    with transaction():
+                        after_commit(lambda: calls.append(('savepoint', self.count())))
+                        raise ValueError('boom')
+                except ValueError:
+                    pass
+                self.assertEqual(calls, [])
+
+            with self.assertRaises(ValueError):
+                with transaction():
+                    after_commit(lambda: calls.append(('rolled back', self.count())))
+                    raise ValueError('boom')
+
+            after_commit(lambda: calls.append(('immediate', self.count())))
+
+        self.assertEqual(calls, [('kept', 1), ('immediate', 1)])
+
+if __name__ == '__main__':
+    unittest.main()
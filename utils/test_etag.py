@@ -0,0 +1,45 @@
+import unittest
+from flask import Flask, g, jsonify
+from utils.etag import conditional_get
+
+class TestConditionalGet(unittest.TestCase):
+    def setUp(self):
+        self.app = Flask(__name__)
+        self.user = {'user_id': 1, 'data_version': 1}
+        self.calls = []
+
+        @self.app.before_request
+        def load_user():
+            g.user = self.user
+
+        @self.app.route('/items')
+        @conditional_get
+        def items():
+            self.calls.append(1)
+            return jsonify({'status': 'success', 'items': []})
+
+        self.client = self.app.test_client()
+
+    def test_not_modified_skips_handler(self):
+        """Test that a current ETag gets a 304 without running the handler"""
+        first = self.client.get('/items')
+        etag = first.headers['ETag']
+
+        second = self.client.get('/items', headers={'If-None-Match': etag})
+
+        self.assertEqual(first.status_code, 200)
+        self.assertEqual(second.status_code, 304)
+        self.assertEqual(second.headers['ETag'], etag)
+        self.assertEqual(len(self.calls), 1)
+
+    def test_etag_changes_with_data_version_and_url(self):
+        """Test that a write or a different query string invalidates the ETag"""
+        etag = self.client.get('/items').headers['ETag']
+
+        self.assertEqual(self.client.get('/items?month=3', headers={'If-None-Match': etag}).status_code, 200)
+
+        self.user['data_version'] = 2
+        self.assertEqual(self.client.get('/items', headers={'If-None-Match': etag}).status_code, 200)
+
+if __name__ == '__main__':
+    unittest.main()
\ No newline at end of file
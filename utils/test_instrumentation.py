@@ -0,0 +1,54 @@
+import unittest
+from flask import jsonify, stream_with_context
+from utils.db import query_db
+from utils.instrumentation import normalize_sql, get_query_stats
+from utils.testing import DatabaseTestCase
+
+class TestQueryInstrumentation(DatabaseTestCase):
+    init_database = False
+    app_config = {'DB_N_PLUS_ONE_THRESHOLD': 2}
+
+    def setUp(self):
+        super().setUp()
+
+        @self.app.route('/loop')
+        def loop():
+            for i in range(3):
+                query_db('SELECT ? AS i', (i,))
+            return jsonify(get_query_stats()['count'])
+
+        @self.app.route('/stream')
+        def stream():
+            query_db('SELECT 1')
+            def generate():
+                for i in range(3):
+                    yield str(query_db('SELECT ? AS i', (i,), one=True)['i'])
+            return self.app.response_class(stream_with_context(generate()))
+
+        self.client = self.app.test_client()
+
+    def test_normalize_sql(self):
+        """Test that literals and whitespace don't split statement shapes"""
+        self.assertEqual(
+            normalize_sql("SELECT *\n  FROM t WHERE a = 'x' AND b = 12 AND c IN (?, ?, ?)"),
+            'SELECT * FROM t WHERE a = ? AND b = ? AND c IN (?)'
+        )
+
+    def test_server_timing_and_n_plus_one_warning(self):
+        """Test that each request reports its statements and flags repeats"""
+        with self.assertLogs(self.app.logger, level='WARNING') as logs:
+            response = self.client.get('/loop')
+
+        self.assertEqual(response.get_json(), 3)
+        self.assertIn('desc="3 queries"', response.headers['Server-Timing'])
+        self.assertIn('ran 3 times: SELECT ? AS i', logs.output[0])
+
+    def test_streamed_response_has_no_server_timing(self):
+        """Test that a streamed body, whose queries run after the headers, reports no partial timing"""
+        response = self.client.get('/stream')
+
+        self.assertEqual(response.get_data(as_text=True), '012')
+        self.assertNotIn('Server-Timing', response.headers)
+
+if __name__ == '__main__':
+    unittest.main()
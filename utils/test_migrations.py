@@ -0,0 +1,79 @@
+import unittest
+from utils.db import init_db, get_db, query_db
+from utils.migrations import upgrade_db, get_current_version, load_migrations
+from utils.testing import DatabaseTestCase
+
+class TestMigrations(DatabaseTestCase):
+    init_database = False
+
+    def test_upgrade_existing_database(self):
+        """Test that a baseline database is upgraded in place, once"""
+        with self.app.app_context():
+            with self.app.open_resource('schema.sql') as f:
+                get_db().executescript(f.read().decode('utf8'))
+
+            applied = upgrade_db()
+            latest = load_migrations()[-1][0]
+
+            self.assertEqual([version for version, _ in applied][-1], latest)
+            self.assertEqual(get_current_version(get_db()), latest)
+            self.assertEqual(upgrade_db(), [])
+
+    def test_upgrade_converts_money_to_cents(self):
+        """Test that existing REAL amounts are migrated to integer cents"""
+        with self.app.app_context():
+            with self.app.open_resource('schema.sql') as f:
+                get_db().executescript(f.read().decode('utf8'))
+
+            db = get_db()
+            db.execute("INSERT INTO users (username, email, password_hash) VALUES ('u', 'u@example.com', 'h')")
+            db.execute("INSERT INTO categories (user_id, name) VALUES (1, 'Food')")
+            db.execute("INSERT INTO expenses (user_id, category_id, amount, date) VALUES (1, 1, 10.1, '2025-03-04')")
+            db.execute("INSERT INTO expenses (user_id, category_id, amount, date) VALUES (1, 1, 0.2, '2025-03-05')")
+            db.commit()
+
+            upgrade_db()
+
+            amounts = [row['amount'] for row in query_db('SELECT amount FROM expenses ORDER BY expense_id')]
+            total = query_db('SELECT SUM(amount) AS total FROM expenses', one=True)['total']
+            savings = query_db('SELECT amount, total_expenses FROM savings WHERE month = 3 AND year = 2025', one=True)
+
+        self.assertEqual(amounts, [1010, 20])
+        self.assertEqual(total, 1030)
+        self.assertEqual((savings['amount'], savings['total_expenses']), (-1030, 1030))
+
+    def test_init_db_creates_hot_path_indexes(self):
+        """Test that a fresh database gets the migrated indexes"""
+        with self.app.app_context():
+            init_db()
+            indexes = {
+                row['name'] for row in query_db("SELECT name FROM sqlite_master WHERE type = 'index'")
+            }
+
+        self.assertIn('idx_expenses_user_date', indexes)
+        self.assertIn('idx_income_user_period', indexes)
+        self.assertIn('idx_budget_user_period', indexes)
+
+    def test_writes_bump_user_data_version(self):
+        """Test that data writes bump data_version and no-op savings rewrites don't"""
+        with self.app.app_context():
+            init_db()
+            db = get_db()
+            version = lambda: query_db('SELECT data_version FROM users WHERE user_id = 1', one=True)['data_version']
+
+            db.execute("INSERT INTO users (username, email, password_hash) VALUES ('u', 'u@example.com', 'h')")
+            db.execute("INSERT INTO categories (user_id, name) VALUES (1, 'Food')")
+            db.execute("INSERT INTO expenses (user_id, category_id, amount, date) VALUES (1, 1, 100, '2025-03-04')")
+            db.execute("INSERT INTO savings (user_id, amount, month, year) VALUES (1, 500, 3, 2025)")
+            self.assertEqual(version(), 3)
+
+            db.execute("UPDATE savings SET amount = 500, updated_at = CURRENT_TIMESTAMP WHERE user_id = 1")
+            self.assertEqual(version(), 3)
+
+            db.execute("UPDATE savings SET amount = 400 WHERE user_id = 1")
+            db.execute("DELETE FROM expenses WHERE user_id = 1")
+            self.assertEqual(version(), 5)
+            db.commit()
+
+if __name__ == '__main__':
+    unittest.main()
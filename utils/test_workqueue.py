@@ -0,0 +1,41 @@
+import threading
+import unittest
+from utils.workqueue import CoalescingQueue
+
+class TestCoalescingQueue(unittest.TestCase):
+    def test_burst_of_marks_is_handled_once(self):
+        """Test that marks for a pending key coalesce into a single handler call"""
+        handled = []
+        gate = threading.Event()
+        queue = CoalescingQueue(lambda key: (gate.wait(5), handled.append(key)))
+
+        queue.mark('first')
+        for _ in range(10):
+            queue.mark(('user', 1))
+        gate.set()
+
+        self.assertTrue(queue.flush(timeout=5))
+        queue.stop(5)
+
+        stats = queue.stats()
+        self.assertEqual(handled.count(('user', 1)), 1)
+        self.assertEqual((stats['marked'], stats['coalesced'], stats['depth']), (11, 9, 0))
+
+    def test_flush_waits_for_matching_keys_only(self):
+        """Test that flush returns once matching keys are handled, and times out otherwise"""
+        gate = threading.Event()
+        queue = CoalescingQueue(lambda key: gate.wait(5) if key == 'slow' else None)
+
+        queue.mark('slow')
+        queue.mark('fast')
+
+        self.assertFalse(queue.flush(lambda key: key == 'slow', timeout=0.05))
+        gate.set()
+        self.assertTrue(queue.flush(timeout=5))
+        queue.stop(5)
+
+        self.assertEqual(queue.stats()['processed'], 2)
+        self.assertEqual(queue.stats()['failed'], 0)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,57 @@
+import os
+import tempfile
+import unittest
+from flask import Flask
+from utils.db import init_app, init_db, get_pool, insert_db
+from utils.auth import generate_token
+from utils.instrumentation import get_query_stats
+
+ROOT_PATH = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+class DatabaseTestCase(unittest.TestCase):
+    # A throwaway app on its own database file. By default the schema and
+    # every migration are applied and one user exists (self.user_id);
+    # subclasses add their rows in seed(), which runs in an app context.
+    init_database = True
+    app_config = {}
+
+    def setUp(self):
+        self.db_fd, self.db_path = tempfile.mkstemp(suffix='.db')
+        self.app = Flask(__name__, root_path=ROOT_PATH)
+        self.app.config['DATABASE'] = self.db_path
+        self.app.config['JWT_SECRET_KEY'] = 'test'
+        self.app.config['JWT_ACCESS_TOKEN_EXPIRES'] = 60
+        self.app.config.update(self.app_config)
+        init_app(self.app)
+
+        with self.app.app_context():
+            if self.init_database:
+                init_db()
+                self.user_id = self.create_user('test')
+            self.seed()
+
+    def tearDown(self):
+        for readonly in (False, True):
+            get_pool(self.app, readonly=readonly).close_all()
+        os.close(self.db_fd)
+        os.unlink(self.db_path)
+
+    def seed(self):
+        pass
+
+    def create_user(self, username):
+        return insert_db(
+            'INSERT INTO users (username, email, password_hash) VALUES (?, ?, ?)',
+            (username, f'{username}@example.com', 'hash')
+        )
+
+    def auth_headers(self, user_id=None):
+        with self.app.app_context():
+            token = generate_token(user_id or self.user_id)
+        return {'Authorization': f'Bearer {token}'}
+
+    def count_statements(self, fn):
+        # (result, number of statements fn ran)
+        before = get_query_stats()['count']
+        result = fn()
+        return result, get_query_stats()['count'] - before
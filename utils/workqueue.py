@@ -0,0 +1,114 @@
+import threading
+import time
+from flask import current_app
+
+_queues_lock = threading.Lock()
+
+class CoalescingQueue:
+    # Dirty set drained by one background thread. Marking a key that is
+    # already pending is a no-op, so a burst of writes to the same key costs
+    # one handler call. A key marked while it is being handled is queued
+    # again, so the handler always runs after the last mark.
+    def __init__(self, handler, name='queue', logger=None):
+        self.handler = handler
+        self.name = name
+        self.logger = logger
+        self._pending = {}
+        self._in_flight = set()
+        self._cond = threading.Condition()
+        self._thread = None
+        self._stopped = False
+
+        self.marked = 0
+        self.coalesced = 0
+        self.processed = 0
+        self.failed = 0
+        self.last_lag = 0.0
+        self.max_lag = 0.0
+
+    def mark(self, key):
+        with self._cond:
+            self.marked += 1
+            if key in self._pending:
+                self.coalesced += 1
+            else:
+                self._pending[key] = time.monotonic()
+            self._start_worker()
+            self._cond.notify_all()
+
+    def flush(self, match=None, timeout=None):
+        # Block until no pending or in-flight key matches (all keys when
+        # match is None); returns False on timeout
+        def settled():
+            keys = list(self._pending) + list(self._in_flight)
+            return not any(match is None or match(key) for key in keys)
+
+        with self._cond:
+            return self._cond.wait_for(settled, timeout)
+
+    def stop(self, timeout=None):
+        with self._cond:
+            self._stopped = True
+            self._cond.notify_all()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def stats(self):
+        with self._cond:
+            now = time.monotonic()
+            oldest = min(self._pending.values(), default=now)
+            return {
+                'depth': len(self._pending),
+                'in_flight': len(self._in_flight),
+                'oldest_pending_ms': round((now - oldest) * 1000, 3),
+                'marked': self.marked,
+                'coalesced': self.coalesced,
+                'processed': self.processed,
+                'failed': self.failed,
+                'last_lag_ms': round(self.last_lag * 1000, 3),
+                'max_lag_ms': round(self.max_lag * 1000, 3)
+            }
+
+    def _start_worker(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        while True:
+            with self._cond:
+                self._cond.wait_for(lambda: self._pending or self._stopped)
+                if self._stopped:
+                    return
+                # Take the whole dirty set; marks from here on start a new one
+                batch, self._pending = self._pending, {}
+                self._in_flight.update(batch)
+
+            for key, marked_at in batch.items():
+                failed = 0
+                try:
+                    self.handler(key)
+                except Exception:
+                    failed = 1
+                    if self.logger is not None:
+                        self.logger.exception(f'{self.name}: handler failed for {key!r}')
+
+                lag = time.monotonic() - marked_at
+                with self._cond:
+                    self._in_flight.discard(key)
+                    self.processed += 1
+                    self.failed += failed
+                    self.last_lag = lag
+                    self.max_lag = max(self.max_lag, lag)
+                    self._cond.notify_all()
+
+def get_queue(name, create, app=None):
+    # Get (or lazily create) a queue stored on the app under `name`
+    app = app or current_app._get_current_object()
+    queues = app.extensions.setdefault('queues', {})
+
+    with _queues_lock:
+        if name not in queues:
+            queues[name] = create(app)
+
+    return queues[name]